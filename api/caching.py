@@ -0,0 +1,242 @@
+import functools
+import hashlib
+import inspect
+from typing import Annotated, Any, Callable
+
+from fastapi import Depends, Request, Response
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.routing import serialize_response
+
+from api.responses import EntityRoute
+from core.caches.providers import get_response_cache
+from core.caches.response import CachedResponse
+from core.repositories.providers import get_table_version_repository
+from core.repositories.table_version import TableVersionRepositoryBase
+
+# Names the endpoint wrapper gets its arguments by if the endpoint takes none
+_VERSIONS_PARAM = '_cached_route_versions'
+_REQUEST_PARAM = '_cached_route_request'
+_RESPONSE_PARAM = '_cached_route_response'
+
+
+def cached_route(*tables: str, cache_control: str) -> type['CachedRoute']:
+    """
+    Route class of a router whose GET responses are cached, see `CachedRoute`
+
+    :param tables: Tables the responses are built from. Without tables ETags
+        are hashes of the bodies and the bodies are not cached
+    :param cache_control: `Cache-Control` of successful GET responses
+    """
+    return type(
+        'CachedRoute',
+        (CachedRoute,),
+        {'tables': tables, 'cache_control': cache_control},
+    )
+
+
+def _find_param(signature: inspect.Signature, annotation: type) -> str | None:
+    """
+    :return: Name of the parameter FastAPI passes the request or response to
+    """
+    for name, param in signature.parameters.items():
+        if isinstance(param.annotation, type) and issubclass(
+            param.annotation, annotation
+        ):
+            return name
+    return None
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Weak comparison of the ETag with an `If-None-Match` header
+    """
+    if if_none_match is None:
+        return False
+    tags = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+    return etag.removeprefix('W/') in tags or '*' in tags
+
+
+class CachedRoute(EntityRoute):
+    """
+    Route answering GET requests with an ETag and `Cache-Control`, and
+    `If-None-Match` requests with the ETag still current with 304.
+
+    The ETag is made of the versions of `tables`, so it is known before
+    the endpoint runs: 304 is sent without calling it, and the last body
+    of each path and query is kept in the response cache and sent again
+    while the versions stay the same. Writes of the router expire the
+    versions of this process, those of other processes are noticed within
+    `Settings.response_cache_ttl`.
+
+    Without `tables` the ETag is a hash of the body: the endpoint is called
+    every time, but unchanged bodies are not sent again
+    """
+
+    tables: tuple[str, ...] = ()
+    cache_control: str = 'no-cache'
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs):
+        # Known before the route is built, the endpoint is wrapped first
+        self._is_read = 'GET' in (kwargs.get('methods') or ['GET'])
+        super().__init__(path, endpoint, **kwargs)
+
+    async def _get_versions(
+        self,
+        table_version_repository: Annotated[
+            TableVersionRepositoryBase, Depends(get_table_version_repository)
+        ],
+    ) -> dict[str, int]:
+        cache = get_response_cache()
+        versions = cache.get_fresh_versions(self.tables)
+        if versions is None:
+            versions = await table_version_repository.get_versions(self.tables)
+            cache.set_versions(versions)
+        return versions
+
+    def _wrap_endpoint(self, endpoint: Callable[..., Any]) -> Callable[..., Any]:
+        endpoint = super()._wrap_endpoint(endpoint)
+        if self._is_read:
+            return self._wrap_read(endpoint)
+        if self.tables:
+            return self._wrap_write(endpoint)
+        return endpoint
+
+    def _wrap_read(self, call: Callable[..., Any]) -> Callable[..., Any]:
+        signature = inspect.signature(call)
+        request_param = _find_param(signature, Request)
+        takes_request = request_param is not None
+        response_param = _find_param(signature, Response)
+        takes_response = response_param is not None
+
+        added = []
+        if not takes_request:
+            request_param = _REQUEST_PARAM
+            added.append((_REQUEST_PARAM, Request))
+        if not takes_response:
+            response_param = _RESPONSE_PARAM
+            added.append((_RESPONSE_PARAM, Response))
+        if self.tables:
+            added.append(
+                (
+                    _VERSIONS_PARAM,
+                    Annotated[dict[str, int], Depends(self._get_versions)],
+                )
+            )
+        signature = signature.replace(
+            parameters=[
+                *signature.parameters.values(),
+                *(
+                    inspect.Parameter(
+                        name, inspect.Parameter.KEYWORD_ONLY, annotation=annotation
+                    )
+                    for name, annotation in added
+                ),
+            ]
+        )
+
+        @functools.wraps(call)
+        async def call_endpoint(**values):
+            if takes_request:
+                request = values[request_param]
+            else:
+                request = values.pop(request_param)
+            if takes_response:
+                sub_response = values[response_param]
+            else:
+                sub_response = values.pop(response_param)
+            if_none_match = request.headers.get('if-none-match')
+
+            if not self.tables:
+                response = await self._call(call, values, sub_response)
+                body = getattr(response, 'body', None)
+                if response.status_code != 200 or body is None:
+                    return response
+                etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+                if etag_matches(if_none_match, etag):
+                    return self._not_modified(etag)
+                self._set_headers(response, etag)
+                return response
+
+            versions = values.pop(_VERSIONS_PARAM)
+            etag = 'W/"{}"'.format(
+                '-'.join(f'{table}.{versions[table]}' for table in self.tables)
+            )
+            if etag_matches(if_none_match, etag):
+                return self._not_modified(etag)
+
+            cache = get_response_cache()
+            key = self._get_key(request)
+            cached = cache.get(key, versions)
+            if cached is not None:
+                response = Response(cached.body)
+                response.headers.raw.extend(cached.headers)
+                return response
+
+            response = await self._call(call, values, sub_response)
+            body = getattr(response, 'body', None)
+            if response.status_code != 200 or body is None:
+                return response
+
+            self._set_headers(response, etag)
+            headers = [
+                (name, value)
+                for name, value in response.headers.raw
+                if name != b'content-length'
+            ]
+            cache.put(key, CachedResponse(body, headers, versions))
+            return response
+
+        call_endpoint.__signature__ = signature
+        return call_endpoint
+
+    def _wrap_write(self, call: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(call)
+        async def call_endpoint(**values):
+            content = await call(**values)
+            get_response_cache().expire_versions(self.tables)
+            return content
+
+        return call_endpoint
+
+    async def _call(
+        self, call: Callable[..., Any], values: dict[str, Any], sub_response: Response
+    ) -> Response:
+        """
+        Calls the endpoint and makes a response of the result like FastAPI does
+        """
+        content = await call(**values)
+        if isinstance(content, Response):
+            return content
+
+        serialized = await serialize_response(
+            field=self.secure_cloned_response_field,
+            response_content=content,
+            include=self.response_model_include,
+            exclude=self.response_model_exclude,
+            by_alias=self.response_model_by_alias,
+            exclude_unset=self.response_model_exclude_unset,
+            exclude_defaults=self.response_model_exclude_defaults,
+            exclude_none=self.response_model_exclude_none,
+        )
+        response_class = self.response_class
+        if isinstance(response_class, DefaultPlaceholder):
+            response_class = response_class.value
+
+        response = response_class(
+            serialized, status_code=sub_response.status_code or self.status_code or 200
+        )
+        response.headers.raw.extend(sub_response.headers.raw)
+        return response
+
+    def _set_headers(self, response: Response, etag: str) -> None:
+        response.headers['etag'] = etag
+        response.headers['cache-control'] = self.cache_control
+
+    def _not_modified(self, etag: str) -> Response:
+        return Response(
+            status_code=304, headers={'etag': etag, 'cache-control': self.cache_control}
+        )
+
+    @staticmethod
+    def _get_key(request: Request) -> str:
+        return f'{request.url.path}?{request.url.query}'
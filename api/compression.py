@@ -0,0 +1,161 @@
+import gzip
+from collections import OrderedDict
+
+import anyio
+import brotli
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from api.static import COMPRESSIBLE_TYPES, parse_accept_encoding
+
+# Supported encodings by preference
+ENCODINGS = ('br', 'gzip')
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == 'br':
+        # Qualities above 5 cost several times more for a few percent
+        return brotli.compress(body, quality=5)
+    # No timestamp, so the same body is always compressed the same way
+    return gzip.compress(body, compresslevel=6, mtime=0)
+
+
+class CompressedBodyCache:
+    """
+    Compressed bodies of responses with an ETag by path, query, ETag and
+    encoding, so a body cached by ETag is compressed once
+    """
+
+    def __init__(self, max_size: int = 1000):
+        """
+        :param max_size: Number of bodies kept, the least recently used are evicted
+        """
+        self.max_size = max_size
+        self._bodies: OrderedDict[tuple[str, str, str, str], bytes] = OrderedDict()
+
+    def get(self, key: tuple[str, str, str, str]) -> bytes | None:
+        body = self._bodies.get(key)
+        if body is not None:
+            self._bodies.move_to_end(key)
+        return body
+
+    def put(self, key: tuple[str, str, str, str], body: bytes) -> None:
+        self._bodies[key] = body
+        self._bodies.move_to_end(key)
+        while len(self._bodies) > self.max_size:
+            self._bodies.popitem(last=False)
+
+
+class CompressionMiddleware:
+    """
+    Compresses response bodies with brotli or gzip, whichever the client
+    accepts, brotli first.
+
+    Only complete bodies of compressible types of at least `minimum_size`
+    bytes are compressed. Streamed and already encoded responses (such as
+    precompressed static files) are sent as they are. Responses that qualify
+    get `Vary: Accept-Encoding` even if the client accepts neither encoding.
+    Bodies of at least `thread_size` bytes are compressed in a worker thread,
+    so the event loop keeps serving other requests meanwhile
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        thread_size: int = 256 * 1024,
+        cache_size: int = 1000,
+    ) -> None:
+        """
+        :param minimum_size: Smaller bodies are sent uncompressed
+        :param thread_size: Bodies compressed in a worker thread
+        :param cache_size: Number of compressed bodies with an ETag kept
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.thread_size = thread_size
+        self.cache = CompressedBodyCache(cache_size)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        accepted = parse_accept_encoding(
+            Headers(scope=scope).get('accept-encoding', '')
+        )
+        encoding = next(
+            (encoding for encoding in ENCODINGS if encoding in accepted), None
+        )
+
+        start: Message | None = None
+        is_streaming = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, is_streaming
+            if message['type'] == 'http.response.start':
+                start = message
+                return
+            if message['type'] != 'http.response.body' or is_streaming:
+                await send(message)
+                return
+
+            if message.get('more_body', False):
+                is_streaming = True
+                await send(start)
+                await send(message)
+                return
+
+            body = message.get('body', b'')
+            headers = MutableHeaders(scope=start)
+            should_compress = self._should_compress(start['status'], headers, body)
+            if should_compress:
+                # Caches must keep the response apart from the one for clients
+                # accepting other encodings, whatever this client accepts
+                headers.add_vary_header('Accept-Encoding')
+
+            if should_compress and encoding is not None:
+                body = await self._compress(scope, headers, body, encoding)
+                headers['content-encoding'] = encoding
+                headers['content-length'] = str(len(body))
+                # The compressed body is not byte-equal to the original
+                etag = headers.get('etag')
+                if etag is not None and not etag.startswith('W/'):
+                    headers['etag'] = f'W/{etag}'
+                message = {**message, 'body': body}
+
+            await send(start)
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
+
+    def _should_compress(
+        self, status: int, headers: MutableHeaders, body: bytes
+    ) -> bool:
+        return (
+            status == 200
+            and len(body) >= self.minimum_size
+            and 'content-encoding' not in headers
+            and headers.get('content-type', '').startswith(COMPRESSIBLE_TYPES)
+        )
+
+    async def _compress(
+        self, scope: Scope, headers: MutableHeaders, body: bytes, encoding: str
+    ) -> bytes:
+        etag = headers.get('etag')
+        key = None
+        if etag is not None:
+            # ETags are unique per URL only
+            key = (scope['path'], scope['query_string'].decode(), etag, encoding)
+            compressed = self.cache.get(key)
+            if compressed is not None:
+                return compressed
+
+        if len(body) >= self.thread_size:
+            compressed = await anyio.to_thread.run_sync(compress, body, encoding)
+        else:
+            compressed = compress(body, encoding)
+
+        if key is not None:
+            self.cache.put(key, compressed)
+        return compressed
@@ -1,7 +1,7 @@
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 
@@ -14,6 +14,8 @@ from core.services.category import CategoryServiceBase
 from core.services.country import CountryServiceBase
 from core.services.manufacturer import ManufacturerServiceBase
 from core.services.phone_key import PhoneKeyServiceBase
+from core.services.product import ProductServiceBase
+from core.services.product_import import ProductImportServiceBase
 from core.services.providers import (
     get_brand_service,
     get_user_service,
@@ -22,12 +24,17 @@ from core.services.providers import (
     get_country_service,
     get_manufacturer_service,
     get_category_service,
+    get_product_service,
+    get_product_import_service,
 )
 from core.services.user import UserServiceBase
-from database.models import User
+from core.storages.base import FileStorageBase
+from core.storages.providers import get_file_storage
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl='/auth/login')
+# For endpoints open to anonymous users with extras for authorized ones
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl='/auth/login', auto_error=False)
 
 BrandsServiceDep = Annotated[BrandServiceBase, Depends(get_brand_service)]
 UsersServiceDep = Annotated[UserServiceBase, Depends(get_user_service)]
@@ -38,15 +45,23 @@ ManufacturerServiceDep = Annotated[
     ManufacturerServiceBase, Depends(get_manufacturer_service)
 ]
 CategoryServiceDep = Annotated[CategoryServiceBase, Depends(get_category_service)]
+ProductServiceDep = Annotated[ProductServiceBase, Depends(get_product_service)]
+ProductImportServiceDep = Annotated[
+    ProductImportServiceBase, Depends(get_product_import_service)
+]
+
+FileStorageDep = Annotated[FileStorageBase, Depends(get_file_storage)]
 
 SettingsDep = Annotated[Settings, Depends(get_settings)]
 
 
-async def get_current_user(
+async def get_token_data(
     token: Annotated[str, Depends(oauth2_scheme)],
-    users_service: UsersServiceDep,
     settings: SettingsDep,
-) -> UserEntity:
+) -> TokenData:
+    """
+    Validates the access token without looking the user up
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail='Could not validate credentials',
@@ -61,24 +76,98 @@ async def get_current_user(
             user_id = UUID(payload.get('sub'))
         except (ValueError, TypeError):
             raise credentials_exception
-        token_data = TokenData(user_id=user_id)
+        is_superuser = payload.get('is_superuser')
+        if is_superuser is not None and not isinstance(is_superuser, bool):
+            raise credentials_exception
+        token_data = TokenData(user_id=user_id, is_superuser=is_superuser)
     except JWTError:
         raise credentials_exception
 
+    return token_data
+
+
+async def get_current_user(
+    token_data: Annotated[TokenData, Depends(get_token_data)],
+    users_service: UsersServiceDep,
+) -> UserEntity:
     user = await users_service.get_by_id(token_data.user_id)
     if user is None:
-        raise credentials_exception
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail='Could not validate credentials',
+            headers={'WWW-Authenticate': 'Bearer'},
+        )
 
     return user
 
 
-def current_user_id_admin(
-    current_user: Annotated[User, Depends(get_current_user)],
+async def current_user_id_admin(
+    token_data: Annotated[TokenData, Depends(get_token_data)],
+    users_service: UsersServiceDep,
+    settings: SettingsDep,
 ) -> bool:
+    permission_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail='You do not have permission to perform this',
+    )
+
+    # Tokens with the claim are checked without a user lookup. The claim is
+    # ignored once the setting is turned off, so turning it off takes the
+    # rights of revoked superusers away at once
+    if settings.superuser_token_claim and token_data.is_superuser is not None:
+        if not token_data.is_superuser:
+            raise permission_exception
+        return True
+
+    current_user = await get_current_user(token_data, users_service)
     if not current_user.is_superuser:
+        raise permission_exception
+
+    return True
+
+
+async def is_superuser_caller(
+    token: Annotated[str | None, Depends(optional_oauth2_scheme)],
+    settings: SettingsDep,
+    users_service: UsersServiceDep,
+) -> bool:
+    """
+    For public endpoints showing superusers more, any other caller
+    is anonymous
+    """
+    if token is None:
+        return False
+
+    try:
+        return await current_user_id_admin(
+            await get_token_data(token, settings), users_service, settings
+        )
+    except HTTPException:
+        return False
+
+
+async def get_is_active_filter(
+    token: Annotated[str | None, Depends(optional_oauth2_scheme)],
+    settings: SettingsDep,
+    users_service: UsersServiceDep,
+    is_active: Annotated[
+        bool, Query(description='Inactive products are listed to superusers only')
+    ] = True,
+) -> bool:
+    """
+    Lets only superusers list inactive products
+    """
+    if is_active:
+        return True
+
+    if token is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail='You do not have permission to perform this',
+            detail='Not authenticated',
+            headers={'WWW-Authenticate': 'Bearer'},
         )
+    await current_user_id_admin(
+        await get_token_data(token, settings), users_service, settings
+    )
 
-    return True
+    return False
@@ -0,0 +1,26 @@
+from typing import Annotated
+
+from fastapi import Query, Response
+
+from core.entities.pagination import CursorPage
+
+NEXT_CURSOR_HEADER = 'X-Next-Cursor'
+
+CursorQuery = Annotated[
+    str | None,
+    Query(
+        description=(
+            'Switches to keyset pagination ordered by name: pass an empty value '
+            f'for the first page, then the `{NEXT_CURSOR_HEADER}` response header '
+            'of the previous page. `offset` is ignored'
+        )
+    ),
+]
+
+
+def set_next_cursor(response: Response, page: CursorPage) -> None:
+    """
+    Sets the next page cursor header, the last page has no header
+    """
+    if page.next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
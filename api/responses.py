@@ -0,0 +1,224 @@
+import asyncio
+import functools
+import inspect
+import typing
+from typing import Any, Callable
+
+from fastapi import Response
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.responses import ORJSONResponse
+from fastapi.routing import APIRoute
+from pydantic import BaseModel, TypeAdapter
+
+from core.entities.base import BaseEntity
+
+# Name the sub-response is passed to the endpoint wrapper by if the endpoint
+# itself takes no `Response`
+_RESPONSE_PARAM = '_entity_route_response'
+
+
+@functools.cache
+def entity_matches_schema(entity: type[BaseModel], schema: type[BaseModel]) -> bool:
+    """
+    Whether a dump of the entity equals the dump of the entity validated with
+    the schema: both have the same fields of the same types, nested models
+    match in turn, neither customizes serialization and the schema has
+    no validators.
+
+    Fields must agree on None too: a None the schema does not allow would be
+    written as null instead of failing validation
+    """
+    return _models_match(entity, schema, set())
+
+
+def _models_match(
+    entity: type[BaseModel], schema: type[BaseModel], assumed: set[tuple[type, type]]
+) -> bool:
+    """
+    :param assumed: Pairs of models being compared, taken as matching
+        so that self-referencing models end the recursion
+    """
+    if entity is schema or (entity, schema) in assumed:
+        return True
+    if entity.model_fields.keys() != schema.model_fields.keys():
+        return False
+
+    # Validation of the schema is skipped, so it must not check anything
+    decorators = schema.__pydantic_decorators__
+    if (
+        decorators.validators
+        or decorators.field_validators
+        or decorators.root_validators
+        or decorators.model_validators
+    ):
+        return False
+
+    for model in (entity, schema):
+        decorators = model.__pydantic_decorators__
+        if decorators.field_serializers or decorators.model_serializers:
+            return False
+        if any(
+            field.alias or field.serialization_alias or field.exclude
+            for field in model.model_fields.values()
+        ):
+            return False
+
+    assumed.add((entity, schema))
+    return all(
+        _types_match(entity.model_fields[name].annotation, field.annotation, assumed)
+        for name, field in schema.model_fields.items()
+    )
+
+
+def _types_match(
+    entity_type: Any, schema_type: Any, assumed: set[tuple[type, type]]
+) -> bool:
+    if entity_type == schema_type:
+        return True
+    if _is_model(entity_type) and _is_model(schema_type):
+        return _models_match(entity_type, schema_type, assumed)
+
+    entity_origin = typing.get_origin(entity_type)
+    entity_args = typing.get_args(entity_type)
+    schema_args = typing.get_args(schema_type)
+    return (
+        entity_origin is not None
+        and entity_origin == typing.get_origin(schema_type)
+        and len(entity_args) == len(schema_args)
+        and all(
+            _types_match(entity_arg, schema_arg, assumed)
+            for entity_arg, schema_arg in zip(entity_args, schema_args)
+        )
+    )
+
+
+def _is_model(annotation: Any) -> bool:
+    return isinstance(annotation, type) and issubclass(annotation, BaseModel)
+
+
+@functools.cache
+def _type_adapter(annotation: Any) -> TypeAdapter:
+    return TypeAdapter(annotation)
+
+
+class EntityRoute(APIRoute):
+    """
+    Route writing the entities returned by the endpoint straight to JSON.
+
+    FastAPI validates returned entities against `response_model` once more,
+    converts them to dicts and only then encodes the dicts. When the entity
+    type matches the response model (see `entity_matches_schema`), the result
+    is the same as dumping the entity, which pydantic does in one pass.
+    Other results take the usual path.
+
+    Works for async endpoints if the response class is `ORJSONResponse`,
+    as set by `Settings.fast_json_responses`
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs):
+        self._schema: type[BaseModel] | None = None
+        self._is_list = False
+
+        # Routes are made anew when a router is included, from the endpoint
+        # of the included route
+        endpoint = getattr(endpoint, '__entity_route_endpoint__', endpoint)
+        if asyncio.iscoroutinefunction(endpoint):
+            endpoint = self._wrap_endpoint(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+        response_class = self.response_class
+        if isinstance(response_class, DefaultPlaceholder):
+            response_class = response_class.value
+        if issubclass(response_class, ORJSONResponse):
+            self._schema, self._is_list = self._get_response_schema()
+
+    def _get_response_schema(self) -> tuple[type[BaseModel] | None, bool]:
+        """
+        :return: Model of the response and whether the response is a list of them
+        """
+        if _is_model(self.response_model):
+            return self.response_model, False
+        if typing.get_origin(self.response_model) is list:
+            (item,) = typing.get_args(self.response_model)
+            if _is_model(item):
+                return item, True
+        return None, False
+
+    def _wrap_endpoint(self, endpoint: Callable[..., Any]) -> Callable[..., Any]:
+        """
+        :return: Endpoint taking the sub-response too, so that its status code
+            and headers go to the response made of the entities
+        """
+        signature = inspect.signature(endpoint, eval_str=True)
+        response_param = next(
+            (
+                name
+                for name, param in signature.parameters.items()
+                if isinstance(param.annotation, type)
+                and issubclass(param.annotation, Response)
+            ),
+            None,
+        )
+        takes_response = response_param is not None
+        if not takes_response:
+            response_param = _RESPONSE_PARAM
+            signature = signature.replace(
+                parameters=[
+                    *signature.parameters.values(),
+                    inspect.Parameter(
+                        _RESPONSE_PARAM,
+                        inspect.Parameter.KEYWORD_ONLY,
+                        annotation=Response,
+                    ),
+                ]
+            )
+
+        @functools.wraps(endpoint)
+        async def call_endpoint(**values):
+            if takes_response:
+                sub_response = values[response_param]
+            else:
+                sub_response = values.pop(response_param)
+
+            content = await endpoint(**values)
+            body = self._dump(content) if self._schema is not None else None
+            if body is None:
+                return content
+
+            response = Response(
+                body,
+                status_code=sub_response.status_code or self.status_code or 200,
+                media_type='application/json',
+            )
+            response.headers.raw.extend(sub_response.headers.raw)
+            return response
+
+        call_endpoint.__signature__ = signature
+        call_endpoint.__entity_route_endpoint__ = endpoint
+        return call_endpoint
+
+    def _dump(self, content: Any) -> bytes | None:
+        """
+        :return: JSON of the entities, None if they take the usual path
+        """
+        if not self._is_list:
+            entity = type(content)
+            if issubclass(entity, BaseEntity) and entity_matches_schema(
+                entity, self._schema
+            ):
+                return _type_adapter(entity).dump_json(content)
+            return None
+
+        if not isinstance(content, list):
+            return None
+        if not content:
+            return b'[]'
+
+        entity = type(content[0])
+        if (
+            issubclass(entity, BaseEntity)
+            and entity_matches_schema(entity, self._schema)
+            and all(type(item) is entity for item in content)
+        ):
+            return _type_adapter(list[entity]).dump_json(content)
+        return None
@@ -7,6 +7,8 @@ from .categories import router as category_router
 from .brands import router as brand_router
 from .countries import router as country_router
 from .manufacturers import router as manufacturer_router
+from .products import router as product_router
+from .metrics import router as metrics_router
 
 router = APIRouter()
 
@@ -17,3 +19,5 @@ router.include_router(category_router)
 router.include_router(brand_router)
 router.include_router(country_router)
 router.include_router(manufacturer_router)
+router.include_router(product_router)
+router.include_router(metrics_router)
@@ -1,12 +1,12 @@
 from typing import Annotated
 
-from fastapi import APIRouter, status, HTTPException, Depends
+from fastapi import APIRouter, status, HTTPException, Depends, Request
 from fastapi.security import OAuth2PasswordRequestForm
 
 from api.dependencies import AuthServiceDep
 from api.schemas.auth import TokenRead, RegisterRequest, ResetPasswordRequest
 from api.schemas.other import ErrorMessage
-from core.exceptions.auth import BadCredentialsError
+from core.exceptions.auth import BadCredentialsError, LoginAttemptsLimitError
 from core.exceptions.base import EntityAlreadyExistsError, EntityNotFoundError
 from core.exceptions.phone_key import BadPhoneKeyError
 
@@ -54,9 +54,17 @@ async def register(request: RegisterRequest, auth_service: AuthServiceDep):
 @router.post(
     '/login',
     response_model=TokenRead,
-    responses={401: {'description': 'Incorrect credentials', 'model': ErrorMessage}},
+    responses={
+        401: {'description': 'Incorrect credentials', 'model': ErrorMessage},
+        429: {
+            'description': 'Too many failed login attempts '
+            'for the phone number from the client IP',
+            'model': ErrorMessage,
+        },
+    },
 )
 async def login(
+    request: Request,
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
     auth_service: AuthServiceDep,
 ):
@@ -67,9 +75,17 @@ async def login(
     )
 
     try:
-        token = await auth_service.login_user(login_data=form_data)
+        token = await auth_service.login_user(
+            login_data=form_data,
+            client_ip=request.client.host if request.client else '',
+        )
     except BadCredentialsError as error:
         raise exception from error
+    except LoginAttemptsLimitError as error:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail='Too many login attempts, try again later',
+        ) from error
 
     return token
 
@@ -1,23 +1,101 @@
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, status, HTTPException, Query, Depends
+from fastapi import APIRouter, Body, status, HTTPException, Query, Depends, Response
 
 from api.dependencies import current_user_id_admin, BrandsServiceDep
-from api.schemas.brand import BrandRead, BrandCreate, BrandUpdate
+from api.pagination import CursorQuery, set_next_cursor
+from api.caching import cached_route
+from api.schemas.bulk import BULK_MAX_ITEMS, BulkRead
+from api.schemas.brand import BrandBulkUpdate, BrandRead, BrandCreate, BrandUpdate
 from api.schemas.other import ErrorMessage
-from core.exceptions.base import EntityNotFoundError
+from core.exceptions.base import EntityNotFoundError, BadCursorError
 
-router = APIRouter(prefix='/brands', tags=['Brands'])
+router = APIRouter(
+    prefix='/brands',
+    tags=['Brands'],
+    route_class=cached_route('brand', cache_control='public, no-cache'),
+)
 
 
-@router.get('', response_model=list[BrandRead])
+@router.get(
+    '',
+    response_model=list[BrandRead],
+    responses={400: {'model': ErrorMessage, 'description': 'Bad cursor'}},
+)
 async def get_brands(
     brand_service: BrandsServiceDep,
+    response: Response,
     limit: Annotated[int, Query(ge=1, le=20)] = 10,
     offset: Annotated[int, Query(ge=0)] = 0,
+    cursor: CursorQuery = None,
 ):
-    return await brand_service.get_all(limit=limit, offset=offset)
+    if cursor is None:
+        return await brand_service.get_all(limit=limit, offset=offset)
+
+    try:
+        page = await brand_service.get_all_after(after=cursor or None, limit=limit)
+    except BadCursorError as error:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail='Cursor is invalid'
+        ) from error
+
+    set_next_cursor(response, page)
+    return page.items
+
+
+@router.post(
+    '/bulk',
+    dependencies=[Depends(current_user_id_admin)],
+    response_model=BulkRead[BrandRead],
+)
+async def create_brands(
+    brand_service: BrandsServiceDep,
+    new_brands: Annotated[list[BrandCreate], Body(max_length=BULK_MAX_ITEMS)],
+):
+    """
+    Create many brands at once, items that cannot be created are
+    reported in `errors` by their position
+
+    * Requires superuser privileges
+    """
+    return await brand_service.create_many(new_brands)
+
+
+@router.put(
+    '/bulk',
+    dependencies=[Depends(current_user_id_admin)],
+    response_model=BulkRead[BrandRead],
+)
+async def update_brands(
+    brand_service: BrandsServiceDep,
+    brands_update: Annotated[list[BrandBulkUpdate], Body(max_length=BULK_MAX_ITEMS)],
+):
+    """
+    Update many brands at once, items that cannot be updated
+    (such as missing ones) are reported in `errors` by their position
+
+    * Requires superuser privileges
+    """
+    return await brand_service.update_many(brands_update)
+
+
+@router.post(
+    '/bulk/delete',
+    dependencies=[Depends(current_user_id_admin)],
+    response_model=BulkRead[UUID],
+)
+async def delete_brands(
+    brand_service: BrandsServiceDep,
+    brand_ids: Annotated[list[UUID], Body(max_length=BULK_MAX_ITEMS)],
+):
+    """
+    Delete many brands at once, ids that are not found or still used
+    by products are reported in `errors` by their position
+
+    * Requires superuser privileges
+    """
+    return await brand_service.delete_many(brand_ids)
 
 
 @router.get(
@@ -1,15 +1,26 @@
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Query, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Query, Depends, HTTPException, status
 
 from api.dependencies import current_user_id_admin, CategoryServiceDep
-from api.schemas.category import CategoryRead, CategoryCreate, CategoryUpdate
+from api.caching import cached_route
+from api.schemas.bulk import BULK_MAX_ITEMS, BulkRead
+from api.schemas.category import (
+    CategoryBulkUpdate,
+    CategoryRead,
+    CategoryCreate,
+    CategoryUpdate,
+)
 from api.schemas.other import ErrorMessage
 from core.exceptions.base import BadRelatedEntityError, EntityNotFoundError
 from core.exceptions.category import CategoryCantBeItsOwnParent
 
-router = APIRouter(prefix='/categories', tags=['Categories'])
+router = APIRouter(
+    prefix='/categories',
+    tags=['Categories'],
+    route_class=cached_route('category', cache_control='public, no-cache'),
+)
 
 
 @router.get('/', response_model=list[CategoryRead])
@@ -30,6 +41,76 @@ async def get_categories(
     return await category_service.get_root_categories(depth)
 
 
+@router.post(
+    '/bulk',
+    dependencies=[Depends(current_user_id_admin)],
+    response_model=BulkRead[CategoryRead],
+    responses={400: {'model': ErrorMessage, 'description': 'Bad parent_id'}},
+)
+async def create_categories(
+    category_service: CategoryServiceDep,
+    new_categories: Annotated[list[CategoryCreate], Body(max_length=BULK_MAX_ITEMS)],
+):
+    """
+    Create many categories at once, items that cannot be created are
+    reported in `errors` by their position
+
+    * Requires superuser privileges
+    """
+    try:
+        return await category_service.create_many(new_categories)
+    except BadRelatedEntityError as error:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail='Parent category does not exist',
+        ) from error
+
+
+@router.put(
+    '/bulk',
+    dependencies=[Depends(current_user_id_admin)],
+    response_model=BulkRead[CategoryRead],
+    responses={400: {'model': ErrorMessage, 'description': 'Bad parent_id'}},
+)
+async def update_categories(
+    category_service: CategoryServiceDep,
+    categories_update: Annotated[
+        list[CategoryBulkUpdate], Body(max_length=BULK_MAX_ITEMS)
+    ],
+):
+    """
+    Update many categories at once, items that cannot be updated
+    (such as missing ones) are reported in `errors` by their position
+
+    * Requires superuser privileges
+    """
+    try:
+        return await category_service.update_many(categories_update)
+    except BadRelatedEntityError as error:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail='Parent category does not exist',
+        ) from error
+
+
+@router.post(
+    '/bulk/delete',
+    dependencies=[Depends(current_user_id_admin)],
+    response_model=BulkRead[UUID],
+)
+async def delete_categories(
+    category_service: CategoryServiceDep,
+    category_ids: Annotated[list[UUID], Body(max_length=BULK_MAX_ITEMS)],
+):
+    """
+    Delete many categories at once, ids that are not found or still used
+    by products are reported in `errors` by their position
+
+    * Requires superuser privileges
+    """
+    return await category_service.delete_many(category_ids)
+
+
 @router.get('/{category_id}')
 async def get_category(
     category_service: CategoryServiceDep,
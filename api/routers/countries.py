@@ -1,22 +1,52 @@
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Query, HTTPException, status
+from fastapi import APIRouter, Query, HTTPException, status, Response
 
 from api.dependencies import CountryServiceDep
+from api.pagination import NEXT_CURSOR_HEADER, CursorQuery
+from api.caching import cached_route
 from api.schemas.country import CountryRead
+from api.schemas.other import ErrorMessage
+from core.exceptions.base import BadCursorError
 
 
-router = APIRouter(prefix='/countries', tags=['Countries'])
+router = APIRouter(
+    prefix='/countries',
+    tags=['Countries'],
+    route_class=cached_route(cache_control='public, max-age=3600'),
+)
 
 
-@router.get('/', response_model=list[CountryRead])
+@router.get(
+    '/',
+    response_model=list[CountryRead],
+    responses={400: {'model': ErrorMessage, 'description': 'Bad cursor'}},
+)
 async def get_countries(
     country_service: CountryServiceDep,
     limit: Annotated[int, Query(ge=1, le=100)] = 100,
     offset: Annotated[int, Query(ge=0)] = 0,
+    cursor: CursorQuery = None,
 ):
-    return await country_service.get_all(limit=limit, offset=offset)
+    # Pages are served already serialized
+    if cursor is None:
+        content = await country_service.get_all_json(limit=limit, offset=offset)
+        return Response(content, media_type='application/json')
+
+    try:
+        content, next_cursor = await country_service.get_all_after_json(
+            after=cursor or None, limit=limit
+        )
+    except BadCursorError as error:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail='Cursor is invalid'
+        ) from error
+
+    response = Response(content, media_type='application/json')
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return response
 
 
 @router.get('/id/{country_id}', response_model=CountryRead)
@@ -1,26 +1,112 @@
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Query, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Query, Depends, HTTPException, status, Response
 
 from api.dependencies import ManufacturerServiceDep, current_user_id_admin
+from api.pagination import CursorQuery, set_next_cursor
+from api.caching import cached_route
+from api.schemas.bulk import BULK_MAX_ITEMS, BulkRead
 from api.schemas.manufacturer import (
+    ManufacturerBulkUpdate,
     ManufacturerRead,
     ManufacturerCreate,
     ManufacturerUpdate,
 )
-from core.exceptions.base import EntityNotFoundError
+from api.schemas.other import ErrorMessage
+from core.exceptions.base import EntityNotFoundError, BadCursorError
 
-router = APIRouter(prefix='/test_manufacturers', tags=['Manufacturers'])
+router = APIRouter(
+    prefix='/test_manufacturers',
+    tags=['Manufacturers'],
+    route_class=cached_route('manufacturer', cache_control='public, no-cache'),
+)
 
 
-@router.get('', response_model=list[ManufacturerRead])
+@router.get(
+    '',
+    response_model=list[ManufacturerRead],
+    responses={400: {'model': ErrorMessage, 'description': 'Bad cursor'}},
+)
 async def get_manufacturers(
     manufacturer_service: ManufacturerServiceDep,
+    response: Response,
     limit: Annotated[int, Query(ge=1, le=100)] = 100,
     offset: Annotated[int, Query(ge=0)] = 0,
+    cursor: CursorQuery = None,
+):
+    if cursor is None:
+        return await manufacturer_service.get_all(limit=limit, offset=offset)
+
+    try:
+        page = await manufacturer_service.get_all_after(
+            after=cursor or None, limit=limit
+        )
+    except BadCursorError as error:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail='Cursor is invalid'
+        ) from error
+
+    set_next_cursor(response, page)
+    return page.items
+
+
+@router.post(
+    '/bulk',
+    dependencies=[Depends(current_user_id_admin)],
+    response_model=BulkRead[ManufacturerRead],
+)
+async def create_manufacturers(
+    manufacturer_service: ManufacturerServiceDep,
+    new_manufacturers: Annotated[
+        list[ManufacturerCreate], Body(max_length=BULK_MAX_ITEMS)
+    ],
 ):
-    return await manufacturer_service.get_all(limit=limit, offset=offset)
+    """
+    Create many manufacturers at once, items that cannot be created are
+    reported in `errors` by their position
+
+    * Requires superuser privileges
+    """
+    return await manufacturer_service.create_many(new_manufacturers)
+
+
+@router.put(
+    '/bulk',
+    dependencies=[Depends(current_user_id_admin)],
+    response_model=BulkRead[ManufacturerRead],
+)
+async def update_manufacturers(
+    manufacturer_service: ManufacturerServiceDep,
+    manufacturers_update: Annotated[
+        list[ManufacturerBulkUpdate], Body(max_length=BULK_MAX_ITEMS)
+    ],
+):
+    """
+    Update many manufacturers at once, items that cannot be updated
+    (such as missing ones) are reported in `errors` by their position
+
+    * Requires superuser privileges
+    """
+    return await manufacturer_service.update_many(manufacturers_update)
+
+
+@router.post(
+    '/bulk/delete',
+    dependencies=[Depends(current_user_id_admin)],
+    response_model=BulkRead[UUID],
+)
+async def delete_manufacturers(
+    manufacturer_service: ManufacturerServiceDep,
+    manufacturer_ids: Annotated[list[UUID], Body(max_length=BULK_MAX_ITEMS)],
+):
+    """
+    Delete many manufacturers at once, ids that are not found or still used
+    by products are reported in `errors` by their position
+
+    * Requires superuser privileges
+    """
+    return await manufacturer_service.delete_many(manufacturer_ids)
 
 
 @router.get('/{manufacturer_id}', response_model=ManufacturerRead)
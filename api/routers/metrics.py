@@ -0,0 +1,43 @@
+import secrets
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import PlainTextResponse
+
+from api.dependencies import SettingsDep
+from core.metrics import metrics
+
+router = APIRouter(tags=['Metrics'])
+
+
+async def check_metrics_token(
+    settings: SettingsDep, authorization: Annotated[str | None, Header()] = None
+) -> None:
+    """
+    Lets only scrapers with the metrics token read the metrics
+    """
+    if not settings.metrics_token:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+    expected = f'Bearer {settings.metrics_token}'
+    if authorization is None or not secrets.compare_digest(
+        authorization.encode(), expected.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail='Could not validate credentials',
+            headers={'WWW-Authenticate': 'Bearer'},
+        )
+
+
+@router.get(
+    '/metrics',
+    response_class=PlainTextResponse,
+    include_in_schema=False,
+    dependencies=[Depends(check_metrics_token)],
+)
+async def get_metrics():
+    """
+    Process metrics in the Prometheus text format
+    """
+    return metrics.render()
@@ -0,0 +1,225 @@
+from decimal import Decimal
+from typing import Annotated
+from uuid import UUID
+
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from starlette.formparsers import MultiPartException
+
+from api.dependencies import (
+    ProductImportServiceDep,
+    ProductServiceDep,
+    current_user_id_admin,
+    get_is_active_filter,
+    is_superuser_caller,
+)
+from api.pagination import NEXT_CURSOR_HEADER, set_next_cursor
+from api.responses import EntityRoute
+from api.schemas.other import ErrorMessage
+from api.schemas.product import ProductRead
+from api.schemas.product_import import ProductImportRead
+from api.uploads import FileStream
+from core.entities.product import ProductFilter, ProductSort
+from core.exceptions.base import BadCursorError
+from core.exceptions.product_import import BadImportFileError
+from core.product_import import (
+    ProductImporter,
+    get_import_format,
+    get_product_importer,
+    save_temp_file,
+)
+
+router = APIRouter(prefix='/products', tags=['Products'], route_class=EntityRoute)
+
+
+@router.get(
+    '',
+    response_model=list[ProductRead],
+    responses={
+        400: {'model': ErrorMessage, 'description': 'Bad cursor'},
+        401: {
+            'model': ErrorMessage,
+            'description': 'Inactive products requested without superuser privileges',
+        },
+    },
+)
+async def get_products(
+    product_service: ProductServiceDep,
+    response: Response,
+    is_active: Annotated[bool, Depends(get_is_active_filter)],
+    category_id: Annotated[
+        UUID | None, Query(description='Category, products of subcategories included')
+    ] = None,
+    brand_id: UUID | None = None,
+    manufacturer_id: UUID | None = None,
+    country_id: Annotated[
+        UUID | None, Query(description='Manufacturing country')
+    ] = None,
+    min_price: Annotated[Decimal | None, Query(ge=0)] = None,
+    max_price: Annotated[Decimal | None, Query(ge=0)] = None,
+    in_stock: bool | None = None,
+    sort: Annotated[
+        ProductSort, Query(description="'-' prefix for descending order")
+    ] = 'price',
+    limit: Annotated[int, Query(ge=1, le=50)] = 20,
+    cursor: Annotated[
+        str | None,
+        Query(
+            description=(
+                f'`{NEXT_CURSOR_HEADER}` response header of the previous page, '
+                'the cursor is valid only for the same `sort`'
+            )
+        ),
+    ] = None,
+):
+    filters = ProductFilter(
+        brand_id=brand_id,
+        manufacturer_id=manufacturer_id,
+        manufacturing_country_id=country_id,
+        min_price=min_price,
+        max_price=max_price,
+        is_active=is_active,
+        in_stock=in_stock,
+    )
+
+    try:
+        page = await product_service.get_all_after(
+            filters,
+            category_id=category_id,
+            sort=sort,
+            after=cursor or None,
+            limit=limit,
+        )
+    except BadCursorError as error:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail='Cursor is invalid'
+        ) from error
+
+    set_next_cursor(response, page)
+    return page.items
+
+
+@router.post(
+    '/imports',
+    dependencies=[Depends(current_user_id_admin)],
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=ProductImportRead,
+    responses={400: {'model': ErrorMessage, 'description': 'Bad import file'}},
+    # The body is streamed by hand, so its schema is declared here
+    openapi_extra={
+        'requestBody': {
+            'required': True,
+            'content': {
+                'multipart/form-data': {
+                    'schema': {
+                        'type': 'object',
+                        'properties': {'file': {'type': 'string', 'format': 'binary'}},
+                        'required': ['file'],
+                    }
+                }
+            },
+        }
+    },
+)
+async def import_products(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    product_import_service: ProductImportServiceDep,
+    importer: Annotated[ProductImporter, Depends(get_product_importer)],
+):
+    """
+    Import a supplier catalog, products are matched by `sku`
+
+    The file is a CSV file with a header or a JSON Lines file (.csv or .jsonl)
+    with the fields `sku`, `name`, `description`, `price`, `original_price`,
+    `discount`, `stock`, `is_active`, `volume`, `volume_type`, `brand` and
+    `manufacturer` (by name), `country` (alpha-2 code) and `category_id`.
+
+    The file is imported in the background, follow the progress at
+    `GET /products/imports/{import_id}`. Rows that cannot be imported are
+    skipped and reported with their line
+
+    * Requires superuser privileges
+    """
+    upload = FileStream(request, 'file')
+    try:
+        await upload.open()
+        file_format = get_import_format(upload.filename)
+        path = await save_temp_file(upload.chunks(), suffix=f'.{file_format}')
+    except (MultiPartException, BadImportFileError) as error:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=error.message
+        ) from error
+
+    try:
+        product_import = await product_import_service.create(upload.filename)
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+
+    background_tasks.add_task(
+        importer.run, product_import.id, path, file_format, delete_file=True
+    )
+    return product_import
+
+
+@router.get(
+    '/imports/{import_id}',
+    dependencies=[Depends(current_user_id_admin)],
+    response_model=ProductImportRead,
+    responses={404: {'model': ErrorMessage, 'description': 'Import not found'}},
+)
+async def get_product_import(
+    product_import_service: ProductImportServiceDep,
+    import_id: UUID,
+    errors_limit: Annotated[int, Query(ge=0, le=1000)] = 100,
+):
+    """
+    Progress and outcome of an import with its first failed rows
+
+    * Requires superuser privileges
+    """
+    product_import = await product_import_service.get_by_id(import_id)
+
+    if product_import is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f'Import with id {import_id} not found',
+        )
+
+    errors = await product_import_service.get_errors(import_id, errors_limit)
+    return ProductImportRead(
+        **product_import.model_dump(), errors=[error.model_dump() for error in errors]
+    )
+
+
+@router.get(
+    '/{product_id}',
+    response_model=ProductRead,
+    responses={404: {'model': ErrorMessage, 'description': 'Product not found'}},
+)
+async def get_product(
+    product_service: ProductServiceDep,
+    is_superuser: Annotated[bool, Depends(is_superuser_caller)],
+    product_id: UUID,
+):
+    """
+    Inactive products are found by superusers only
+    """
+    product = await product_service.get_by_id(product_id)
+
+    if product is None or not (product.is_active or is_superuser):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f'Product with id {product_id} not found',
+        )
+
+    return product
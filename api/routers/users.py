@@ -1,10 +1,13 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Query, status, HTTPException, UploadFile
+from fastapi import APIRouter, Depends, Query, Request, status, HTTPException
+from starlette.formparsers import MultiPartException
 
-from api.dependencies import get_current_user, UsersServiceDep
+from api.dependencies import get_current_user, FileStorageDep, UsersServiceDep
 from api.schemas.other import ErrorMessage
 from api.schemas.user import UserRead, UserCheckResult, UserUpdate, SetAvatarResult
+from api.uploads import FileStream
+from core.exceptions.storage import FileStorageError
 from core.exceptions.user import (
     BirthdayCanBeChangedOnceError,
     BadAvatarResolutionError,
@@ -21,11 +24,14 @@ router = APIRouter(prefix='/users', tags=['Users'])
     response_model=UserRead,
     responses={401: {'description': 'Unauthorized', 'model': ErrorMessage}},
 )
-async def get_me(current_user: Annotated[User, Depends(get_current_user)]) -> User:
+async def get_me(
+    current_user: Annotated[User, Depends(get_current_user)],
+    file_storage: FileStorageDep,
+) -> UserRead:
     """
     Returns the current user for the passed access token
     """
-    return current_user
+    return UserRead.from_entity(current_user, file_storage)
 
 
 @router.get(
@@ -64,6 +70,7 @@ async def update_me(
     *,
     current_user: Annotated[User, Depends(get_current_user)],
     users_service: UsersServiceDep,
+    file_storage: FileStorageDep,
     user_update: UserUpdate,
 ) -> UserRead:
     """
@@ -79,7 +86,7 @@ async def update_me(
             detail='Birthday can be changed just once',
         ) from error
 
-    return user
+    return UserRead.from_entity(user, file_storage)
 
 
 @router.post(
@@ -89,12 +96,30 @@ async def update_me(
         400: {
             'description': 'Something bad with avatar file. Check detail',
             'model': ErrorMessage,
+        },
+        503: {'description': 'File storage is unavailable', 'model': ErrorMessage},
+    },
+    # The body is streamed by hand, so its schema is declared here
+    openapi_extra={
+        'requestBody': {
+            'required': True,
+            'content': {
+                'multipart/form-data': {
+                    'schema': {
+                        'type': 'object',
+                        'properties': {
+                            'avatar': {'type': 'string', 'format': 'binary'}
+                        },
+                        'required': ['avatar'],
+                    }
+                }
+            },
         }
     },
 )
 async def set_avatar(
     current_user: Annotated[User, Depends(get_current_user)],
-    avatar: UploadFile,
+    request: Request,
     user_service: UsersServiceDep,
 ):
     """
@@ -107,10 +132,18 @@ async def set_avatar(
 
     After adding a new avatar, the old one is completely deleted
     """
+    avatar = FileStream(request, 'avatar')
     try:
+        await avatar.open()
         avatar_url = await user_service.set_avatar(
-            current_user=current_user, avatar=avatar
+            current_user=current_user,
+            content_type=avatar.content_type,
+            chunks=avatar.chunks(),
         )
+    except MultiPartException as error:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=error.message
+        ) from error
     except BadAvatarResolutionError as error:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -126,6 +159,11 @@ async def set_avatar(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail='File must be an image file (.png or .jpeg)',
         ) from error
+    except FileStorageError as error:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail='File storage is unavailable',
+        ) from error
 
     return SetAvatarResult(avatar_url=avatar_url)
 
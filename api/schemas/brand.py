@@ -18,3 +18,7 @@ class BrandCreate(BrandBase):
 
 class BrandUpdate(BrandBase):
     name: Annotated[str, Field(min_length=3)]
+
+
+class BrandBulkUpdate(BrandUpdate):
+    id: UUID
@@ -0,0 +1,18 @@
+from typing import Generic, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar('T')
+
+# Items accepted by one bulk request
+BULK_MAX_ITEMS = 10000
+
+
+class BulkItemErrorRead(BaseModel):
+    index: int
+    detail: str
+
+
+class BulkRead(BaseModel, Generic[T]):
+    items: list[T]
+    errors: list[BulkItemErrorRead]
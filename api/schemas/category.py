@@ -21,3 +21,7 @@ class CategoryCreate(CategoryBase):
 class CategoryUpdate(CategoryBase):
     name: str
     parent_id: UUID | None
+
+
+class CategoryBulkUpdate(CategoryUpdate):
+    id: UUID
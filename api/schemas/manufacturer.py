@@ -18,3 +18,7 @@ class ManufacturerCreate(ManufacturerBase):
 
 class ManufacturerUpdate(ManufacturerBase):
     name: Annotated[str, Field(min_length=3)]
+
+
+class ManufacturerBulkUpdate(ManufacturerUpdate):
+    id: UUID
@@ -5,6 +5,7 @@ from pydantic import BaseModel
 
 from api.schemas.brand import BrandRead
 from api.schemas.category import CategoryRead
+from api.schemas.country import CountryRead
 from api.schemas.manufacturer import ManufacturerRead
 
 
@@ -25,7 +26,9 @@ class ProductBase(BaseModel):
 
 class ProductRead(ProductBase):
     id: UUID
+    sku: str | None
 
     category: CategoryRead
-    brand: BrandRead
-    manufacturer: ManufacturerRead
+    brand: BrandRead | None
+    manufacturer: ManufacturerRead | None
+    manufacturing_country: CountryRead
@@ -0,0 +1,30 @@
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from core.entities.product_import import ImportStatus
+
+
+class ProductImportErrorRead(BaseModel):
+    line: int
+    detail: str
+
+
+class ProductImportRead(BaseModel):
+    id: UUID
+    filename: str
+    status: ImportStatus
+
+    rows_read: int
+    rows_failed: int
+    inserted: int
+    updated: int
+    unchanged: int
+    error: str | None
+
+    created_at: datetime
+    finished_at: datetime | None
+
+    # First failed rows by line
+    errors: list[ProductImportErrorRead] = []
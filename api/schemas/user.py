@@ -3,6 +3,15 @@ from uuid import UUID
 
 from pydantic import BaseModel, Field
 
+from core.entities.user import UserEntity
+from core.avatars import (
+    AVATAR_VARIANT_FORMATS,
+    AVATAR_VARIANT_SIZES,
+    avatar_variant_path,
+    has_avatar_variants,
+)
+from core.storages.base import FileStorageBase
+
 
 class UserBase(BaseModel):
     first_name: str | None
@@ -13,13 +22,55 @@ class UserBase(BaseModel):
         from_attributes = True
 
 
+class AvatarVariant(BaseModel):
+    size: int
+    format: str
+    url: str
+
+
 class UserRead(UserBase):
     id: UUID
     created_at: datetime
     avatar_url: str | None
+    # Square downscaled copies of the avatar, pick the smallest one that fits
+    avatar_variants: list[AvatarVariant]
     is_superuser: bool
     phone: str = Field(pattern=r'^\+7\d{10}$')
 
+    @classmethod
+    def from_entity(cls, user: UserEntity, file_storage: FileStorageBase) -> 'UserRead':
+        """
+        The storage turns the avatar path into URLs
+        """
+        avatar_url = None
+        avatar_variants = []
+        if user.avatar_key is not None:
+            avatar_url = file_storage.get_url(user.avatar_key)
+        if user.avatar_key is not None and has_avatar_variants(user.avatar_key):
+            avatar_variants = [
+                AvatarVariant(
+                    size=size,
+                    format=extension,
+                    url=file_storage.get_url(
+                        avatar_variant_path(user.avatar_key, size, extension)
+                    ),
+                )
+                for size in AVATAR_VARIANT_SIZES
+                for extension in AVATAR_VARIANT_FORMATS
+            ]
+
+        return cls(
+            id=user.id,
+            created_at=user.created_at,
+            first_name=user.first_name,
+            last_name=user.last_name,
+            birthday=user.birthday,
+            avatar_url=avatar_url,
+            avatar_variants=avatar_variants,
+            is_superuser=user.is_superuser,
+            phone=user.phone,
+        )
+
 
 class UserUpdate(UserBase):
     first_name: str | None
@@ -0,0 +1,310 @@
+import hashlib
+import os
+import stat
+from collections import OrderedDict
+from email.utils import formatdate, parsedate
+from mimetypes import guess_type
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.staticfiles import PathLike, StaticFiles
+from starlette.types import Receive, Scope, Send
+
+# Encodings of precompressed siblings (`app.js.br`, `app.js.gz`) by preference
+PRECOMPRESSED_ENCODINGS = {'br': '.br', 'gzip': '.gz'}
+# Only these types are looked up for siblings, images are compressed already
+COMPRESSIBLE_TYPES = (
+    'text/',
+    'application/javascript',
+    'application/json',
+    'application/xml',
+    'image/svg+xml',
+)
+
+
+class ETagCache:
+    """
+    Strong ETags of files by path. An entry is valid while the file keeps its
+    modification time and size, so the content is hashed once per change
+    """
+
+    def __init__(self, max_size: int = 10000):
+        """
+        :param max_size: Number of files kept, the least recently used are evicted
+        """
+        self.max_size = max_size
+        self._etags: OrderedDict[str, tuple[int, int, str]] = OrderedDict()
+
+    def get(self, path: str, stat_result: os.stat_result) -> str | None:
+        cached = self._etags.get(path)
+        if cached is None or cached[:2] != (
+            stat_result.st_mtime_ns,
+            stat_result.st_size,
+        ):
+            return None
+
+        self._etags.move_to_end(path)
+        return cached[2]
+
+    def put(self, path: str, stat_result: os.stat_result, etag: str) -> None:
+        self._etags[path] = (stat_result.st_mtime_ns, stat_result.st_size, etag)
+        self._etags.move_to_end(path)
+        while len(self._etags) > self.max_size:
+            self._etags.popitem(last=False)
+
+
+def compute_etag(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        while chunk := file.read(1024 * 1024):
+            digest.update(chunk)
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def stat_file(path: str) -> os.stat_result | None:
+    """
+    :return: None if there is no regular file at the path
+    """
+    try:
+        stat_result = os.stat(path)
+    except OSError:
+        return None
+    return stat_result if stat.S_ISREG(stat_result.st_mode) else None
+
+
+def parse_accept_encoding(value: str) -> set[str]:
+    encodings = set()
+    for item in value.split(','):
+        encoding, _, params = item.partition(';')
+        quality = params.strip().removeprefix('q=')
+        try:
+            if params and float(quality) <= 0:
+                continue
+        except ValueError:
+            continue
+        encodings.add(encoding.strip().lower())
+    return encodings
+
+
+def parse_range(value: str, size: int) -> tuple[int, int] | None:
+    """
+    :param value: `Range` header
+    :param size: Size of the file
+    :raises ValueError: The range starts past the end of the file
+    :return: First and last byte of the range, None if the header is malformed
+        or asks for several ranges, then the whole file is sent
+    """
+    unit, _, ranges = value.partition('=')
+    if unit.strip().lower() != 'bytes' or ',' in ranges:
+        return None
+
+    first, separator, last = ranges.strip().partition('-')
+    if not separator:
+        return None
+
+    if not first:
+        # The last N bytes
+        if not last.isdigit():
+            return None
+        if int(last) == 0 or size == 0:
+            raise ValueError('Empty range')
+        return max(size - int(last), 0), size - 1
+
+    if not first.isdigit() or (last and not last.isdigit()):
+        return None
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start >= size:
+        raise ValueError('Range starts past the end of the file')
+    if end < start:
+        return None
+    return start, min(end, size - 1)
+
+
+class StaticFileResponse(Response):
+    """
+    A file with a strong ETag, `Range` support and precompressed siblings.
+
+    The body is sent with the server's zero-copy extension when it has one,
+    with `pathsend` for whole files, and read in chunks in a thread otherwise
+    """
+
+    chunk_size = 64 * 1024
+
+    def __init__(
+        self,
+        path: str,
+        stat_result: os.stat_result,
+        etag_cache: ETagCache,
+        cache_control: str | None = None,
+    ):
+        self.path = path
+        self.stat_result = stat_result
+        self.etag_cache = etag_cache
+        self.cache_control = cache_control
+        self.background = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        request_headers = Headers(scope=scope)
+        path, stat_result = self.path, self.stat_result
+
+        media_type = guess_type(path)[0] or 'text/plain'
+        headers = {'content-type': media_type, 'accept-ranges': 'bytes'}
+        if self.cache_control is not None:
+            headers['cache-control'] = self.cache_control
+
+        if media_type.startswith(COMPRESSIBLE_TYPES):
+            headers['vary'] = 'Accept-Encoding'
+            accepted = parse_accept_encoding(request_headers.get('accept-encoding', ''))
+            for encoding, suffix in PRECOMPRESSED_ENCODINGS.items():
+                if encoding not in accepted:
+                    continue
+                sibling = await anyio.to_thread.run_sync(stat_file, path + suffix)
+                if sibling is not None:
+                    path, stat_result = path + suffix, sibling
+                    headers['content-encoding'] = encoding
+                    break
+
+        etag = self.etag_cache.get(path, stat_result)
+        if etag is None:
+            etag = await anyio.to_thread.run_sync(compute_etag, path)
+            self.etag_cache.put(path, stat_result, etag)
+        headers['etag'] = etag
+        headers['last-modified'] = formatdate(stat_result.st_mtime, usegmt=True)
+
+        if self._is_not_modified(request_headers, etag, stat_result):
+            for header in ('content-type', 'accept-ranges', 'content-encoding'):
+                headers.pop(header, None)
+            await self._start(send, 304, headers)
+            await send({'type': 'http.response.body', 'body': b''})
+            return
+
+        size = stat_result.st_size
+        status_code, start, end = 200, 0, size - 1
+        range_header = request_headers.get('range')
+        # A range of a changed file would mix two versions, the whole file is sent
+        if range_header and request_headers.get('if-range', etag) == etag:
+            try:
+                byte_range = parse_range(range_header, size)
+            except ValueError:
+                await self._start(
+                    send,
+                    416,
+                    {'content-range': f'bytes */{size}', 'content-length': '0'},
+                )
+                await send({'type': 'http.response.body', 'body': b''})
+                return
+            if byte_range is not None:
+                status_code, (start, end) = 206, byte_range
+                headers['content-range'] = f'bytes {start}-{end}/{size}'
+
+        length = end - start + 1
+        headers['content-length'] = str(length)
+        await self._start(send, status_code, headers)
+
+        extensions = scope.get('extensions') or {}
+        if scope['method'] == 'HEAD':
+            await send({'type': 'http.response.body', 'body': b''})
+        elif 'http.response.zerocopysend' in extensions:
+            file = await anyio.to_thread.run_sync(open, path, 'rb')
+            try:
+                await send(
+                    {
+                        'type': 'http.response.zerocopysend',
+                        'file': file,
+                        'offset': start,
+                        'count': length,
+                    }
+                )
+            finally:
+                await anyio.to_thread.run_sync(file.close)
+        elif 'http.response.pathsend' in extensions and status_code == 200:
+            await send({'type': 'http.response.pathsend', 'path': path})
+        else:
+            await self._send_chunks(send, path, start, length)
+
+    async def _start(self, send: Send, status_code: int, headers: dict) -> None:
+        await send(
+            {
+                'type': 'http.response.start',
+                'status': status_code,
+                'headers': [
+                    (name.encode('latin-1'), value.encode('latin-1'))
+                    for name, value in headers.items()
+                ],
+            }
+        )
+
+    async def _send_chunks(self, send: Send, path: str, start: int, length: int):
+        async with await anyio.open_file(path, 'rb') as file:
+            if start:
+                await file.seek(start)
+            remaining = length
+            while True:
+                chunk = await file.read(min(self.chunk_size, remaining))
+                remaining -= len(chunk)
+                more_body = bool(chunk) and remaining > 0
+                await send(
+                    {
+                        'type': 'http.response.body',
+                        'body': chunk,
+                        'more_body': more_body,
+                    }
+                )
+                if not more_body:
+                    break
+
+    @staticmethod
+    def _is_not_modified(
+        request_headers: Headers, etag: str, stat_result: os.stat_result
+    ) -> bool:
+        if_none_match = request_headers.get('if-none-match')
+        if if_none_match is not None:
+            tags = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+            return etag in tags or '*' in tags
+
+        if_modified_since = parsedate(request_headers.get('if-modified-since', ''))
+        last_modified = parsedate(formatdate(stat_result.st_mtime, usegmt=True))
+        return if_modified_since is not None and if_modified_since >= last_modified
+
+
+class CachedStaticFiles(StaticFiles):
+    """
+    Static files served with `StaticFileResponse`.
+
+    Conditional requests are answered from the ETag cache: a request with
+    a matching `If-None-Match` costs one `stat` and the file is not opened
+    """
+
+    cache_control: str | None = None
+
+    def __init__(self, *args, etag_cache_size: int = 10000, **kwargs):
+        """
+        :param etag_cache_size: Number of files whose ETags are kept
+        """
+        super().__init__(*args, **kwargs)
+        self.etag_cache = ETagCache(etag_cache_size)
+
+    def file_response(
+        self,
+        full_path: PathLike,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        if status_code != 200:
+            return super().file_response(full_path, stat_result, scope, status_code)
+        return StaticFileResponse(
+            str(full_path), stat_result, self.etag_cache, self.cache_control
+        )
+
+
+class ImmutableStaticFiles(CachedStaticFiles):
+    """
+    Static files that never change under their path, such as avatars stored
+    by content hash. Browsers and CDNs keep them for a year without
+    revalidating
+    """
+
+    cache_control = 'public, max-age=31536000, immutable'
@@ -0,0 +1,133 @@
+from typing import AsyncIterator
+
+from fastapi import Request
+from python_multipart import MultipartParser
+from python_multipart.exceptions import MultipartParseError
+from python_multipart.multipart import parse_options_header
+from starlette.formparsers import MultiPartException
+
+
+class FileStream:
+    """
+    One file field of a `multipart/form-data` request read straight from
+    the connection.
+
+    Starlette's form parser spools the whole body into a temporary file before
+    the endpoint runs. Here the body is parsed as it arrives and the data
+    of the field is handed out chunk by chunk, so the reader can stop at any
+    point and only one network chunk is held in memory at a time
+    """
+
+    def __init__(self, request: Request, field_name: str):
+        self.field_name = field_name
+        self.filename: str | None = None
+        self.content_type: str | None = None
+
+        self._content_type_header = request.headers.get('content-type', '')
+        self._stream = request.stream()
+        self._parser: MultipartParser | None = None
+
+        self._header_name = b''
+        self._header_value = b''
+        self._part_headers: dict[bytes, bytes] = {}
+        self._in_field = False
+        self._field_found = False
+        self._field_finished = False
+        self._pending: list[bytes] = []
+
+    def _on_part_begin(self) -> None:
+        self._part_headers = {}
+
+    def _on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_name += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def _on_header_end(self) -> None:
+        self._part_headers[self._header_name.lower()] = self._header_value
+        self._header_name = b''
+        self._header_value = b''
+
+    def _on_headers_finished(self) -> None:
+        _, options = parse_options_header(
+            self._part_headers.get(b'content-disposition', b'')
+        )
+        name = options.get(b'name', b'').decode('latin-1')
+        if self._field_found or name != self.field_name:
+            return
+        if b'filename' not in options:
+            raise MultiPartException(f'Field "{self.field_name}" must be a file')
+
+        self.filename = options[b'filename'].decode('utf-8', errors='replace')
+        content_type = self._part_headers.get(b'content-type')
+        self.content_type = content_type.decode('latin-1') if content_type else None
+        self._in_field = True
+        self._field_found = True
+
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._in_field:
+            self._pending.append(data[start:end])
+
+    def _on_part_end(self) -> None:
+        if self._in_field:
+            self._in_field = False
+            self._field_finished = True
+
+    async def _feed(self) -> bool:
+        """
+        Parses the next chunk of the body
+
+        :return: False if the body has ended
+        """
+        try:
+            chunk = await anext(self._stream)
+        except StopAsyncIteration:
+            return False
+
+        try:
+            self._parser.write(chunk)
+        except MultipartParseError as error:
+            raise MultiPartException(str(error)) from error
+        return True
+
+    async def open(self) -> None:
+        """
+        Reads the body up to the headers of the file field
+
+        :raises MultiPartException: Not a multipart body or no such file field
+        """
+        content_type, params = parse_options_header(self._content_type_header)
+        if content_type != b'multipart/form-data' or b'boundary' not in params:
+            raise MultiPartException('Request body must be multipart/form-data')
+
+        callbacks = {
+            'on_part_begin': self._on_part_begin,
+            'on_part_data': self._on_part_data,
+            'on_part_end': self._on_part_end,
+            'on_header_field': self._on_header_field,
+            'on_header_value': self._on_header_value,
+            'on_header_end': self._on_header_end,
+            'on_headers_finished': self._on_headers_finished,
+        }
+        self._parser = MultipartParser(params[b'boundary'], callbacks)
+
+        while not self._field_found:
+            if not await self._feed():
+                raise MultiPartException(f'Field "{self.field_name}" is required')
+
+    async def chunks(self) -> AsyncIterator[bytes]:
+        """
+        Data of the file as it arrives
+
+        :raises MultiPartException: The body ended in the middle of the file
+        """
+        while True:
+            pending, self._pending = self._pending, []
+            for chunk in pending:
+                yield chunk
+
+            if self._field_finished:
+                return
+            if not await self._feed():
+                raise MultiPartException('Request body ended in the middle of the file')
@@ -0,0 +1,154 @@
+"""
+Event loop lag while avatars are being uploaded.
+
+Users are inserted into the database from the settings (use a scratch
+database) and removed afterwards, their avatars are left in `static/users`.
+Run the server (`uvicorn main:app --workers 1`) and then:
+
+    python -m benchmarks.bench_avatar --url http://127.0.0.1:8000
+
+While the uploads run, a probe requests `GET /metrics` (no database, no work)
+with METRICS_TOKEN of the settings every 10 ms: its latency is the time a request waits for the event loop.
+The server's own `event_loop_lag_max_seconds` is printed when it has one.
+"""
+
+import argparse
+import asyncio
+import io
+import time
+
+import httpx
+from PIL import Image
+from sqlalchemy import delete
+
+from benchmarks.utils import LoadResult
+from config import get_settings
+from core.security import create_access_token
+from database.base import create_engine, create_session_factory
+from database.models import User
+
+PHONE_PREFIX = '+7000000020'
+
+
+def metrics_headers() -> dict:
+    return {'Authorization': f'Bearer {get_settings().metrics_token}'}
+
+
+def make_avatars() -> list[tuple[str, bytes, str]]:
+    """
+    A PNG and a JPEG with 200 KB of metadata before the dimensions
+    """
+    png = io.BytesIO()
+    Image.effect_noise((1000, 1000), 64).convert('RGB').save(png, format='PNG')
+
+    jpeg = io.BytesIO()
+    Image.effect_noise((1000, 1000), 64).convert('RGB').save(
+        jpeg, format='JPEG', icc_profile=bytes(200 * 1024)
+    )
+
+    return [
+        ('avatar.png', png.getvalue(), 'image/png'),
+        ('avatar.jpeg', jpeg.getvalue(), 'image/jpeg'),
+    ]
+
+
+def parse_max_lag(response: httpx.Response) -> float | None:
+    for line in response.text.splitlines():
+        if line.startswith('event_loop_lag_max_seconds '):
+            return float(line.split()[1])
+    return None
+
+
+async def probe(
+    client: httpx.AsyncClient, stop: asyncio.Event
+) -> tuple[list[float], float | None]:
+    """
+    :return: Latencies of the probe and the largest lag reported by the server,
+        every scrape resets the server's maximum
+    """
+    latencies = []
+    max_lag = None
+    while not stop.is_set():
+        started_at = time.perf_counter()
+        response = await client.get('/metrics', headers=metrics_headers())
+        latencies.append(time.perf_counter() - started_at)
+
+        lag = parse_max_lag(response)
+        if lag is not None:
+            max_lag = max(max_lag or 0.0, lag)
+        await asyncio.sleep(0.01)
+    return latencies, max_lag
+
+
+async def main(url: str, uploads: int, concurrency: int):
+    engine = create_engine(get_settings())
+    session_factory = create_session_factory(engine)
+
+    users = [
+        User(phone=f'{PHONE_PREFIX}{i}', hashed_password='', is_superuser=False)
+        for i in range(concurrency)
+    ]
+    async with session_factory.begin() as session:
+        session.add_all(users)
+
+    avatars = make_avatars()
+
+    try:
+        async with httpx.AsyncClient(base_url=url, timeout=60) as client:
+            remaining = uploads
+            upload_latencies = []
+            errors = 0
+
+            async def uploader(user: User):
+                nonlocal remaining, errors
+                token = create_access_token({'sub': str(user.id)})
+                while remaining > 0:
+                    remaining -= 1
+                    started_at = time.perf_counter()
+                    response = await client.post(
+                        '/users/me/avatar',
+                        files={'avatar': avatars[remaining % len(avatars)]},
+                        headers={'Authorization': f'Bearer {token}'},
+                    )
+                    if response.status_code != 200:
+                        errors += 1
+                    upload_latencies.append(time.perf_counter() - started_at)
+
+            await client.get('/metrics', headers=metrics_headers())
+
+            stop = asyncio.Event()
+            probe_task = asyncio.create_task(probe(client, stop))
+            started_at = time.perf_counter()
+            await asyncio.gather(*(uploader(user) for user in users))
+            elapsed = time.perf_counter() - started_at
+            stop.set()
+            probe_latencies, max_lag = await probe_task
+
+        print(
+            LoadResult(len(upload_latencies), errors, elapsed, upload_latencies).report(
+                f'POST /users/me/avatar (concurrency {concurrency})'
+            )
+        )
+        probe_result = LoadResult(len(probe_latencies), 0, elapsed, probe_latencies)
+        print(
+            probe_result.report('GET /metrics probe')
+            + f', max {max(probe_latencies) * 1000:.2f} ms'
+        )
+        if max_lag is not None:
+            print(f'Server event loop lag max {max_lag * 1000:.2f} ms')
+    finally:
+        async with session_factory.begin() as session:
+            await session.execute(
+                delete(User).where(User.phone.startswith(PHONE_PREFIX))
+            )
+        await engine.dispose()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--url', default='http://127.0.0.1:8000')
+    parser.add_argument('--uploads', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=8)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.url, args.uploads, args.concurrency))
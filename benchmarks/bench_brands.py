@@ -0,0 +1,40 @@
+"""
+Requests per second of `GET /brands` on a running server.
+
+Run the server (`uvicorn main:app --workers 1`) and then:
+
+    python -m benchmarks.bench_brands --url http://127.0.0.1:8000
+
+Run it once on a build that creates an engine per request and once on a build
+with the process-wide engine to compare the numbers.
+"""
+
+import argparse
+import asyncio
+
+import httpx
+
+from benchmarks.utils import run_load
+
+
+async def main(url: str, requests: int, concurrency: int):
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits) as client:
+        # Warm up: first requests open connections on both sides
+        await run_load(client, 'GET', '/brands', concurrency, concurrency)
+
+        result = await run_load(
+            client, 'GET', '/brands?limit=20', requests, concurrency
+        )
+
+    print(result.report(f'GET /brands (concurrency {concurrency})'))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--url', default='http://127.0.0.1:8000')
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=16)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.url, args.requests, args.concurrency))
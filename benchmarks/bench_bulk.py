@@ -0,0 +1,86 @@
+"""
+Writing 10k brands row by row with `add`/`update`/`delete` and with
+`add_many`/`update_many`/`delete_many` of `GenericSARepository`.
+The brands are written to the database from the settings in a transaction
+that is rolled back afterwards.
+
+    python -m benchmarks.bench_bulk
+"""
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import event
+
+from config import get_settings
+from core.entities.brand import BrandEntity
+from core.repositories.brand import SABrandRepository
+from database.base import create_engine, create_session_factory
+
+
+async def main(size: int):
+    engine = create_engine(get_settings())
+    session_factory = create_session_factory(engine)
+
+    statements = 0
+
+    def count_statement(*args, **kwargs):
+        nonlocal statements
+        statements += 1
+
+    event.listen(engine.sync_engine, 'before_cursor_execute', count_statement)
+
+    def report(title: str, started_at: float):
+        nonlocal statements
+        elapsed = time.perf_counter() - started_at
+        print(f'{title:>12}: {elapsed * 1000:9.1f} ms, {statements:>6} statements')
+        statements = 0
+
+    async with session_factory() as session:
+        repository = SABrandRepository(session)
+
+        brands = [BrandEntity(name=f'Row brand {number:05}') for number in range(size)]
+        started_at = time.perf_counter()
+        for brand in brands:
+            await repository.add(brand)
+        report('add', started_at)
+
+        for brand in brands:
+            brand.name += ' updated'
+        started_at = time.perf_counter()
+        for brand in brands:
+            await repository.update(brand)
+        report('update', started_at)
+
+        started_at = time.perf_counter()
+        for brand in brands:
+            await repository.delete(brand.id)
+        report('delete', started_at)
+
+        brands = [BrandEntity(name=f'Bulk brand {number:05}') for number in range(size)]
+        started_at = time.perf_counter()
+        await repository.add_many(brands)
+        report('add_many', started_at)
+
+        for brand in brands:
+            brand.name += ' updated'
+        started_at = time.perf_counter()
+        await repository.update_many(brands)
+        report('update_many', started_at)
+
+        started_at = time.perf_counter()
+        await repository.delete_many([brand.id for brand in brands])
+        report('delete_many', started_at)
+
+        await session.rollback()
+
+    await engine.dispose()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--size', type=int, default=10000)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.size))
@@ -0,0 +1,121 @@
+"""
+Category tree loading on a synthetic catalog: 10k categories, 6 levels deep.
+
+Compares the recursive CTE loader of `SACategoryRepository` with the previous
+per-node lazy loading of `Category.child`. The catalog is inserted into the
+database from the settings (use a scratch database) and removed afterwards.
+
+    python -m benchmarks.bench_category_tree
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import uuid
+
+from sqlalchemy import event, insert, delete, select
+
+from config import get_settings
+from core.entities.category import CategoryEntity
+from core.repositories.category import SACategoryRepository
+from database.base import create_engine, create_session_factory
+from database.models import Category
+
+LEVEL_SIZES = (10, 40, 200, 1000, 2750, 6000)
+
+
+def generate_catalog(seed: int = 42) -> list[dict]:
+    rng = random.Random(seed)
+    categories = []
+    previous_level = [None]
+    for level, size in enumerate(LEVEL_SIZES):
+        current_level = [uuid.uuid4() for _ in range(size)]
+        for category_id in current_level:
+            categories.append(
+                {
+                    'id': category_id,
+                    'name': f'Category L{level} {category_id.hex[:8]}',
+                    'parent_id': rng.choice(previous_level),
+                }
+            )
+        previous_level = current_level
+
+    return categories
+
+
+async def load_with_lazy_loading(session, depth: int) -> list[CategoryEntity]:
+    async def convert(category: Category, cur_depth: int) -> CategoryEntity:
+        if cur_depth >= depth:
+            child = []
+        else:
+            child = [
+                await convert(sub_category, cur_depth + 1)
+                for sub_category in await category.awaitable_attrs.child
+            ]
+        return CategoryEntity(
+            id=category.id,
+            name=category.name,
+            parent_id=category.parent_id,
+            child=child,
+        )
+
+    roots = await session.scalars(select(Category).where(Category.parent_id.is_(None)))
+    return [await convert(root, 0) for root in roots.all()]
+
+
+async def load_with_cte(session, depth: int) -> list[CategoryEntity]:
+    return await SACategoryRepository(session).get_root_categories(depth)
+
+
+async def main(repeat: int):
+    engine = create_engine(get_settings())
+    session_factory = create_session_factory(engine)
+
+    statements = 0
+
+    def count_statement(*args):
+        nonlocal statements
+        statements += 1
+
+    event.listen(engine.sync_engine, 'before_cursor_execute', count_statement)
+
+    catalog = generate_catalog()
+    async with session_factory.begin() as session:
+        for offset in range(0, len(catalog), 5000):
+            await session.execute(insert(Category), catalog[offset : offset + 5000])
+
+    try:
+        for depth in range(1, len(LEVEL_SIZES)):
+            for title, loader in (
+                ('lazy loading', load_with_lazy_loading),
+                ('recursive CTE', load_with_cte),
+            ):
+                timings = []
+                for _ in range(repeat):
+                    statements = 0
+                    async with session_factory() as session:
+                        started_at = time.perf_counter()
+                        await loader(session, depth)
+                        timings.append(time.perf_counter() - started_at)
+
+                print(
+                    f'depth={depth} {title:>13}: '
+                    f'best {min(timings) * 1000:9.2f} ms, {statements:5} statements'
+                )
+    finally:
+        async with session_factory.begin() as session:
+            ids = [category['id'] for category in catalog]
+            for offset in range(0, len(ids), 5000):
+                await session.execute(
+                    delete(Category).where(Category.id.in_(ids[offset : offset + 5000]))
+                )
+        await engine.dispose()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.repeat))
@@ -0,0 +1,52 @@
+"""
+Size and requests per second of large catalog responses on a running server
+with each supported encoding.
+
+    uvicorn main:app --workers 1
+    python -m benchmarks.bench_compression --url http://127.0.0.1:8000
+"""
+
+import argparse
+import asyncio
+
+import httpx
+
+from benchmarks.utils import run_load
+
+ENDPOINTS = [
+    '/categories/?depth=5',
+    '/products?limit=50',
+]
+ENCODINGS = ['identity', 'gzip', 'br']
+
+
+async def main(url: str, requests: int, concurrency: int):
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30) as client:
+        for endpoint in ENDPOINTS:
+            for encoding in ENCODINGS:
+                headers = {'Accept-Encoding': encoding}
+                await run_load(
+                    client, 'GET', endpoint, concurrency, concurrency, headers=headers
+                )
+
+                async with client.stream('GET', endpoint, headers=headers) as response:
+                    size = len(
+                        b''.join([chunk async for chunk in response.aiter_raw()])
+                    )
+                result = await run_load(
+                    client, 'GET', endpoint, requests, concurrency, headers=headers
+                )
+                print(
+                    result.report(f'GET {endpoint} {encoding} ({size / 1024:.1f} KB)')
+                )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--url', default='http://127.0.0.1:8000')
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, default=16)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.url, args.requests, args.concurrency))
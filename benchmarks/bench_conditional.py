@@ -0,0 +1,58 @@
+"""
+Requests per second of the cached reference endpoints on a running server:
+plain requests, which are answered from the response cache after the first
+one, and conditional requests with the current ETag, answered with 304.
+
+    uvicorn main:app --workers 1
+    python -m benchmarks.bench_conditional --url http://127.0.0.1:8000
+
+Run it against the previous version of the API for the numbers without caching
+"""
+
+import argparse
+import asyncio
+
+import httpx
+
+from benchmarks.utils import run_load
+
+ENDPOINTS = [
+    '/brands?limit=20',
+    '/test_manufacturers?limit=20',
+    '/countries/?limit=100',
+    '/categories/?depth=1',
+    '/categories/?depth=10',
+]
+
+
+async def main(url: str, requests: int, concurrency: int):
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30) as client:
+        for endpoint in ENDPOINTS:
+            await run_load(client, 'GET', endpoint, concurrency, concurrency)
+
+            result = await run_load(client, 'GET', endpoint, requests, concurrency)
+            print(result.report(f'GET {endpoint}'))
+
+            etag = (await client.get(endpoint)).headers.get('etag')
+            if etag is None:
+                continue
+            result = await run_load(
+                client,
+                'GET',
+                endpoint,
+                requests,
+                concurrency,
+                headers={'If-None-Match': etag},
+            )
+            print(result.report(f'GET {endpoint} (304)'))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--url', default='http://127.0.0.1:8000')
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=16)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.url, args.requests, args.concurrency))
@@ -0,0 +1,52 @@
+"""
+Requests per second of the read endpoints returning entities on a running
+server, to compare the usual JSON responses with `fast_json_responses`.
+
+Run the server twice, with and without the fast path:
+
+    FAST_JSON_RESPONSES=false uvicorn main:app --workers 1
+    FAST_JSON_RESPONSES=true uvicorn main:app --workers 1
+
+and each time:
+
+    python -m benchmarks.bench_json --url http://127.0.0.1:8000
+
+Each endpoint also reports the size of its response.
+"""
+
+import argparse
+import asyncio
+
+import httpx
+
+from benchmarks.utils import run_load
+
+ENDPOINTS = [
+    '/brands?limit=20',
+    '/countries/?limit=100',
+    '/test_manufacturers?limit=20',
+    '/categories/?depth=1',
+    '/categories/?depth=10',
+]
+
+
+async def main(url: str, requests: int, concurrency: int):
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30) as client:
+        for endpoint in ENDPOINTS:
+            # Warm up: first requests open connections and fill caches
+            await run_load(client, 'GET', endpoint, concurrency, concurrency)
+
+            size = len((await client.get(endpoint)).content)
+            result = await run_load(client, 'GET', endpoint, requests, concurrency)
+            print(result.report(f'GET {endpoint} ({size / 1024:.1f} KB)'))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--url', default='http://127.0.0.1:8000')
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=16)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.url, args.requests, args.concurrency))
@@ -0,0 +1,84 @@
+"""
+Latency of `GET /countries` while `POST /auth/login` is under load.
+
+A user with a known password is inserted into the database from the settings
+(use a scratch database) and removed afterwards. Run the server
+(`uvicorn main:app --workers 1`) and then:
+
+    python -m benchmarks.bench_login --url http://127.0.0.1:8000
+
+The countries latency is measured alone first and then together with a flood
+of logins. With bcrypt on the event loop every login stalls the countries
+requests for the whole hash; with the thread pool they are barely affected.
+"""
+
+import argparse
+import asyncio
+
+import httpx
+from sqlalchemy import delete
+
+from benchmarks.utils import run_load
+from config import get_settings
+from core.security import get_password_hash
+from database.base import create_engine, create_session_factory
+from database.models import User
+
+PHONE = '+70000000000'
+PASSWORD = 'benchmark-password'
+
+
+async def main(url: str, requests: int, concurrency: int, login_concurrency: int):
+    engine = create_engine(get_settings())
+    session_factory = create_session_factory(engine)
+
+    async with session_factory.begin() as session:
+        session.add(
+            User(
+                phone=PHONE,
+                hashed_password=get_password_hash(PASSWORD),
+                is_superuser=False,
+            )
+        )
+
+    try:
+        async with httpx.AsyncClient(base_url=url, timeout=60) as client:
+            await run_load(client, 'GET', '/countries', concurrency, concurrency)
+
+            alone = await run_load(client, 'GET', '/countries', requests, concurrency)
+            print(alone.report(f'GET /countries alone (concurrency {concurrency})'))
+
+            logins = asyncio.create_task(
+                run_load(
+                    client,
+                    'POST',
+                    '/auth/login',
+                    requests,
+                    login_concurrency,
+                    data={'username': PHONE, 'password': PASSWORD},
+                )
+            )
+            with_logins = await run_load(
+                client, 'GET', '/countries', requests, concurrency
+            )
+            print(
+                with_logins.report(
+                    f'GET /countries with logins (concurrency {concurrency})'
+                )
+            )
+            logins.cancel()
+    finally:
+        async with session_factory.begin() as session:
+            await session.execute(delete(User).where(User.phone == PHONE))
+        await engine.dispose()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--url', default='http://127.0.0.1:8000')
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--login-concurrency', type=int, default=8)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.url, args.requests, args.concurrency, args.login_concurrency))
@@ -0,0 +1,128 @@
+"""
+Importing a generated catalog of products with `ProductImporter` three times:
+into an empty catalog, unchanged and with a tenth of the prices changed.
+Products reference the brands, manufacturers, countries and categories of the
+database from the settings, imported products are deleted afterwards.
+
+    python -m benchmarks.bench_product_import --size 1000000
+"""
+
+import argparse
+import asyncio
+import csv
+import random
+import resource
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import delete, select
+
+from config import get_settings
+from core.entities.product_import import ProductImportEntity
+from core.product_import import ProductImporter
+from core.repositories.product_import import SAProductImportRepository
+from database.base import create_engine, create_session_factory
+from database.models import Brand, Category, Country, Manufacturer, Product
+
+FIELDS = [
+    'sku',
+    'name',
+    'description',
+    'price',
+    'original_price',
+    'discount',
+    'stock',
+    'is_active',
+    'volume',
+    'volume_type',
+    'brand',
+    'manufacturer',
+    'country',
+    'category_id',
+]
+
+
+def write_catalog(
+    path: Path, size: int, references: dict[str, list], changed: float = 0
+) -> None:
+    # The same seed gives the same catalog, `changed` of prices differ
+    generator = random.Random(0)
+    with path.open('w', encoding='utf-8', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(FIELDS)
+        for number in range(size):
+            price = generator.randint(100, 100000) / 100
+            if generator.random() < changed:
+                price += 1
+            writer.writerow(
+                [
+                    f'SKU-{number:08}',
+                    f'Product {number}',
+                    'Description of the product',
+                    price,
+                    price,
+                    0,
+                    generator.randint(0, 100),
+                    'true',
+                    1,
+                    'items',
+                    generator.choice(references['brands']),
+                    generator.choice(references['manufacturers']),
+                    generator.choice(references['countries']),
+                    generator.choice(references['categories']),
+                ]
+            )
+
+
+async def main(size: int, chunk_size: int):
+    engine = create_engine(get_settings())
+    session_factory = create_session_factory(engine)
+    importer = ProductImporter(session_factory, chunk_size=chunk_size)
+
+    async with session_factory() as session:
+        references = {
+            'brands': (await session.scalars(select(Brand.name).limit(100))).all(),
+            'manufacturers': (
+                await session.scalars(select(Manufacturer.name).limit(100))
+            ).all(),
+            'countries': (await session.scalars(select(Country.code))).all(),
+            'categories': (await session.scalars(select(Category.id).limit(100))).all(),
+        }
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / 'catalog.csv'
+        try:
+            for title, changed in (('new', 0), ('unchanged', 0), ('10% changed', 0.1)):
+                write_catalog(path, size, references, changed)
+
+                async with session_factory.begin() as session:
+                    job = await SAProductImportRepository(session).add(
+                        ProductImportEntity(filename=path.name)
+                    )
+                started_at = time.perf_counter()
+                job = await importer.run(job.id, path, 'csv')
+                elapsed = time.perf_counter() - started_at
+
+                print(
+                    f'{title:>12}: {elapsed:7.1f} s, '
+                    f'{job.rows_read / elapsed:8.0f} rows/s, '
+                    f'{job.inserted} inserted, {job.updated} updated, '
+                    f'{job.unchanged} unchanged, {job.status} {job.error or ""}'
+                )
+        finally:
+            async with session_factory.begin() as session:
+                await session.execute(delete(Product).where(Product.sku.is_not(None)))
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f'max RSS: {max_rss:.0f} MB')
+    await engine.dispose()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--size', type=int, default=1000000)
+    parser.add_argument('--chunk-size', type=int, default=10000)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.size, args.chunk_size))
@@ -0,0 +1,284 @@
+"""
+Latency of `GET /products` on a catalog of 1M products, target p99 < 20 ms.
+
+Seed the catalog into the database from the settings (use a scratch database),
+run the server (`uvicorn main:app --workers 1`) and then measure:
+
+    python -m benchmarks.bench_products seed --products 1000000
+    python -m benchmarks.bench_products run --url http://127.0.0.1:8000
+    python -m benchmarks.bench_products cleanup
+
+Every scenario picks a random brand, category, etc. for each request and walks
+a few pages deep by following the `X-Next-Cursor` header.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import uuid
+
+import httpx
+from sqlalchemy import delete, insert, select, text
+
+from benchmarks.utils import LoadResult
+from config import get_settings
+from database.base import create_engine, create_session_factory
+from database.models import Brand, Category, Country, Manufacturer, Product
+
+NAME_PREFIX = 'Bench'
+ROOT_CATEGORIES = 10
+SUB_CATEGORIES = 10
+BRANDS = 500
+MANUFACTURERS = 200
+BATCH_SIZE = 100_000
+
+INSERT_PRODUCTS = text(
+    """
+INSERT INTO product (
+    id, name, description, price, original_price, discount, stock, is_active,
+    volume, volume_type, brand_id, manufacturing_country_id, manufacturer_id,
+    category_id
+)
+SELECT
+    gen_random_uuid(),
+    'Bench product ' || i,
+    'benchmark',
+    price,
+    price + discount,
+    discount,
+    CASE WHEN random() < 0.2 THEN 0 ELSE floor(random() * 100) END,
+    random() < 0.9,
+    1,
+    'items',
+    CASE WHEN random() < 0.1 THEN NULL ELSE brand_ids[1 + floor(random() * cardinality(brand_ids))::int] END,
+    country_ids[1 + floor(random() * cardinality(country_ids))::int],
+    manufacturer_ids[1 + floor(random() * cardinality(manufacturer_ids))::int],
+    category_ids[1 + floor(random() * cardinality(category_ids))::int]
+FROM
+    CAST(:brand_ids AS uuid[]) AS brand_ids,
+    CAST(:country_ids AS uuid[]) AS country_ids,
+    CAST(:manufacturer_ids AS uuid[]) AS manufacturer_ids,
+    CAST(:category_ids AS uuid[]) AS category_ids,
+    generate_series(CAST(:start AS int), CAST(:stop AS int)) AS i,
+    -- Referencing i makes the subquery evaluated once per row
+    LATERAL (
+        SELECT
+            round((1 + random() * 5000)::numeric, 2) AS price,
+            round((random() * 500)::numeric, 2) AS discount
+        WHERE i IS NOT NULL
+    ) AS money
+"""
+)
+
+
+async def seed(products: int):
+    engine = create_engine(get_settings())
+    session_factory = create_session_factory(engine)
+
+    roots = [
+        {'id': uuid.uuid4(), 'name': f'{NAME_PREFIX} category {i}', 'parent_id': None}
+        for i in range(ROOT_CATEGORIES)
+    ]
+    middles = [
+        {'id': uuid.uuid4(), 'name': f'{root["name"]}.{i}', 'parent_id': root['id']}
+        for root in roots
+        for i in range(SUB_CATEGORIES)
+    ]
+    leaves = [
+        {'id': uuid.uuid4(), 'name': f'{middle["name"]}.{i}', 'parent_id': middle['id']}
+        for middle in middles
+        for i in range(SUB_CATEGORIES)
+    ]
+    brands = [{'name': f'{NAME_PREFIX} brand {i}'} for i in range(BRANDS)]
+    manufacturers = [
+        {'name': f'{NAME_PREFIX} manufacturer {i}'} for i in range(MANUFACTURERS)
+    ]
+
+    async with session_factory.begin() as session:
+        await session.execute(insert(Category), roots + middles + leaves)
+        brand_ids = (
+            await session.scalars(insert(Brand).returning(Brand.id), brands)
+        ).all()
+        manufacturer_ids = (
+            await session.scalars(
+                insert(Manufacturer).returning(Manufacturer.id), manufacturers
+            )
+        ).all()
+        country_ids = (await session.scalars(select(Country.id))).all()
+
+    started_at = time.perf_counter()
+    for start in range(1, products + 1, BATCH_SIZE):
+        async with session_factory.begin() as session:
+            await session.execute(
+                INSERT_PRODUCTS,
+                {
+                    'start': start,
+                    'stop': min(start + BATCH_SIZE - 1, products),
+                    'brand_ids': list(brand_ids),
+                    'country_ids': list(country_ids),
+                    'manufacturer_ids': list(manufacturer_ids),
+                    'category_ids': [leaf['id'] for leaf in leaves],
+                },
+            )
+        print(f'{min(start + BATCH_SIZE - 1, products)} products inserted')
+
+    async with engine.connect() as connection:
+        await connection.execution_options(isolation_level='AUTOCOMMIT')
+        await connection.execute(text('VACUUM ANALYZE product'))
+
+    print(f'Seeded in {time.perf_counter() - started_at:.1f} s')
+    await engine.dispose()
+
+
+async def cleanup():
+    engine = create_engine(get_settings())
+    session_factory = create_session_factory(engine)
+
+    async with session_factory.begin() as session:
+        await session.execute(delete(Product).where(Product.description == 'benchmark'))
+        await session.execute(
+            delete(Category).where(Category.name.startswith(NAME_PREFIX))
+        )
+        await session.execute(delete(Brand).where(Brand.name.startswith(NAME_PREFIX)))
+        await session.execute(
+            delete(Manufacturer).where(Manufacturer.name.startswith(NAME_PREFIX))
+        )
+
+    await engine.dispose()
+
+
+async def load_filter_values() -> dict[str, list[str]]:
+    engine = create_engine(get_settings())
+    session_factory = create_session_factory(engine)
+
+    async with session_factory() as session:
+        category_ids = (
+            await session.execute(
+                select(Category.id, Category.parent_id).where(
+                    Category.name.startswith(NAME_PREFIX)
+                )
+            )
+        ).all()
+        values = {
+            'root_category_id': [
+                str(row.id) for row in category_ids if row.parent_id is None
+            ],
+            'category_id': [
+                str(row.id) for row in category_ids if row.parent_id is not None
+            ],
+            'brand_id': [
+                str(brand_id)
+                for brand_id in await session.scalars(
+                    select(Brand.id).where(Brand.name.startswith(NAME_PREFIX))
+                )
+            ],
+            'manufacturer_id': [
+                str(manufacturer_id)
+                for manufacturer_id in await session.scalars(
+                    select(Manufacturer.id).where(
+                        Manufacturer.name.startswith(NAME_PREFIX)
+                    )
+                )
+            ],
+        }
+
+    await engine.dispose()
+    return values
+
+
+def get_scenarios(values: dict[str, list[str]]) -> dict:
+    def pick(key: str) -> str:
+        return random.choice(values[key])
+
+    return {
+        'cheapest': lambda: {},
+        'biggest discount': lambda: {'sort': '-discount'},
+        'by name': lambda: {'sort': 'name'},
+        'in stock, price range': lambda: {
+            'in_stock': 'true',
+            'min_price': random.randint(1, 4000),
+            'max_price': 5000,
+        },
+        'leaf or middle category': lambda: {'category_id': pick('category_id')},
+        'root category, most expensive': lambda: {
+            'category_id': pick('root_category_id'),
+            'sort': '-price',
+        },
+        'brand': lambda: {'brand_id': pick('brand_id')},
+        'manufacturer, in stock': lambda: {
+            'manufacturer_id': pick('manufacturer_id'),
+            'in_stock': 'true',
+        },
+    }
+
+
+async def walk_pages(
+    client: httpx.AsyncClient, params: dict, pages: int, latencies: list[float]
+) -> int:
+    """
+    Requests up to `pages` pages following the cursor
+
+    :return: Number of failed requests
+    """
+    params = {'limit': 20, **params}
+    for _ in range(pages):
+        started_at = time.perf_counter()
+        response = await client.get('/products', params=params)
+        latencies.append(time.perf_counter() - started_at)
+        if response.status_code >= 400:
+            return 1
+
+        cursor = response.headers.get('X-Next-Cursor')
+        if cursor is None:
+            break
+        params['cursor'] = cursor
+
+    return 0
+
+
+async def run(url: str, requests: int, pages: int):
+    scenarios = get_scenarios(await load_filter_values())
+
+    async with httpx.AsyncClient(base_url=url) as client:
+        for title, make_params in scenarios.items():
+            # Warm up: Postgres plans prepared statements on the first executions
+            for _ in range(10):
+                await walk_pages(client, make_params(), pages, [])
+
+            latencies = []
+            errors = 0
+            started_at = time.perf_counter()
+            while len(latencies) < requests:
+                errors += await walk_pages(client, make_params(), pages, latencies)
+
+            result = LoadResult(
+                requests=len(latencies),
+                errors=errors,
+                elapsed=time.perf_counter() - started_at,
+                latencies=latencies,
+            )
+            print(result.report(f'{title:>30}'))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    seed_parser = subparsers.add_parser('seed')
+    seed_parser.add_argument('--products', type=int, default=1_000_000)
+
+    run_parser = subparsers.add_parser('run')
+    run_parser.add_argument('--url', default='http://127.0.0.1:8000')
+    run_parser.add_argument('--requests', type=int, default=500)
+    run_parser.add_argument('--pages', type=int, default=5)
+
+    subparsers.add_parser('cleanup')
+
+    args = parser.parse_args()
+    if args.command == 'seed':
+        asyncio.run(seed(args.products))
+    elif args.command == 'run':
+        asyncio.run(run(args.url, args.requests, args.pages))
+    else:
+        asyncio.run(cleanup())
@@ -0,0 +1,79 @@
+"""
+Listing brands with `GenericSARepository.list` at 100, 1k and 10k rows.
+
+Compares the previous per-record conversion of ORM instances with the bulk
+conversion of ORM instances and of plain column rows (`select_columns`).
+The brands are inserted into the database from the settings in a transaction
+that is rolled back afterwards.
+
+    python -m benchmarks.bench_repository_list
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+from sqlalchemy import insert
+
+from config import get_settings
+from core.repositories.brand import SABrandRepository
+from database.base import create_engine, create_session_factory
+from database.models import Brand
+
+SIZES = (100, 1000, 10000)
+
+
+class PerRecordRepository(SABrandRepository):
+    select_columns = False
+
+    async def _convert_db_to_entities(self, records, **kwargs):
+        return [await self._convert_db_to_entity(record) for record in records]
+
+
+class BulkORMRepository(SABrandRepository):
+    select_columns = False
+
+
+async def main(repeat: int):
+    engine = create_engine(get_settings())
+    session_factory = create_session_factory(engine)
+
+    brands = [
+        {'id': uuid.uuid4(), 'name': f'Brand {number:05}'}
+        for number in range(max(SIZES))
+    ]
+    async with session_factory() as session:
+        await session.execute(insert(Brand), brands)
+
+        for size in SIZES:
+            for title, repository_cls in (
+                ('per record, ORM', PerRecordRepository),
+                ('bulk, ORM', BulkORMRepository),
+                ('bulk, columns', SABrandRepository),
+            ):
+                repository = repository_cls(session)
+                timings = []
+                for _ in range(repeat):
+                    # Every run starts with an empty identity map
+                    session.expunge_all()
+                    started_at = time.perf_counter()
+                    await repository.list(limit=size)
+                    timings.append(time.perf_counter() - started_at)
+
+                print(
+                    f'{size:>5} rows, {title:>15}: '
+                    f'best {min(timings) * 1000:8.2f} ms'
+                )
+
+        await session.rollback()
+
+    await engine.dispose()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.repeat))
@@ -0,0 +1,137 @@
+"""
+Static file serving: Starlette's `StaticFiles` against `CachedStaticFiles`.
+
+Both are mounted over the same temporary directory in a server started by
+the benchmark itself, no database is needed:
+
+    python -m benchmarks.bench_static
+
+`/old` is the previous mount, `/new` the current one. Each scenario prints
+the request rate and the bytes received.
+"""
+
+import argparse
+import asyncio
+import gzip
+import io
+import os
+import random
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import httpx
+from PIL import Image
+from starlette.applications import Starlette
+from starlette.routing import Mount
+from starlette.staticfiles import StaticFiles
+
+from api.static import CachedStaticFiles
+from benchmarks.utils import run_load
+
+STATIC_DIR = os.environ.get('BENCH_STATIC_DIR', '.')
+
+app = Starlette(
+    routes=[
+        Mount('/old', StaticFiles(directory=STATIC_DIR)),
+        Mount('/new', CachedStaticFiles(directory=STATIC_DIR)),
+    ]
+)
+
+
+def make_files(directory: Path) -> None:
+    avatar = io.BytesIO()
+    Image.effect_noise((200, 200), 64).convert('RGB').save(avatar, format='JPEG')
+    (directory / 'avatar.jpeg').write_bytes(avatar.getvalue())
+
+    rng = random.Random(42)
+    words = ['const', 'function', 'return', 'await', 'product', 'category', '=>']
+    script = ' '.join(rng.choice(words) for _ in range(40000)).encode()
+    (directory / 'app.js').write_bytes(script)
+    (directory / 'app.js.gz').write_bytes(gzip.compress(script, 9))
+
+
+async def main(port: int, requests: int, concurrency: int):
+    with tempfile.TemporaryDirectory() as directory:
+        make_files(Path(directory))
+
+        server = subprocess.Popen(
+            [
+                sys.executable,
+                '-m',
+                'uvicorn',
+                'benchmarks.bench_static:app',
+                '--port',
+                str(port),
+                '--log-level',
+                'warning',
+            ],
+            env={**os.environ, 'BENCH_STATIC_DIR': directory},
+        )
+        try:
+            async with httpx.AsyncClient(
+                base_url=f'http://127.0.0.1:{port}', timeout=30
+            ) as client:
+                for _ in range(50):
+                    try:
+                        await client.get('/new/avatar.jpeg')
+                        break
+                    except httpx.TransportError:
+                        await asyncio.sleep(0.1)
+
+                for mount in ('old', 'new'):
+                    etag = (await client.head(f'/{mount}/avatar.jpeg')).headers['etag']
+                    scenarios = [
+                        ('avatar', 'avatar.jpeg', {}),
+                        (
+                            'avatar, If-None-Match',
+                            'avatar.jpeg',
+                            {'If-None-Match': etag},
+                        ),
+                        (
+                            'avatar, Range 1 KB',
+                            'avatar.jpeg',
+                            {'Range': 'bytes=0-1023'},
+                        ),
+                        ('app.js, gzip', 'app.js', {'Accept-Encoding': 'gzip'}),
+                    ]
+                    for title, path, headers in scenarios:
+                        received = 0
+
+                        async def count_bytes(response: httpx.Response):
+                            nonlocal received
+                            await response.aread()
+                            received += response.num_bytes_downloaded
+
+                        client.event_hooks['response'] = [count_bytes]
+                        result = await run_load(
+                            client,
+                            'GET',
+                            f'/{mount}/{path}',
+                            requests,
+                            concurrency,
+                            headers=headers,
+                        )
+                        client.event_hooks['response'] = []
+
+                        status = (
+                            await client.get(f'/{mount}/{path}', headers=headers)
+                        ).status_code
+                        print(
+                            result.report(f'{mount} {title} ({status})')
+                            + f', {received / result.requests / 1024:.1f} KB/response'
+                        )
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--port', type=int, default=8012)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=16)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.port, args.requests, args.concurrency))
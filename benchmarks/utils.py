@@ -0,0 +1,78 @@
+import asyncio
+import statistics
+import time
+from dataclasses import dataclass
+
+import httpx
+
+
+@dataclass
+class LoadResult:
+    requests: int
+    errors: int
+    elapsed: float
+    latencies: list[float]
+
+    @property
+    def rps(self) -> float:
+        return self.requests / self.elapsed
+
+    def percentile(self, percent: float) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, int(len(ordered) * percent / 100))
+        return ordered[index]
+
+    def report(self, title: str) -> str:
+        return (
+            f'{title}: {self.requests} requests, {self.errors} errors, '
+            f'{self.rps:.1f} req/s, '
+            f'mean {statistics.fmean(self.latencies) * 1000:.2f} ms, '
+            f'p50 {self.percentile(50) * 1000:.2f} ms, '
+            f'p99 {self.percentile(99) * 1000:.2f} ms'
+        )
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    method: str,
+    url: str,
+    requests: int,
+    concurrency: int,
+    **request_kwargs,
+) -> LoadResult:
+    """
+    Sends `requests` requests with at most `concurrency` of them in flight
+
+    :param client: Client used to send requests
+    :param method: HTTP method
+    :param url: Requested url (absolute or relative to the client base url)
+    :param requests: Total number of requests
+    :param concurrency: Number of concurrent workers
+    :return: Collected latencies and error count
+    """
+    latencies = []
+    errors = 0
+    remaining = requests
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            started_at = time.perf_counter()
+            try:
+                response = await client.request(method, url, **request_kwargs)
+                if response.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - started_at)
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started_at
+
+    return LoadResult(
+        requests=len(latencies), errors=errors, elapsed=elapsed, latencies=latencies
+    )
@@ -1,5 +1,7 @@
 from functools import lru_cache, cached_property
+from typing import Annotated, Literal
 
+from pydantic import Field
 from pydantic_settings import BaseSettings
 
 
@@ -10,9 +12,108 @@ class Settings(BaseSettings):
     postgres_host: str = 'postgres'
     postgres_port: int = 5432
 
+    db_pool_size: int = 10
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30
+    db_pool_pre_ping: bool = True
+    db_pool_recycle: int = 1800
+    db_statement_cache_size: int = 256
+
     secret_key: str
     algorithm: str = 'HS256'
     access_token_expires_minutes: int = 30
+    # Put `is_superuser` into access tokens, so admin checks need no user lookup.
+    # A revoked superuser keeps admin rights until their token expires
+    superuser_token_claim: bool = False
+    # Token Prometheus sends as `Authorization: Bearer <token>` to read /metrics,
+    # empty disables the endpoint
+    metrics_token: str = ''
+
+    # Send responses with orjson and write entities matching the response model
+    # straight to JSON instead of validating them again
+    fast_json_responses: bool = False
+
+    # Responses smaller than this many bytes are sent uncompressed
+    compression_minimum_size: int = 1024
+    # Bodies of this many bytes and more are compressed in a worker thread
+    compression_thread_size: int = 256 * 1024
+    # Compressed bodies of responses with an ETag kept in each process
+    compression_cache_size: int = 1000
+
+    # bcrypt work factor of new password hashes, each step doubles the cost
+    bcrypt_rounds: Annotated[int, Field(ge=4, le=31)] = 12
+    # Threads hashing passwords at the same time, other calls wait in a queue
+    password_hashing_workers: Annotated[int, Field(ge=1)] = 2
+
+    # Seconds the in-process category tree is served without checking
+    # the table version in the database, 0 checks it on every read
+    category_tree_cache_ttl: float = 0
+
+    # Seconds the in-process copy of the countries is served without checking
+    # the table version in the database, 0 checks it on every read
+    country_cache_ttl: float = 0
+
+    # Seconds the table versions behind cached brand, manufacturer and category
+    # responses are trusted without checking the database, 0 checks them
+    # on every request. Bodies of this many URLs are kept in each process
+    response_cache_ttl: float = 0
+    response_cache_size: int = 1000
+
+    # Seconds the current user is served from the in-process cache,
+    # 0 disables the cache
+    user_cache_ttl: float = 10
+    user_cache_size: int = 10000
+
+    # `postgres` shares the counters between processes,
+    # `memory` counts in each process and suits single-node deployments
+    rate_limiter_backend: Literal['postgres', 'memory'] = 'postgres'
+    # Attempts allowed per phone number during the window (in seconds)
+    phone_key_create_limit: int = 3
+    phone_key_create_window: float = 3600
+    # Failed attempts allowed per phone number and client IP
+    login_attempts_limit: int = 10
+    login_attempts_window: float = 300
+    # Attempts allowed per phone number from all client IPs together
+    # during the same window, stops guessing spread across many addresses
+    login_phone_attempts_limit: int = 100
+
+    # `local` keeps uploaded files in `static/`, `s3` in an S3-compatible bucket
+    file_storage_backend: Literal['local', 's3'] = 'local'
+    # URL the stored files are served at, by default the `static/` mount
+    # for `local` and the bucket URL for `s3`
+    file_storage_url: str | None = None
+    # Threads doing filesystem calls of uploaded files
+    file_storage_workers: Annotated[int, Field(ge=1)] = 4
+    s3_endpoint_url: str = 'http://minio:9000'
+    s3_bucket: str = 'severyanochka'
+    s3_region: str = 'us-east-1'
+    s3_access_key_id: str = ''
+    s3_secret_access_key: str = ''
+    # Files larger than a part are sent with a multipart upload
+    s3_part_size: Annotated[int, Field(ge=5 * 1024 * 1024)] = 8 * 1024 * 1024
+    s3_max_connections: Annotated[int, Field(ge=1)] = 20
+    # Processes resizing uploaded avatars into variants
+    image_processing_workers: Annotated[int, Field(ge=1)] = 2
+
+    # Seconds between sweeps of expired phone keys, 0 disables the sweeper
+    phone_key_sweep_interval: float = 60
+    phone_key_sweep_batch_size: Annotated[int, Field(ge=1)] = 1000
+    # Days partitions of a partitioned `phone_key` are kept
+    phone_key_partition_retention_days: Annotated[int, Field(ge=1)] = 2
+
+    # Seconds between runs of the orphaned avatar collector, 0 disables it
+    avatar_collector_interval: float = 0
+    # Seconds an unreferenced avatar file is kept after its last modification
+    avatar_collector_min_age: Annotated[float, Field(ge=0)] = 3600
+    # Files scanned per second by the collector
+    avatar_collector_files_per_second: Annotated[float, Field(gt=0)] = 1000
+    # File the position of an unfinished collection is kept in
+    avatar_collector_state_path: str = '.avatar-collector-state'
+
+    # Rows of an import file parsed and copied per transaction
+    product_import_chunk_size: Annotated[int, Field(ge=1)] = 10000
+    # Failed rows recorded per import, the rest are only counted
+    product_import_max_errors: Annotated[int, Field(ge=0)] = 1000
 
     @cached_property
     def database_url(self) -> str:
@@ -0,0 +1,302 @@
+"""
+Deletes avatar files no user refers to.
+
+    python -m core.avatar_collector [--dry-run]
+
+A run walks the local file storage and picks up where an interrupted run
+stopped. The API runs it in the background when AVATAR_COLLECTOR_INTERVAL
+is set.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from config import get_settings
+from core.avatars import avatar_stem
+from core.metrics import metrics
+from core.repositories.user import SAUserRepository
+from core.storages.local import LocalFileStorage
+from core.storages.providers import get_file_storage
+from database.base import create_engine, create_session_factory
+
+logger = logging.getLogger(__name__)
+
+# Directories of the storage holding avatars, `users` has those uploaded before
+# they were stored by content hash
+AVATAR_DIRECTORIES = ('avatars', 'users')
+# Left by uploads that never finished
+TEMP_PREFIX = '.upload-'
+
+
+def scan_directory(path: Path) -> tuple[list[tuple[str, float]], list[str]]:
+    """
+    :return: Files with their modification times and subdirectories,
+        both sorted by name
+    """
+    files = []
+    directories = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    directories.append(entry.name)
+                elif entry.is_file(follow_symlinks=False):
+                    files.append((entry.name, entry.stat().st_mtime))
+    except FileNotFoundError:
+        pass
+    return sorted(files), sorted(directories)
+
+
+def delete_files(directory: Path, names: list[str], older_than: float) -> int:
+    """
+    :param older_than: Files modified since are kept, the modification time
+        is checked again right before deleting
+    :return: Number of deleted files
+    """
+    deleted = 0
+    for name in names:
+        path = directory / name
+        try:
+            if path.stat().st_mtime >= older_than:
+                continue
+            path.unlink()
+        except FileNotFoundError:
+            continue
+        deleted += 1
+    return deleted
+
+
+class AvatarCollector:
+    """
+    Reconciles avatar files with `User.avatar_key` and deletes the files
+    no user refers to: avatars of failed uploads, replaced avatars whose
+    deletion was interrupted, their variants and temporary files.
+
+    Directories are walked one at a time in name order, for each one the avatar
+    keys under it are streamed from the database. The last finished directory
+    is saved to `state_path`, so a stopped run resumes from there. Files
+    younger than `min_age` are never deleted: an upload writes the file
+    before the user refers to it, and reusing a stored file refreshes
+    its modification time
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        root: Path,
+        state_path: Path,
+        min_age: float = 3600,
+        files_per_second: float = 1000,
+        batch_size: int = 1000,
+        interval: float = 86400,
+        dry_run: bool = False,
+    ):
+        """
+        :param session_factory: Factory of the collector's own sessions
+        :param root: Root directory of the local file storage
+        :param state_path: File the position of an unfinished run is kept in
+        :param min_age: Seconds since the last modification before
+            an unreferenced file is deleted
+        :param files_per_second: Limit of scanned files, spreads the disk load
+        :param batch_size: Avatar keys fetched from the database at once
+        :param interval: Seconds between runs in the background
+        :param dry_run: Only count and log the files that would be deleted
+        """
+        self._session_factory = session_factory
+        self.root = root
+        self.state_path = state_path
+        self.min_age = min_age
+        self.files_per_second = files_per_second
+        self.batch_size = batch_size
+        self.interval = interval
+        self.dry_run = dry_run
+
+        self._resume_from: tuple[str, ...] | None = None
+        self._saved_at = 0.0
+        self._started_at = 0.0
+        self._scanned = 0
+        self._deleted = 0
+
+        self.scanned = metrics.counter(
+            'avatar_collector_scanned_files_total',
+            'Files and directories scanned by the avatar collector',
+        )
+        self.deleted = metrics.counter(
+            'avatar_collector_deleted_files_total',
+            'Unreferenced avatar files deleted by the avatar collector',
+        )
+        self.errors = metrics.counter(
+            'avatar_collector_errors_total',
+            'Avatar collector runs failed with an error',
+        )
+
+    async def collect(self) -> int:
+        """
+        Walks the storage once, resuming an unfinished run
+
+        :return: Number of deleted files, of files to delete on a dry run
+        """
+        self._resume_from = self._load_state()
+        if self._resume_from is not None:
+            logger.info(
+                'Resuming avatar collection after %s', '/'.join(self._resume_from)
+            )
+        self._started_at = time.monotonic()
+        self._scanned = 0
+        self._deleted = 0
+
+        for directory in AVATAR_DIRECTORIES:
+            await self._collect_directory((directory,))
+
+        self._save_state(None)
+        return self._deleted
+
+    async def _collect_directory(self, parts: tuple[str, ...]) -> None:
+        resume_from = self._resume_from
+        # Finished by a previous run unless the resumed directory is inside
+        if (
+            resume_from is not None
+            and parts < resume_from
+            and parts != resume_from[: len(parts)]
+        ):
+            return
+
+        path = self.root.joinpath(*parts)
+        files, directories = await asyncio.to_thread(scan_directory, path)
+        self._scanned += len(files) + len(directories)
+        self.scanned.inc(len(files) + len(directories))
+
+        if resume_from is None or parts > resume_from:
+            if files:
+                await self._collect_files(parts, files)
+            self._save_state(parts)
+
+        await self._throttle()
+
+        for name in directories:
+            await self._collect_directory((*parts, name))
+
+    async def _collect_files(
+        self, parts: tuple[str, ...], files: list[tuple[str, float]]
+    ) -> None:
+        directory = '/'.join(parts)
+        older_than = time.time() - self.min_age
+        candidates = [name for name, mtime in files if mtime < older_than]
+
+        avatars = [name for name in candidates if not name.startswith(TEMP_PREFIX)]
+        referenced = set()
+        if avatars:
+            async with self._session_factory() as session:
+                repository = SAUserRepository(session)
+                async for avatar_key in repository.stream_avatar_keys(
+                    f'{directory}/', self.batch_size
+                ):
+                    referenced.add(avatar_stem(avatar_key))
+
+        orphans = [
+            name
+            for name in candidates
+            if avatar_stem(f'{directory}/{name}') not in referenced
+        ]
+        if not orphans:
+            return
+
+        if self.dry_run:
+            logger.info('Would delete from %s: %s', directory, ', '.join(orphans))
+            self._deleted += len(orphans)
+            return
+
+        deleted = await asyncio.to_thread(
+            delete_files, self.root.joinpath(*parts), orphans, older_than
+        )
+        self._deleted += deleted
+        self.deleted.inc(deleted)
+
+    async def _throttle(self) -> None:
+        expected = self._scanned / self.files_per_second
+        elapsed = time.monotonic() - self._started_at
+        if expected > elapsed:
+            await asyncio.sleep(expected - elapsed)
+
+    def _load_state(self) -> tuple[str, ...] | None:
+        try:
+            state = json.loads(self.state_path.read_text())
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            logger.warning(
+                'Avatar collector state %s is broken, starting over', self.state_path
+            )
+            return None
+        return tuple(state['directory'])
+
+    def _save_state(self, parts: tuple[str, ...] | None) -> None:
+        """
+        :param parts: The last finished directory, None when the run is over
+        """
+        if parts is None:
+            self.state_path.unlink(missing_ok=True)
+            return
+
+        # Written at most once a second, a resumed run repeats a few directories
+        now = time.monotonic()
+        if now - self._saved_at < 1:
+            return
+        self._saved_at = now
+        self.state_path.write_text(json.dumps({'directory': parts}))
+
+    async def run(self) -> None:
+        """
+        Collects every `interval` seconds until cancelled
+        """
+        while True:
+            try:
+                deleted = await self.collect()
+                logger.info('Avatar collector deleted %s files', deleted)
+            except Exception:
+                self.errors.inc()
+                logger.exception('Avatar collection failed')
+
+            await asyncio.sleep(self.interval)
+
+
+async def main(dry_run: bool) -> None:
+    settings = get_settings()
+    file_storage = get_file_storage()
+    if not isinstance(file_storage, LocalFileStorage):
+        raise SystemExit('The avatar collector works with the local file storage only')
+
+    engine = create_engine(settings)
+    collector = AvatarCollector(
+        create_session_factory(engine),
+        file_storage.root,
+        Path(settings.avatar_collector_state_path),
+        min_age=settings.avatar_collector_min_age,
+        files_per_second=settings.avatar_collector_files_per_second,
+        dry_run=dry_run,
+    )
+    try:
+        deleted = await collector.collect()
+    finally:
+        await engine.dispose()
+        await file_storage.close()
+
+    print(f'{"Found" if dry_run else "Deleted"} {deleted} unreferenced files')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        '--dry-run', action='store_true', help='Only list the files to delete'
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main(args.dry_run))
@@ -0,0 +1,54 @@
+import posixpath
+import re
+
+# Side lengths of the square avatar variants
+AVATAR_VARIANT_SIZES = (64, 128, 512)
+# Extensions of the variant files and the Pillow formats they are saved in
+AVATAR_VARIANT_FORMATS = {'webp': 'WEBP', 'jpeg': 'JPEG'}
+
+# `FileStorageBase.content_addressed_path` of an avatar
+CONTENT_ADDRESSED_AVATAR = re.compile(
+    r'(?:^|/)([0-9a-f]{2})/([0-9a-f]{2})/\1\2[0-9a-f]{60}\.\w+$'
+)
+
+
+def has_avatar_variants(avatar_path: str) -> bool:
+    """
+    Variants are made for content-addressed avatars only, legacy avatars
+    under `users/` have none
+    """
+    return CONTENT_ADDRESSED_AVATAR.search(avatar_path) is not None
+
+
+def avatar_variant_path(avatar_path: str, size: int, extension: str) -> str:
+    """
+    Variants are stored next to the avatar: `avatar-ab12.png` has
+    `avatar-ab12-64.webp` and so on
+
+    :param avatar_path: Path of the uploaded avatar
+    :param size: One of `AVATAR_VARIANT_SIZES`
+    :param extension: One of `AVATAR_VARIANT_FORMATS`
+    """
+    root, _ = posixpath.splitext(avatar_path)
+    return f'{root}-{size}.{extension}'
+
+
+def avatar_variant_paths(avatar_path: str) -> list[str]:
+    return [
+        avatar_variant_path(avatar_path, size, extension)
+        for size in AVATAR_VARIANT_SIZES
+        for extension in AVATAR_VARIANT_FORMATS
+    ]
+
+
+def avatar_stem(path: str) -> str:
+    """
+    :return: Path of the avatar without the extension, the same for the avatar
+        and all its variants
+    """
+    root, extension = posixpath.splitext(path)
+    if extension[1:] in AVATAR_VARIANT_FORMATS:
+        for size in AVATAR_VARIANT_SIZES:
+            if root.endswith(f'-{size}'):
+                return root.removesuffix(f'-{size}')
+    return root
@@ -0,0 +1,164 @@
+import asyncio
+import time
+from uuid import UUID
+
+from core.entities.category import CategoryEntity
+
+
+class CategoryTreeCache:
+    """
+    In-process snapshot of the whole category tree indexed by id and by parent_id.
+
+    The snapshot is labeled with the `category` table version it was loaded at.
+    Readers compare it with the version in the database (at most once per `ttl`
+    seconds), writers patch it in place right after their commit.
+    """
+
+    def __init__(self, ttl: float = 0):
+        """
+        :param ttl: How many seconds the snapshot is trusted without checking
+            the version in the database. 0 means check on every read
+        """
+        self.ttl = ttl
+        self.version: int | None = None
+        self.lock = asyncio.Lock()
+
+        self._checked_at = 0.0
+        self._by_id: dict[UUID, CategoryEntity] = {}
+        self._by_parent_id: dict[UUID | None, list[UUID]] = {}
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.version is not None
+
+    @property
+    def is_fresh(self) -> bool:
+        """
+        The snapshot can be used without checking the version
+        """
+        return self.is_loaded and time.monotonic() - self._checked_at < self.ttl
+
+    def mark_checked(self) -> None:
+        self._checked_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        self.version = None
+
+    def load(self, categories: list[CategoryEntity], version: int) -> None:
+        """
+        Replaces the snapshot
+
+        :param categories: All categories, `child` is ignored
+        :param version: Table version the categories were read at
+        """
+        self._by_id = {}
+        self._by_parent_id = {}
+        for category in categories:
+            self._put(category)
+
+        self.version = version
+        self.mark_checked()
+
+    def apply(
+        self,
+        version_before: int,
+        version_after: int,
+        put: CategoryEntity | None = None,
+        remove: UUID | None = None,
+    ) -> None:
+        """
+        Patches the snapshot with a committed write.
+        If the snapshot was not up-to-date before the write, it is invalidated instead
+
+        :param version_before: Table version locked before the write
+        :param version_after: Table version after the write
+        :param put: Created or updated category
+        :param remove: Id of deleted category
+        """
+        if not self.is_loaded or self.version != version_before or version_before == 0:
+            self.invalidate()
+            return
+
+        if remove is not None:
+            self._remove(remove)
+        if put is not None:
+            self._put(put)
+
+        self.version = version_after
+        self.mark_checked()
+
+    def get_root_categories(self, depth: int) -> list[CategoryEntity]:
+        return [
+            self._build_tree(category_id, depth)
+            for category_id in self._by_parent_id.get(None, [])
+        ]
+
+    def get_by_id(self, category_id: UUID, depth: int) -> CategoryEntity | None:
+        if category_id not in self._by_id:
+            return None
+
+        return self._build_tree(category_id, depth)
+
+    def get_subtree_ids(self, category_id: UUID) -> list[UUID]:
+        """
+        Ids of the category and all its subcategories at any depth,
+        an empty list if the category does not exist
+        """
+        if category_id not in self._by_id:
+            return []
+
+        subtree_ids = [category_id]
+        seen = {category_id}
+        for parent_id in subtree_ids:
+            for sub_category_id in self._by_parent_id.get(parent_id, []):
+                if sub_category_id not in seen:
+                    seen.add(sub_category_id)
+                    subtree_ids.append(sub_category_id)
+
+        return subtree_ids
+
+    def _build_tree(self, category_id: UUID, depth: int) -> CategoryEntity:
+        category = self._by_id[category_id]
+
+        if depth > 0:
+            child = [
+                self._build_tree(sub_category_id, depth - 1)
+                for sub_category_id in self._by_parent_id.get(category_id, [])
+            ]
+        else:
+            child = []
+
+        # Cached categories are already validated
+        return CategoryEntity.model_construct(
+            id=category.id,
+            name=category.name,
+            parent_id=category.parent_id,
+            child=child,
+        )
+
+    def _put(self, category: CategoryEntity) -> None:
+        old_category = self._by_id.get(category.id)
+        if old_category is not None and old_category.parent_id != category.parent_id:
+            self._by_parent_id[old_category.parent_id].remove(category.id)
+            old_category = None
+
+        self._by_id[category.id] = CategoryEntity.model_construct(
+            id=category.id, name=category.name, parent_id=category.parent_id
+        )
+        if old_category is None:
+            self._by_parent_id.setdefault(category.parent_id, []).append(category.id)
+
+    def _remove(self, category_id: UUID) -> None:
+        category = self._by_id.pop(category_id, None)
+        if category is None:
+            return
+
+        self._by_parent_id[category.parent_id].remove(category_id)
+
+        # Mirrors ON DELETE SET NULL of category.parent_id
+        for sub_category_id in self._by_parent_id.pop(category_id, []):
+            sub_category = self._by_id[sub_category_id]
+            self._by_id[sub_category_id] = CategoryEntity.model_construct(
+                id=sub_category.id, name=sub_category.name, parent_id=None
+            )
+            self._by_parent_id.setdefault(None, []).append(sub_category_id)
@@ -0,0 +1,141 @@
+import asyncio
+import time
+from uuid import UUID
+
+from core.entities.country import CountryEntity
+from core.exceptions.base import BadCursorError
+from core.repositories.base import decode_cursor, encode_cursor
+
+
+class CountryCache:
+    """
+    In-process copy of the `country` table indexed by id and by code.
+
+    The copy is labeled with the `country` table version it was loaded at,
+    readers compare it with the version in the database (at most once per `ttl`
+    seconds). Each country is serialized to JSON once, list pages are joined
+    from the serialized countries.
+
+    Offset pages keep the order the table is read in, cursor pages keep
+    the order by name and id the database returned, so they are sorted
+    with the database collation like the keyset pages of the repositories
+    """
+
+    # Label of cursors, the same as those of the country repository
+    cursor_label = 'name'
+
+    def __init__(self, ttl: float = 0):
+        """
+        :param ttl: How many seconds the copy is trusted without checking
+            the version in the database. 0 means check on every read
+        """
+        self.ttl = ttl
+        self.version: int | None = None
+        self.lock = asyncio.Lock()
+
+        self._checked_at = 0.0
+        self._by_id: dict[UUID, CountryEntity] = {}
+        self._by_code: dict[str, CountryEntity] = {}
+        self._json: list[bytes] = []
+        self._by_name: list[CountryEntity] = []
+        self._name_positions: dict[UUID, int] = {}
+        self._json_by_name: list[bytes] = []
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.version is not None
+
+    @property
+    def is_fresh(self) -> bool:
+        """
+        The copy can be used without checking the version
+        """
+        return self.is_loaded and time.monotonic() - self._checked_at < self.ttl
+
+    def mark_checked(self) -> None:
+        self._checked_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        self.version = None
+
+    def load(
+        self, countries: list[CountryEntity], name_order: list[UUID], version: int
+    ) -> None:
+        """
+        Replaces the copy
+
+        :param countries: All countries in the order of offset pages
+        :param name_order: Ids of the countries ordered by name and id
+            in the database
+        :param version: Table version the countries were read at
+        """
+        self._by_id = {country.id: country for country in countries}
+        by_name = [self._by_id[country_id] for country_id in name_order]
+        json_by_id = {
+            country.id: country.model_dump_json().encode() for country in countries
+        }
+
+        self._by_code = {country.code: country for country in countries}
+        self._json = [json_by_id[country.id] for country in countries]
+        self._by_name = by_name
+        self._name_positions = {
+            country.id: position for position, country in enumerate(by_name)
+        }
+        self._json_by_name = [json_by_id[country.id] for country in by_name]
+
+        self.version = version
+        self.mark_checked()
+
+    def get_by_id(self, country_id: UUID) -> CountryEntity | None:
+        return self._by_id.get(country_id)
+
+    def get_by_code(self, country_code: str) -> CountryEntity | None:
+        return self._by_code.get(country_code)
+
+    def get_all_json(self, limit: int, offset: int) -> bytes:
+        """
+        :return: JSON array of the countries
+        """
+        return self._join(self._json[offset : offset + limit])
+
+    def decode_cursor(self, after: str) -> tuple[str, UUID]:
+        """
+        :param after: Cursor of the previous page
+        :raises BadCursorError:
+        :return: Name and id of the last country of the previous page
+        """
+        name, country_id = decode_cursor(after, self.cursor_label)
+        if not isinstance(name, str):
+            raise BadCursorError('Malformed cursor')
+
+        return name, country_id
+
+    def get_position_after(self, name: str, country_id: UUID) -> int | None:
+        """
+        :return: Position of the country following the given one in the order
+            by name, None if the copy has no such country to compare with
+        """
+        position = self._name_positions.get(country_id)
+        if position is None or self._by_name[position].name != name:
+            return None
+
+        return position + 1
+
+    def get_all_after_json(self, start: int, limit: int) -> tuple[bytes, str | None]:
+        """
+        :param start: Position of the first country of the page in the order
+            by name
+        :return: JSON array of the countries ordered by name and the cursor
+            of the next page, None on the last page
+        """
+        end = start + limit
+        next_cursor = None
+        if end < len(self._by_name):
+            last = self._by_name[end - 1]
+            next_cursor = encode_cursor(self.cursor_label, last.name, last.id)
+
+        return self._join(self._json_by_name[start:end]), next_cursor
+
+    @staticmethod
+    def _join(countries: list[bytes]) -> bytes:
+        return b'[' + b','.join(countries) + b']'
@@ -0,0 +1,37 @@
+from functools import lru_cache
+
+from config import get_settings
+from core.caches.category_tree import CategoryTreeCache
+from core.caches.country import CountryCache
+from core.caches.response import ResponseCache
+from core.caches.user import UserCache
+from core.metrics import metrics
+
+
+@lru_cache
+def get_category_tree_cache() -> CategoryTreeCache:
+    return CategoryTreeCache(ttl=get_settings().category_tree_cache_ttl)
+
+
+@lru_cache
+def get_country_cache() -> CountryCache:
+    return CountryCache(ttl=get_settings().country_cache_ttl)
+
+
+@lru_cache
+def get_response_cache() -> ResponseCache:
+    settings = get_settings()
+    return ResponseCache(
+        ttl=settings.response_cache_ttl, max_size=settings.response_cache_size
+    )
+
+
+@lru_cache
+def get_user_cache() -> UserCache:
+    settings = get_settings()
+    cache = UserCache(ttl=settings.user_cache_ttl, max_size=settings.user_cache_size)
+
+    metrics.register(cache.hits)
+    metrics.register(cache.misses)
+
+    return cache
@@ -0,0 +1,71 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    # Raw headers without `content-length`
+    headers: list[tuple[bytes, bytes]]
+    # Table versions the body was built at
+    versions: dict[str, int]
+
+
+class ResponseCache:
+    """
+    Last bodies of successful GET responses by path and query, labeled with
+    the versions of the tables they were built from.
+
+    A body is served while the versions stay the same. The versions are read
+    from the database at most once per `ttl` seconds, writes made by this
+    process expire them right away
+    """
+
+    def __init__(self, ttl: float = 0, max_size: int = 1000):
+        """
+        :param ttl: How many seconds the versions are trusted without checking
+            the database. 0 means check on every request
+        :param max_size: Number of bodies kept, the least recently used are evicted
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+
+        self._versions: dict[str, tuple[int, float]] = {}
+        self._responses: OrderedDict[str, CachedResponse] = OrderedDict()
+
+    def get_fresh_versions(self, tables: tuple[str, ...]) -> dict[str, int] | None:
+        """
+        :return: Versions of the tables, None if any of them has to be checked
+        """
+        now = time.monotonic()
+        versions = {}
+        for table in tables:
+            cached = self._versions.get(table)
+            if cached is None or now - cached[1] >= self.ttl:
+                return None
+            versions[table] = cached[0]
+        return versions
+
+    def set_versions(self, versions: dict[str, int]) -> None:
+        checked_at = time.monotonic()
+        for table, version in versions.items():
+            self._versions[table] = (version, checked_at)
+
+    def expire_versions(self, tables: tuple[str, ...]) -> None:
+        for table in tables:
+            self._versions.pop(table, None)
+
+    def get(self, key: str, versions: dict[str, int]) -> CachedResponse | None:
+        cached = self._responses.get(key)
+        if cached is None or cached.versions != versions:
+            return None
+
+        self._responses.move_to_end(key)
+        return cached
+
+    def put(self, key: str, response: CachedResponse) -> None:
+        self._responses[key] = response
+        self._responses.move_to_end(key)
+        while len(self._responses) > self.max_size:
+            self._responses.popitem(last=False)
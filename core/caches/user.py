@@ -0,0 +1,60 @@
+import time
+from collections import OrderedDict
+from uuid import UUID
+
+from core.entities.user import UserEntity
+from core.metrics import Counter
+
+
+class UserCache:
+    """
+    In-process LRU cache of users by id with a time to live.
+
+    It spares the database lookup of the current user on authenticated requests.
+    Writes made through this process invalidate their user right away,
+    writes of other processes are seen after at most `ttl` seconds
+    """
+
+    def __init__(self, ttl: float, max_size: int):
+        """
+        :param ttl: Seconds a user is served from the cache, 0 disables the cache
+        :param max_size: Number of users kept, the least recently used are evicted
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+
+        self.hits = Counter('user_cache_hits_total', 'Users found in the cache')
+        self.misses = Counter(
+            'user_cache_misses_total', 'Users missing in the cache or expired'
+        )
+
+        self._users: OrderedDict[UUID, tuple[float, UserEntity]] = OrderedDict()
+
+    def get(self, user_id: UUID) -> UserEntity | None:
+        """
+        :return: A copy of the cached user, so callers may modify it freely
+        """
+        cached = self._users.get(user_id)
+        if cached is None or cached[0] <= time.monotonic():
+            self._users.pop(user_id, None)
+            self.misses.inc()
+            return None
+
+        self._users.move_to_end(user_id)
+        self.hits.inc()
+        return cached[1].model_copy()
+
+    def put(self, user: UserEntity) -> None:
+        if self.ttl <= 0:
+            return
+
+        self._users[user.id] = (time.monotonic() + self.ttl, user.model_copy())
+        self._users.move_to_end(user.id)
+        while len(self._users) > self.max_size:
+            self._users.popitem(last=False)
+
+    def invalidate(self, user_id: UUID) -> None:
+        self._users.pop(user_id, None)
+
+    def clear(self) -> None:
+        self._users.clear()
@@ -5,6 +5,8 @@ from pydantic import BaseModel
 
 class TokenData(BaseModel):
     user_id: UUID | None = None
+    # Present only in tokens issued with `superuser_token_claim` enabled
+    is_superuser: bool | None = None
 
 
 class Token(BaseModel):
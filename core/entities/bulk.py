@@ -0,0 +1,21 @@
+from typing import Generic, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar('T')
+
+
+class BulkItemError(BaseModel):
+    # Position of the item in the request
+    index: int
+    detail: str
+
+
+class BulkResult(BaseModel, Generic[T]):
+    """
+    Outcome of a bulk write: the items that were written and the errors
+    of those that were skipped
+    """
+
+    items: list[T]
+    errors: list[BulkItemError] = []
@@ -13,7 +13,7 @@ class CategoryEntity(BaseEntity):
     name: str
     parent_id: UUID | None
 
-    child: list['CategoryEntity'] | None = None
+    child: list['CategoryEntity'] = []
 
     @model_validator(mode='after')
     def check_parent_id(self):
@@ -1,5 +1,59 @@
+from decimal import Decimal
+from typing import Literal
+from uuid import UUID
+
+from pydantic import BaseModel
+
 from core.entities.base import BaseEntity
+from core.entities.brand import BrandEntity
+from core.entities.category import CategoryEntity
+from core.entities.country import CountryEntity
+from core.entities.manufacturer import ManufacturerEntity
 
 
 class ProductEntity(BaseEntity):
-    pass
+    # Article of the supplier catalog, None for products not imported
+    sku: str | None = None
+    name: str
+    description: str
+
+    # Money and stock are exact decimals, so they survive a round trip through a cursor
+    price: Decimal
+    original_price: Decimal
+    discount: Decimal
+
+    stock: Decimal
+    is_active: bool
+
+    volume: float
+    volume_type: Literal['items', 'g', 'kg', 'l']
+
+    brand_id: UUID | None = None
+    manufacturing_country_id: UUID
+    manufacturer_id: UUID | None = None
+    category_id: UUID
+
+    # Related entities are None unless they were loaded
+    brand: BrandEntity | None = None
+    manufacturer: ManufacturerEntity | None = None
+    manufacturing_country: CountryEntity | None = None
+    category: CategoryEntity | None = None
+
+
+class ProductFilter(BaseModel):
+    """
+    Product list conditions, None means the condition is not applied
+    """
+
+    category_ids: list[UUID] | None = None
+    brand_id: UUID | None = None
+    manufacturer_id: UUID | None = None
+    manufacturing_country_id: UUID | None = None
+    min_price: Decimal | None = None
+    max_price: Decimal | None = None
+    is_active: bool | None = None
+    in_stock: bool | None = None
+
+
+# Column to order the product list by, '-' prefix means descending order
+ProductSort = Literal['price', '-price', 'discount', '-discount', 'name', '-name']
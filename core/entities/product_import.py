@@ -0,0 +1,62 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import Annotated, Literal
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from core.entities.base import BaseEntity
+
+# Formats of import files by their suffix
+ImportFormat = Literal['csv', 'jsonl']
+
+ImportStatus = Literal['pending', 'running', 'done', 'failed']
+
+
+class ProductImportEntity(BaseEntity):
+    filename: str
+    status: ImportStatus = 'pending'
+
+    rows_read: int = 0
+    rows_failed: int = 0
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    error: str | None = None
+
+    created_at: Annotated[datetime, Field(default_factory=datetime.utcnow)]
+    finished_at: datetime | None = None
+
+
+class ProductImportErrorEntity(BaseEntity):
+    import_id: UUID
+    line: int
+    detail: str
+
+
+class ProductImportRow(BaseModel):
+    """
+    Row of an import file, related entities are given by name or code
+    """
+
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    sku: Annotated[str, Field(min_length=1)]
+    name: Annotated[str, Field(min_length=1)]
+    description: str = ''
+
+    price: Annotated[Decimal, Field(gt=0)]
+    original_price: Annotated[Decimal, Field(gt=0)]
+    discount: Annotated[Decimal, Field(ge=0)] = Decimal(0)
+
+    stock: Annotated[Decimal, Field(ge=0)]
+    is_active: bool = True
+
+    volume: float
+    volume_type: Literal['items', 'g', 'kg', 'l']
+
+    brand: str | None = None
+    manufacturer: str | None = None
+    # ISO 3166-1 alpha-2 code of the manufacturing country
+    country: str
+    category_id: UUID
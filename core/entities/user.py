@@ -10,7 +10,7 @@ class UserEntity(BaseEntity):
     first_name: str | None = None
     last_name: str | None = None
     birthday: date | None = None
-    avatar_url: str | None = None
+    avatar_key: str | None = None
     phone: str
     hashed_password: str
     created_at: Annotated[datetime, Field(default_factory=datetime.utcnow)]
@@ -3,3 +3,7 @@ from core.exceptions.base import CoreError
 
 class BadCredentialsError(CoreError):
     pass
+
+
+class LoginAttemptsLimitError(CoreError):
+    pass
@@ -33,3 +33,7 @@ class EntityAlreadyExistsError(CoreError):
     def __init__(self, entity: Type[BaseEntity], message: str | None = None):
         self.entity = entity
         super().__init__(message)
+
+
+class BadCursorError(CoreError):
+    pass
@@ -0,0 +1,5 @@
+from core.exceptions.base import CoreError
+
+
+class BadImportFileError(CoreError):
+    pass
@@ -0,0 +1,5 @@
+from core.exceptions.base import CoreError
+
+
+class FileStorageError(CoreError):
+    pass
@@ -0,0 +1,86 @@
+import asyncio
+import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from PIL import Image, ImageOps
+
+from config import get_settings
+from core.avatars import AVATAR_VARIANT_FORMATS, AVATAR_VARIANT_SIZES
+
+
+def make_avatar_variants(path: str) -> dict[tuple[int, str], bytes]:
+    """
+    Runs in a worker process. The avatar is turned upright by its EXIF
+    orientation, cropped to a square and downscaled, variants are saved
+    without any metadata. An avatar smaller than a variant is not upscaled
+
+    :param path: Filesystem path of the uploaded avatar, the worker reads
+        the file itself
+    :raises OSError: The image data is broken
+    :return: Variant files by (size, extension)
+    """
+    with Image.open(path) as image:
+        # JPEG is decoded right away at a fraction of the size when it is large
+        largest = max(AVATAR_VARIANT_SIZES)
+        image.draft('RGB', (largest, largest))
+        image = ImageOps.exif_transpose(image)
+        # Variants have no alpha channel, JPEG has none anyway
+        image = image.convert('RGB')
+
+    side = min(image.size)
+    image = ImageOps.fit(image, (side, side))
+
+    variants = {}
+    # Each variant is downscaled from the previous, larger one
+    for size in sorted(AVATAR_VARIANT_SIZES, reverse=True):
+        if size < image.width:
+            image = image.resize((size, size), Image.Resampling.LANCZOS)
+        for extension, image_format in AVATAR_VARIANT_FORMATS.items():
+            output = io.BytesIO()
+            image.save(output, format=image_format, quality=80)
+            variants[(size, extension)] = output.getvalue()
+
+    return variants
+
+
+class ImageProcessor:
+    """
+    Runs image resizing in a pool of worker processes.
+
+    Resizing is pure CPU work and Pillow holds the GIL for parts of it,
+    in a thread it would still slow down the event loop of the API worker.
+    The pool size caps how many CPUs image processing can take at once
+    """
+
+    def __init__(self, max_workers: int = 2):
+        """
+        :param max_workers: Number of worker processes, started on first use
+        """
+        # Forking a process running threads of its own is unsafe. Workers run
+        # at a lower priority, so the API worker gets the CPU first when
+        # they share a core
+        self._executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=os.nice,
+            initargs=(10,),
+        )
+
+    async def make_avatar_variants(self, path: str) -> dict[tuple[int, str], bytes]:
+        """
+        :param path: Filesystem path of the avatar, see `FileStorageBase.local_copy`
+        :raises OSError: The image data is broken
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, make_avatar_variants, path)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+@lru_cache
+def get_image_processor() -> ImageProcessor:
+    return ImageProcessor(max_workers=get_settings().image_processing_workers)
@@ -0,0 +1,139 @@
+import asyncio
+import threading
+from typing import Callable
+
+
+class Metric:
+    kind: str
+
+    def __init__(self, name: str, description: str):
+        self.name = name
+        self.description = description
+
+    @property
+    def value(self) -> float:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        return (
+            f'# HELP {self.name} {self.description}\n'
+            f'# TYPE {self.name} {self.kind}\n'
+            f'{self.name} {self.value}\n'
+        )
+
+
+class Counter(Metric):
+    """
+    Monotonically increasing value, safe to increment from any thread
+    """
+
+    kind = 'counter'
+
+    def __init__(self, name: str, description: str):
+        super().__init__(name, description)
+        self._value = 0
+        self._lock = threading.Lock()
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    def inc(self, amount: float = 1) -> None:
+        with self._lock:
+            self._value += amount
+
+
+class Gauge(Metric):
+    """
+    Value that can go up and down. If `function` is given,
+    the value is read from it at collection time
+    """
+
+    kind = 'gauge'
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        function: Callable[[], float] | None = None,
+    ):
+        super().__init__(name, description)
+        self._value = 0
+        self._function = function
+
+    @property
+    def value(self) -> float:
+        if self._function is not None:
+            return self._function()
+        return self._value
+
+    def set(self, value: float) -> None:
+        self._value = value
+
+
+class MetricsRegistry:
+    """
+    Process-wide metrics rendered in the Prometheus text exposition format
+    """
+
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        """
+        Adds a metric, a metric with the same name is replaced
+
+        :param metric: Metric to expose
+        :return: The metric
+        """
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, description: str) -> Counter:
+        return self.register(Counter(name, description))
+
+    def gauge(
+        self,
+        name: str,
+        description: str,
+        function: Callable[[], float] | None = None,
+    ) -> Gauge:
+        return self.register(Gauge(name, description, function))
+
+    def get(self, name: str) -> Metric | None:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        return ''.join(metric.render() for metric in self._metrics.values())
+
+
+metrics = MetricsRegistry()
+
+
+class EventLoopLagMonitor:
+    """
+    Sleeps in a loop and records how late it wakes up. The lag is how long
+    a callback waits for the event loop, a blocking call shows up as a spike
+    """
+
+    def __init__(self, interval: float = 0.05):
+        """
+        :param interval: Seconds between wakeups, the resolution of the monitor
+        """
+        self.interval = interval
+        self.max_lag = 0.0
+
+    def pop_max_lag(self) -> float:
+        """
+        :return: The largest lag since the previous call
+        """
+        max_lag, self.max_lag = self.max_lag, 0.0
+        return max_lag
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started_at = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = loop.time() - started_at - self.interval
+            self.max_lag = max(self.max_lag, lag)
@@ -0,0 +1,548 @@
+"""
+Imports supplier catalogs into the `product` table.
+
+    python -m core.product_import FILE
+
+FILE is a CSV file with a header or a JSON Lines file (`.csv` or `.jsonl`)
+with the fields of `ProductImportRow`. Brands and manufacturers are given by
+name, the manufacturing country by its alpha-2 code. Products are matched by
+`sku`: new ones are inserted, changed ones are updated, products missing from
+the file are kept.
+
+The file is read a chunk at a time, so memory use does not depend on its
+size. Rows are validated and their related entities are looked up in memory,
+then each chunk is copied into an unlogged staging table. At the end a single
+INSERT ... ON CONFLICT merges the staging table into `product`, rows equal to
+the stored products are not written. Rows that fail are skipped and recorded
+with their line in the `product_import` job, which also holds the progress.
+"""
+
+import argparse
+import asyncio
+import csv
+import itertools
+import json
+import logging
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Annotated, Any, AsyncIterable, Iterator
+from uuid import UUID
+
+import anyio
+from fastapi import Depends
+from pydantic import ValidationError
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Column,
+    MetaData,
+    Select,
+    String,
+    Table,
+    cast,
+    distinct,
+    func,
+    literal_column,
+    select,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from config import Settings, get_settings
+from core.entities.product_import import (
+    ImportFormat,
+    ProductImportEntity,
+    ProductImportErrorEntity,
+    ProductImportRow,
+)
+from core.exceptions.product_import import BadImportFileError
+from core.repositories.product_import import SAProductImportRepository
+from database.base import (
+    create_engine,
+    create_session_factory,
+    get_async_session_factory,
+)
+from database.models import Brand, Category, Country, Manufacturer, Product
+
+logger = logging.getLogger(__name__)
+
+IMPORT_FORMATS: dict[str, ImportFormat] = {'.csv': 'csv', '.jsonl': 'jsonl'}
+
+# Fields every CSV file must have a column for
+REQUIRED_FIELDS = frozenset(
+    name for name, field in ProductImportRow.model_fields.items() if field.is_required()
+)
+
+# Columns of `product` filled from the files, in the order of staged records
+COLUMNS = (
+    'sku',
+    'name',
+    'description',
+    'price',
+    'original_price',
+    'discount',
+    'stock',
+    'is_active',
+    'volume',
+    'volume_type',
+    'brand_id',
+    'manufacturer_id',
+    'manufacturing_country_id',
+    'category_id',
+)
+# Line of the file a staged row comes from, the last row of a sku wins
+LINE_COLUMN = 'import_line'
+
+
+def get_import_format(filename: str | None) -> ImportFormat:
+    """
+    :raises BadImportFileError: The suffix is not of a supported format
+    """
+    suffix = Path(filename or '').suffix.lower()
+    if suffix not in IMPORT_FORMATS:
+        raise BadImportFileError(f'File must be {" or ".join(IMPORT_FORMATS)}')
+
+    return IMPORT_FORMATS[suffix]
+
+
+def read_records(
+    path: Path, file_format: ImportFormat
+) -> Iterator[tuple[int, dict[str, Any] | str]]:
+    """
+    Records of a file with the lines they start at. A record that cannot
+    be decoded is given as the reason instead, empty values are left out
+
+    :raises BadImportFileError: Required columns are missing in a CSV file
+    """
+    with path.open(encoding='utf-8-sig', newline='') as file:
+        if file_format == 'jsonl':
+            for line, text in enumerate(file, 1):
+                if not text.strip():
+                    continue
+                try:
+                    record = json.loads(text)
+                except ValueError as error:
+                    yield line, f'Invalid JSON: {error}'
+                    continue
+                if not isinstance(record, dict):
+                    yield line, 'Line must be a JSON object'
+                    continue
+                yield line, record
+            return
+
+        reader = csv.DictReader(file)
+        missing = REQUIRED_FIELDS - set(reader.fieldnames or ())
+        if missing:
+            raise BadImportFileError(
+                f'Columns {", ".join(sorted(missing))} are missing'
+            )
+
+        # Quoted values may span lines, `line_num` counts the lines read so far
+        line = reader.line_num + 1
+        for record in reader:
+            if None in record:
+                yield line, 'Row has more values than the header'
+            else:
+                yield (
+                    line,
+                    {
+                        name: value
+                        for name, value in record.items()
+                        if value is not None and value != ''
+                    },
+                )
+            line = reader.line_num + 1
+
+
+def format_validation_error(error: ValidationError) -> str:
+    return '; '.join(
+        f'{".".join(map(str, details["loc"]))}: {details["msg"]}'
+        for details in error.errors(include_url=False)
+    )
+
+
+@dataclass
+class ImportReferences:
+    """
+    Ids of the entities rows refer to, by the names used in files
+    """
+
+    brands: dict[str, UUID]
+    manufacturers: dict[str, UUID]
+    countries: dict[str, UUID]
+    categories: set[UUID]
+
+    def to_record(self, line: int, row: ProductImportRow) -> tuple:
+        """
+        :return: Line and values of `COLUMNS`
+        :raises ValueError: A related entity does not exist
+        """
+        brand_id = None
+        if row.brand is not None:
+            brand_id = self.brands.get(row.brand)
+            if brand_id is None:
+                raise ValueError(f'Brand "{row.brand}" does not exist')
+
+        manufacturer_id = None
+        if row.manufacturer is not None:
+            manufacturer_id = self.manufacturers.get(row.manufacturer)
+            if manufacturer_id is None:
+                raise ValueError(f'Manufacturer "{row.manufacturer}" does not exist')
+
+        country_id = self.countries.get(row.country.upper())
+        if country_id is None:
+            raise ValueError(f'Country "{row.country}" does not exist')
+
+        if row.category_id not in self.categories:
+            raise ValueError(f'Category with id {row.category_id} does not exist')
+
+        return (
+            line,
+            row.sku,
+            row.name,
+            row.description,
+            row.price,
+            row.original_price,
+            row.discount,
+            row.stock,
+            row.is_active,
+            row.volume,
+            row.volume_type,
+            brand_id,
+            manufacturer_id,
+            country_id,
+            row.category_id,
+        )
+
+
+def create_staging_table(import_id: UUID) -> Table:
+    product = Product.__table__
+    return Table(
+        f'product_import_{import_id.hex}',
+        MetaData(),
+        Column(LINE_COLUMN, BigInteger),
+        *(
+            # Staged as text and cast to the enum by the merge
+            Column(name, String if name == 'volume_type' else product.c[name].type)
+            for name in COLUMNS
+        ),
+        # Chunks are copied in transactions of their own, possibly on other
+        # connections, so the table cannot be temporary. It is dropped after
+        # the merge and nothing is lost if it does not survive a crash
+        prefixes=['UNLOGGED'],
+    )
+
+
+def create_merge_statement(staging: Table) -> Select:
+    """
+    Merges the staging table into `product` by sku
+
+    :return: Query of the numbers of inserted and updated products
+    """
+    product = Product.__table__
+    source = (
+        select(staging)
+        .distinct(staging.c.sku)
+        .order_by(staging.c.sku, staging.c[LINE_COLUMN].desc())
+        .subquery()
+    )
+    values = [
+        cast(source.c[name], product.c[name].type)
+        if name == 'volume_type'
+        else source.c[name]
+        for name in COLUMNS
+    ]
+
+    stmt = insert(product).from_select(
+        ['id', *COLUMNS], select(func.gen_random_uuid(), *values)
+    )
+    value_columns = [name for name in COLUMNS if name != 'sku']
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[product.c.sku],
+        set_={name: stmt.excluded[name] for name in value_columns},
+        # Unchanged products are not rewritten, which spares the table and
+        # its indexes dead rows
+        where=tuple_(*(product.c[name] for name in value_columns)).is_distinct_from(
+            tuple_(*(stmt.excluded[name] for name in value_columns))
+        ),
+    )
+    # A row inserted by the statement has no deleting transaction yet
+    merged = stmt.returning(literal_column('xmax = 0', Boolean).label('inserted')).cte(
+        'merged'
+    )
+
+    return select(
+        func.count().filter(merged.c.inserted),
+        func.count().filter(~merged.c.inserted),
+    )
+
+
+async def save_temp_file(
+    chunks: AsyncIterable[bytes], suffix: str = '', buffer_size: int = 1024 * 1024
+) -> Path:
+    """
+    Writes the chunks to a new temporary file, nothing is left if reading
+    the chunks fails. The caller deletes the file
+
+    :param buffer_size: Chunks are collected up to this many bytes and
+        written at once in a worker thread
+    """
+    file = await anyio.to_thread.run_sync(
+        lambda: tempfile.NamedTemporaryFile(
+            prefix='product-import-', suffix=suffix, delete=False
+        )
+    )
+    path = Path(file.name)
+    try:
+        try:
+            buffer = bytearray()
+            async for chunk in chunks:
+                buffer += chunk
+                if len(buffer) >= buffer_size:
+                    await anyio.to_thread.run_sync(file.write, bytes(buffer))
+                    buffer.clear()
+            if buffer:
+                await anyio.to_thread.run_sync(file.write, bytes(buffer))
+        finally:
+            await anyio.to_thread.run_sync(file.close)
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+
+    return path
+
+
+class ProductImporter:
+    """
+    Imports files into `product`, the progress and the outcome are recorded
+    in the `product_import` job of the file
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        chunk_size: int = 10000,
+        max_errors: int = 1000,
+    ):
+        """
+        :param session_factory: Factory of the importer's own sessions
+        :param chunk_size: Rows parsed and copied per transaction
+        :param max_errors: Failed rows recorded per import, the rest are
+            only counted
+        """
+        self._session_factory = session_factory
+        self.chunk_size = chunk_size
+        self.max_errors = max_errors
+
+    async def run(
+        self,
+        import_id: UUID,
+        path: Path,
+        file_format: ImportFormat,
+        delete_file: bool = False,
+    ) -> ProductImportEntity:
+        """
+        Imports the file of a pending job. Errors of the whole import fail
+        the job instead of being raised
+
+        :param delete_file: Delete the file afterwards, such as an upload
+        """
+        staging = create_staging_table(import_id)
+        try:
+            return await self._import(import_id, path, file_format, staging)
+        except BadImportFileError as error:
+            return await self._fail(import_id, error.message)
+        except Exception as error:
+            logger.exception('Product import %s failed', import_id)
+            return await self._fail(import_id, str(error))
+        finally:
+            async with self._session_factory.begin() as session:
+                connection = await session.connection()
+                await connection.run_sync(staging.drop, checkfirst=True)
+            if delete_file:
+                await anyio.to_thread.run_sync(path.unlink, True)
+
+    async def _import(
+        self, import_id: UUID, path: Path, file_format: ImportFormat, staging: Table
+    ) -> ProductImportEntity:
+        async with self._session_factory.begin() as session:
+            repository = SAProductImportRepository(session)
+            job = await repository.get_by_id(import_id)
+            job.status = 'running'
+            job = await repository.update(job)
+            await (await session.connection()).run_sync(staging.create)
+
+        references = await self._load_references()
+
+        records = read_records(path, file_format)
+        try:
+            while True:
+                # Parsing is CPU-bound, the event loop keeps serving requests
+                staged, errors, read = await anyio.to_thread.run_sync(
+                    self._parse_chunk, records, references
+                )
+                if not read:
+                    break
+                job = await self._copy_chunk(job, staging, staged, errors, read)
+        finally:
+            records.close()
+
+        async with self._session_factory.begin() as session:
+            connection = await session.connection()
+            # The merge would be planned for an empty table otherwise
+            await connection.exec_driver_sql(f'ANALYZE {staging.name}')
+            skus = await connection.scalar(select(func.count(distinct(staging.c.sku))))
+            inserted, updated = (
+                await connection.execute(create_merge_statement(staging))
+            ).one()
+
+            job.status = 'done'
+            job.inserted = inserted
+            job.updated = updated
+            job.unchanged = skus - inserted - updated
+            job.finished_at = datetime.utcnow()
+            return await SAProductImportRepository(session).update(job)
+
+    async def _load_references(self) -> ImportReferences:
+        async with self._session_factory() as session:
+            # Names are not unique, the oldest entity of a name is taken
+            brands: dict[str, UUID] = {}
+            for id, name in await session.execute(select(Brand.id, Brand.name)):
+                brands.setdefault(name, id)
+            manufacturers: dict[str, UUID] = {}
+            for id, name in await session.execute(
+                select(Manufacturer.id, Manufacturer.name)
+            ):
+                manufacturers.setdefault(name, id)
+
+            countries = {
+                code: id
+                for id, code in await session.execute(select(Country.id, Country.code))
+            }
+            categories = set(await session.scalars(select(Category.id)))
+
+        return ImportReferences(brands, manufacturers, countries, categories)
+
+    def _parse_chunk(
+        self,
+        records: Iterator[tuple[int, dict[str, Any] | str]],
+        references: ImportReferences,
+    ) -> tuple[list[tuple], list[tuple[int, str]], int]:
+        """
+        :return: Records to stage, lines and reasons of failed rows, and
+            the number of rows read
+        """
+        staged = []
+        errors = []
+        read = 0
+        for line, record in itertools.islice(records, self.chunk_size):
+            read += 1
+            if isinstance(record, str):
+                errors.append((line, record))
+                continue
+
+            try:
+                row = ProductImportRow.model_validate(record)
+                staged.append(references.to_record(line, row))
+            except ValidationError as error:
+                errors.append((line, format_validation_error(error)))
+            except ValueError as error:
+                errors.append((line, str(error)))
+
+        return staged, errors, read
+
+    async def _copy_chunk(
+        self,
+        job: ProductImportEntity,
+        staging: Table,
+        staged: list[tuple],
+        errors: list[tuple[int, str]],
+        read: int,
+    ) -> ProductImportEntity:
+        async with self._session_factory.begin() as session:
+            connection = await session.connection()
+            raw_connection = await connection.get_raw_connection()
+            await raw_connection.driver_connection.copy_records_to_table(
+                staging.name, records=staged, columns=[LINE_COLUMN, *COLUMNS]
+            )
+
+            repository = SAProductImportRepository(session)
+            recorded = max(self.max_errors - job.rows_failed, 0)
+            await repository.add_errors(
+                [
+                    ProductImportErrorEntity(import_id=job.id, line=line, detail=detail)
+                    for line, detail in errors[:recorded]
+                ]
+            )
+            job.rows_read += read
+            job.rows_failed += len(errors)
+            return await repository.update(job)
+
+    async def _fail(self, import_id: UUID, error: str) -> ProductImportEntity:
+        async with self._session_factory.begin() as session:
+            repository = SAProductImportRepository(session)
+            job = await repository.get_by_id(import_id)
+            job.status = 'failed'
+            job.error = error
+            job.finished_at = datetime.utcnow()
+            return await repository.update(job)
+
+
+def get_product_importer(
+    session_factory: Annotated[async_sessionmaker, Depends(get_async_session_factory)],
+    settings: Annotated[Settings, Depends(get_settings)],
+) -> ProductImporter:
+    return ProductImporter(
+        session_factory,
+        chunk_size=settings.product_import_chunk_size,
+        max_errors=settings.product_import_max_errors,
+    )
+
+
+async def main(path: Path) -> None:
+    try:
+        file_format = get_import_format(path.name)
+    except BadImportFileError as error:
+        raise SystemExit(error.message)
+
+    settings = get_settings()
+    engine = create_engine(settings)
+    session_factory = create_session_factory(engine)
+    importer = ProductImporter(
+        session_factory,
+        chunk_size=settings.product_import_chunk_size,
+        max_errors=settings.product_import_max_errors,
+    )
+
+    started_at = time.perf_counter()
+    try:
+        async with session_factory.begin() as session:
+            job = await SAProductImportRepository(session).add(
+                ProductImportEntity(filename=path.name)
+            )
+        job = await importer.run(job.id, path, file_format)
+    finally:
+        await engine.dispose()
+
+    print(
+        f'{job.status}: {job.rows_read} rows, {job.rows_failed} failed, '
+        f'{job.inserted} inserted, {job.updated} updated, {job.unchanged} unchanged '
+        f'in {time.perf_counter() - started_at:.2f} s'
+    )
+    if job.error:
+        print(job.error)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().splitlines()[0],
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('file', type=Path)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.file))
@@ -0,0 +1,30 @@
+from abc import ABC, abstractmethod
+
+
+class RateLimiterBase(ABC):
+    """
+    Counts attempts of an action per key (a phone number, a login...)
+    and tells whether the next one is allowed
+    """
+
+    @abstractmethod
+    async def hit(self, key: str, limit: int, window: float) -> bool:
+        """
+        Counts an attempt unless the limit is already reached.
+        Rejected attempts are not counted, so they do not prolong the block
+
+        :param key: What is limited, prefixed with the action name
+        :param limit: Number of attempts allowed during the window
+        :param window: Window length in seconds
+        :return: Whether the attempt is allowed
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def reset(self, key: str) -> None:
+        """
+        Forgets the attempts counted for the key
+
+        :param key: What is limited, prefixed with the action name
+        """
+        raise NotImplementedError
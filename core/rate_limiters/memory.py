@@ -0,0 +1,43 @@
+import time
+from collections import OrderedDict, deque
+
+from core.rate_limiters.base import RateLimiterBase
+
+
+class MemoryRateLimiter(RateLimiterBase):
+    """
+    Exact sliding window over the timestamps of the attempts, kept in memory.
+
+    Every process counts on its own, so it only suits single-node deployments
+    """
+
+    def __init__(self, max_keys: int = 100000):
+        """
+        :param max_keys: Number of keys tracked, the least recently hit are dropped
+        """
+        self.max_keys = max_keys
+
+        self._hits: OrderedDict[str, deque[float]] = OrderedDict()
+
+    async def hit(self, key: str, limit: int, window: float) -> bool:
+        now = time.monotonic()
+
+        hits = self._hits.get(key)
+        if hits is None:
+            hits = self._hits[key] = deque()
+        self._hits.move_to_end(key)
+
+        while hits and hits[0] <= now - window:
+            hits.popleft()
+
+        if len(hits) >= limit:
+            return False
+
+        hits.append(now)
+        while len(self._hits) > self.max_keys:
+            self._hits.popitem(last=False)
+
+        return True
+
+    async def reset(self, key: str) -> None:
+        self._hits.pop(key, None)
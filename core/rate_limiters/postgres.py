@@ -0,0 +1,96 @@
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, func, literal, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import aliased
+
+from core.rate_limiters.base import RateLimiterBase
+from database.models import RateLimitCounter
+
+
+class SARateLimiter(RateLimiterBase):
+    """
+    Sliding window shared by all processes, approximated with counters
+    of fixed windows in Postgres.
+
+    The attempts of the previous window are counted with the weight of its part
+    still inside the sliding window. A single upsert checks the limit and counts
+    the attempt, so concurrent attempts cannot get around the limit: the second
+    one waits for the row lock and sees the first one's count
+    """
+
+    def __init__(self, session_factory: async_sessionmaker):
+        """
+        :param session_factory: Counters are committed in their own transaction,
+            independent of the outcome of the limited action
+        """
+        self._session_factory = session_factory
+
+    async def hit(self, key: str, limit: int, window: float) -> bool:
+        now = datetime.utcnow()
+        epoch_seconds = (now - datetime(1970, 1, 1)).total_seconds()
+        window_start = datetime(1970, 1, 1) + timedelta(
+            seconds=epoch_seconds // window * window
+        )
+        previous_start = window_start - timedelta(seconds=window)
+        # Part of the previous window still inside the sliding one
+        previous_weight = 1 - (now - window_start).total_seconds() / window
+
+        previous = aliased(RateLimitCounter)
+        previous_hits = func.coalesce(
+            select(previous.hits)
+            .where(previous.key == key, previous.window_start == previous_start)
+            .scalar_subquery(),
+            0,
+        )
+        hits_before = previous_hits * previous_weight
+
+        stmt = insert(RateLimitCounter).from_select(
+            ['id', 'key', 'window_start', 'hits', 'expires_at'],
+            select(
+                literal(uuid.uuid4()),
+                literal(key),
+                literal(window_start),
+                literal(1),
+                literal(window_start + timedelta(seconds=2 * window)),
+            ).where(hits_before + 1 <= limit),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['key', 'window_start'],
+            set_={'hits': RateLimitCounter.hits + 1},
+            where=hits_before + RateLimitCounter.hits + 1 <= limit,
+        ).returning(RateLimitCounter.hits)
+
+        async with self._session_factory.begin() as session:
+            hits = await session.scalar(stmt)
+
+        return hits is not None
+
+    async def reset(self, key: str) -> None:
+        stmt = delete(RateLimitCounter).where(RateLimitCounter.key == key)
+
+        async with self._session_factory.begin() as session:
+            await session.execute(stmt)
+
+    async def delete_expired(self, before: datetime, limit: int) -> int:
+        """
+        Deletes a batch of counters no window uses any more
+
+        :param before: Counters expiring earlier are deleted
+        :param limit: Batch size
+        :return: Number of deleted counters
+        """
+        batch = (
+            select(RateLimitCounter.id)
+            .where(RateLimitCounter.expires_at < before)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = delete(RateLimitCounter).where(RateLimitCounter.id.in_(batch))
+
+        async with self._session_factory.begin() as session:
+            result = await session.execute(stmt)
+
+        return result.rowcount
@@ -0,0 +1,25 @@
+from functools import lru_cache
+from typing import Annotated
+
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from config import Settings, get_settings
+from core.rate_limiters.base import RateLimiterBase
+from core.rate_limiters.memory import MemoryRateLimiter
+from core.rate_limiters.postgres import SARateLimiter
+from database.base import get_async_session_factory
+
+
+@lru_cache
+def get_memory_rate_limiter() -> MemoryRateLimiter:
+    return MemoryRateLimiter()
+
+
+def get_rate_limiter(
+    settings: Annotated[Settings, Depends(get_settings)],
+    session_factory: Annotated[async_sessionmaker, Depends(get_async_session_factory)],
+) -> RateLimiterBase:
+    if settings.rate_limiter_backend == 'memory':
+        return get_memory_rate_limiter()
+    return SARateLimiter(session_factory)
@@ -1,13 +1,37 @@
+import base64
+import binascii
+import json
 from abc import ABC, abstractmethod
-from typing import Generic, TypeVar, Type
+from functools import lru_cache
+from typing import Generic, TypeVar, Type, Any, Iterable, Sequence
 from uuid import UUID
 
-from pydantic import BaseModel
-from sqlalchemy import select, and_, Select, update, delete
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from pydantic_core import to_jsonable_python
+from sqlalchemy import (
+    ARRAY,
+    Column,
+    Row,
+    Select,
+    and_,
+    any_,
+    cast,
+    column as column_clause,
+    delete,
+    insert,
+    literal,
+    select,
+    tuple_,
+    union_all,
+    update,
+    values,
+)
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from core.entities.pagination import CursorPage
 from core.exceptions.base import (
+    BadCursorError,
     BadRelatedEntityError,
     EntityNotFoundError,
     EntityAlreadyExistsError,
@@ -16,6 +40,56 @@ from database.base import Base
 
 T = TypeVar('T', bound=BaseModel)
 
+# Rows per statement of bulk updates, keeps the number of bound parameters
+# well below the limit of Postgres (32767)
+BULK_BATCH_SIZE = 1000
+
+
+@lru_cache
+def entity_list_adapter(entity: Type[T]) -> TypeAdapter[list[T]]:
+    """
+    :return: Adapter validating a whole list of records into entities at once
+    """
+    return TypeAdapter(list[entity])
+
+
+def encode_cursor(label: str, value: Any, id: UUID) -> str:
+    """
+    Creates an opaque cursor pointing right after a record
+
+    :param label: Ordering of the list, the sort key prefixed with `-` if descending
+    :param value: Sort key value of the record
+    :param id: Record id
+    :return: Cursor
+    """
+    data = json.dumps(to_jsonable_python([label, value, id]), separators=(',', ':'))
+
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str, label: str) -> tuple[Any, UUID]:
+    """
+    Extracts the sort key value and id from a cursor
+
+    :param cursor: Cursor created by `encode_cursor`
+    :param label: Ordering of the list the cursor is expected for
+    :raise BadCursorError: Cursor is malformed or was issued for another ordering
+    :return: Sort key value as decoded from JSON and id
+    """
+    try:
+        data = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        cursor_label, value, id = json.loads(data)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError) as error:
+        raise BadCursorError('Malformed cursor') from error
+
+    if cursor_label != label:
+        raise BadCursorError('Cursor was issued for another list')
+
+    try:
+        return value, UUID(id)
+    except (ValueError, TypeError, AttributeError) as error:
+        raise BadCursorError('Malformed cursor') from error
+
 
 class GenericRepository(Generic[T], ABC):
     entity: Type[T]
@@ -43,6 +117,22 @@ class GenericRepository(Generic[T], ABC):
         """
         raise NotImplementedError()
 
+    @abstractmethod
+    async def list_after(
+        self, after: str | None = None, limit: int = 100, **filters
+    ) -> CursorPage[T]:
+        """
+        Get a page of records ordered by the repository sort key and id
+
+        :param after: Opaque cursor returned with the previous page, None for the first page
+        :param limit:
+        :param filters: Filter conditions, several criteria are linked with a logical 'and'
+        :raise ValueError: Invalid filter condition
+        :raise BadCursorError: Cursor is malformed or was issued by another repository
+        :return: Page of records with a cursor of the next page (None on the last page)
+        """
+        raise NotImplementedError()
+
     @abstractmethod
     async def add(self, entity: T) -> T:
         """
@@ -74,9 +164,66 @@ class GenericRepository(Generic[T], ABC):
         """
         raise NotImplementedError()
 
+    @abstractmethod
+    async def existing_ids(self, ids: Iterable[UUID]) -> set[UUID]:
+        """
+        :param ids: Record ids
+        :return: Those of the ids that have a record
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def referenced_ids(self, ids: Sequence[UUID]) -> dict[UUID, str]:
+        """
+        Finds the records other records still refer to, they cannot be deleted.
+        The records are locked, so no new references appear until
+        the transaction ends
+
+        :param ids: Record ids
+        :return: Names of the referring tables by the referred ids
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def add_many(self, entities: Sequence[T]) -> Sequence[T]:
+        """
+        Creates new records with a few statements
+
+        :param entities: The records to be created
+        :return: The created records in the same order
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def update_many(self, entities: Sequence[T], **kwargs) -> Sequence[T]:
+        """
+        Updates existing records with a few statements, records missing
+        from the table are skipped
+
+        :param entities: The records to be updated including record ids,
+            each id at most once
+        :return: The updated records in no particular order
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def delete_many(self, ids: Sequence[UUID]) -> Sequence[UUID]:
+        """
+        Deletes records by ids with one statement
+
+        :param ids: Record ids
+        :return: Ids of the deleted records
+        """
+        raise NotImplementedError()
+
 
 class GenericSARepository(GenericRepository[T], ABC):
     model_cls: Type[Base]
+    # Column that orders keyset pages, `id` breaks ties
+    sort_key: str = 'id'
+    # Lists select plain rows of the table columns instead of ORM instances,
+    # which skips the identity map. Only for entities made of the columns alone
+    select_columns: bool = False
 
     def __init__(self, session: AsyncSession) -> None:
         """
@@ -89,12 +236,46 @@ class GenericSARepository(GenericRepository[T], ABC):
     async def _convert_db_to_entity(self, record: Base, **kwargs) -> T:
         return self.entity.model_validate(record)
 
+    async def _convert_db_to_entities(
+        self, records: Sequence[Base | Row], **kwargs
+    ) -> list[T]:
+        """
+        Converts a page of records in one validation call
+
+        :param records: ORM instances or rows of the table columns
+            if `select_columns` is set
+        """
+        return entity_list_adapter(self.entity).validate_python(
+            records, from_attributes=True
+        )
+
     async def _convert_entity_to_db(self, entity: T, **kwargs) -> Base:
         return self.model_cls(**entity.model_dump())
 
     async def _convert_entity_to_update_dict(self, entity: T, **kwargs) -> dict:
         return entity.model_dump(exclude={'id'})
 
+    async def _convert_entity_to_insert_dict(self, entity: T, **kwargs) -> dict:
+        return {
+            'id': entity.id,
+            **await self._convert_entity_to_update_dict(entity, **kwargs),
+        }
+
+    def _select(self) -> Select:
+        """
+        Creates a SELECT query of the records of lists
+        """
+        if self.select_columns:
+            return select(*self.model_cls.__table__.c)
+
+        return select(self.model_cls)
+
+    async def _fetch_all(self, stmt: Select) -> Sequence[Base | Row]:
+        if self.select_columns:
+            return (await self._session.execute(stmt)).all()
+
+        return (await self._session.scalars(stmt)).all()
+
     def _construct_get_stmt(self, id: UUID) -> Select:
         """
         Creates a SELECT query for retrieving a single record
@@ -115,7 +296,12 @@ class GenericSARepository(GenericRepository[T], ABC):
         :param filters: Filter conditions, several criteria are linked with a logical 'and'
         :return: SELECT statement
         """
-        stmt = select(self.model_cls)
+        stmt = self._apply_filters(self._select(), **filters)
+        stmt = stmt.offset(offset).limit(limit)
+
+        return stmt
+
+    def _apply_filters(self, stmt: Select, **filters) -> Select:
         where_clauses = []
         for column, value in filters.items():
             if not hasattr(self.model_cls, column):
@@ -127,10 +313,124 @@ class GenericSARepository(GenericRepository[T], ABC):
         elif len(where_clauses) > 1:
             stmt = stmt.where(and_(*where_clauses))
 
-        stmt = stmt.offset(offset).limit(limit)
-
         return stmt
 
+    @staticmethod
+    def _sort_label(sort_key: str, descending: bool) -> str:
+        return f'-{sort_key}' if descending else sort_key
+
+    def _encode_cursor(
+        self, entity: T, sort_key: str | None = None, descending: bool = False
+    ) -> str:
+        """
+        Creates an opaque cursor pointing right after the entity
+
+        :param entity: Last entity of a page
+        :param sort_key: Column the page is ordered by, defaults to `sort_key`
+        :param descending: The page is ordered in descending order
+        :return: Cursor
+        """
+        sort_key = sort_key or self.sort_key
+
+        return encode_cursor(
+            self._sort_label(sort_key, descending),
+            getattr(entity, sort_key),
+            entity.id,
+        )
+
+    def _decode_cursor(
+        self, cursor: str, sort_key: str | None = None, descending: bool = False
+    ) -> tuple[Any, UUID]:
+        """
+        Extracts the sort key value and id from a cursor
+
+        :param cursor: Cursor created by `_encode_cursor`
+        :param sort_key: Column the page is ordered by, defaults to `sort_key`
+        :param descending: The page is ordered in descending order
+        :raise BadCursorError: Cursor is malformed or was issued for another ordering
+        :return: Sort key value and id
+        """
+        sort_key = sort_key or self.sort_key
+        value, id = decode_cursor(cursor, self._sort_label(sort_key, descending))
+
+        python_type = self.model_cls.__table__.c[sort_key].type.python_type
+        try:
+            return TypeAdapter(python_type).validate_python(value), id
+        except (ValidationError, ValueError, TypeError) as error:
+            raise BadCursorError('Malformed cursor') from error
+
+    def _apply_keyset(
+        self,
+        stmt: Select,
+        after: str | None,
+        limit: int,
+        sort_key: str | None = None,
+        descending: bool = False,
+    ) -> Select:
+        """
+        Orders a SELECT query by (sort key, id) and leaves only records after the cursor
+
+        :param stmt: SELECT statement with filters applied
+        :param after: Cursor of the previous page or None for the first page
+        :param limit:
+        :param sort_key: Column to order by, defaults to `sort_key`
+        :param descending: Order in descending order
+        :return: SELECT statement
+        """
+        sort_key = sort_key or self.sort_key
+        id_column = self.model_cls.id
+        if sort_key == 'id':
+            columns = [id_column]
+        else:
+            columns = [getattr(self.model_cls, sort_key), id_column]
+
+        if descending:
+            stmt = stmt.order_by(*(column.desc() for column in columns))
+        else:
+            stmt = stmt.order_by(*columns)
+
+        if after is not None:
+            value, id = self._decode_cursor(after, sort_key, descending)
+            if sort_key == 'id':
+                key, after_key = id_column, id
+            else:
+                key, after_key = tuple_(*columns), tuple_(value, id)
+            stmt = stmt.where(key < after_key if descending else key > after_key)
+
+        # Page sizes are few, an inline LIMIT lets Postgres cache a generic plan
+        # of the prepared statement instead of planning each page from scratch
+        return stmt.limit(literal(limit, literal_execute=True))
+
+    async def _get_page(
+        self,
+        stmt: Select,
+        after: str | None,
+        limit: int,
+        sort_key: str | None = None,
+        descending: bool = False,
+        **kwargs,
+    ) -> CursorPage[T]:
+        """
+        Executes a SELECT query page by page
+
+        :param stmt: SELECT statement with filters applied
+        :param after: Cursor of the previous page or None for the first page
+        :param limit:
+        :param sort_key: Column to order by, defaults to `sort_key`
+        :param descending: Order in descending order
+        :return: Page of records with a cursor of the next page (None on the last page)
+        """
+        # One extra record tells whether there is a next page
+        stmt = self._apply_keyset(stmt, after, limit + 1, sort_key, descending)
+        records = await self._fetch_all(stmt)
+
+        items = await self._convert_db_to_entities(records[:limit], **kwargs)
+        next_cursor = None
+        if len(records) > limit:
+            next_cursor = self._encode_cursor(items[-1], sort_key, descending)
+
+        return CursorPage(items=items, next_cursor=next_cursor)
+
     async def get_by_id(self, id: UUID, **kwargs) -> T | None:
         stmt = self._construct_get_stmt(id)
         result = await self._session.scalar(stmt)
@@ -147,12 +447,19 @@ class GenericSARepository(GenericRepository[T], ABC):
             filters = {}
 
         stmt = self._construct_list_stmt(offset=offset, limit=limit, **filters)
-        records = await self._session.scalars(stmt)
+        records = await self._fetch_all(stmt)
 
-        return [
-            await self._convert_db_to_entity(record, **kwargs)
-            for record in records.all()
-        ]
+        return await self._convert_db_to_entities(records, **kwargs)
+
+    async def list_after(
+        self, after: str | None = None, limit=100, filters: dict = None, **kwargs
+    ) -> CursorPage[T]:
+        if filters is None:
+            filters = {}
+
+        stmt = self._apply_filters(self._select(), **filters)
+
+        return await self._get_page(stmt, after, limit, **kwargs)
 
     async def add(self, entity: T, **kwargs) -> T:
         record = await self._convert_entity_to_db(entity)
@@ -197,3 +504,128 @@ class GenericSARepository(GenericRepository[T], ABC):
         stmt = delete(self.model_cls).where(self.model_cls.id == id)
 
         await self._session.execute(stmt)
+
+    def _any_id(self, ids: Iterable[UUID]):
+        """
+        Condition matching records by ids with a single array parameter
+        """
+        id_column = self.model_cls.__table__.c.id
+
+        return id_column == any_(literal(list(ids), ARRAY(id_column.type)))
+
+    async def existing_ids(self, ids: Iterable[UUID]) -> set[UUID]:
+        stmt = select(self.model_cls.id).where(self._any_id(ids))
+
+        return set((await self._session.scalars(stmt)).all())
+
+    def _referring_columns(self) -> Sequence[Column]:
+        """
+        Foreign key columns of the tables referring to this one whose rows
+        block the deletion of the referred record
+        """
+        table = self.model_cls.__table__
+        return [
+            foreign_key.parent
+            for other_table in table.metadata.tables.values()
+            for foreign_key in other_table.foreign_keys
+            if foreign_key.column.table is table
+            and (foreign_key.ondelete or 'NO ACTION').upper()
+            in ('NO ACTION', 'RESTRICT')
+        ]
+
+    async def referenced_ids(self, ids: Sequence[UUID]) -> dict[UUID, str]:
+        columns = self._referring_columns()
+        if not ids or not columns:
+            return {}
+
+        # Inserting a referring row waits for the lock, a row inserted
+        # before is committed by the time the lock is taken
+        lock_stmt = select(self.model_cls.id).where(self._any_id(ids)).with_for_update()
+        await self._session.execute(lock_stmt)
+
+        stmt = union_all(
+            *(
+                select(column, literal(column.table.name))
+                .where(column == any_(literal(list(ids), ARRAY(column.type))))
+                .distinct()
+                for column in columns
+            )
+        )
+        rows = (await self._session.execute(stmt)).all()
+
+        return {id: table_name for id, table_name in rows}
+
+    async def add_many(self, entities: Sequence[T], **kwargs) -> Sequence[T]:
+        if not entities:
+            return []
+
+        table = self.model_cls.__table__
+        rows = [
+            await self._convert_entity_to_insert_dict(entity, **kwargs)
+            for entity in entities
+        ]
+        # Executed as multi-row INSERTs of up to 1000 rows each
+        stmt = insert(table).returning(*table.c, sort_by_parameter_order=True)
+
+        try:
+            records = (await self._session.execute(stmt, rows)).all()
+        except IntegrityError as error:
+            if 'ForeignKeyViolationError' in str(error):
+                raise BadRelatedEntityError from error
+            if 'UniqueViolationError' in str(error):
+                raise EntityAlreadyExistsError(entity=self.entity) from error
+
+            raise error
+
+        return await self._convert_db_to_entities(records, **kwargs)
+
+    async def update_many(self, entities: Sequence[T], **kwargs) -> Sequence[T]:
+        table = self.model_cls.__table__
+        rows = [
+            {
+                'id': entity.id,
+                **await self._convert_entity_to_update_dict(entity, **kwargs),
+            }
+            for entity in entities
+        ]
+
+        records = []
+        for start in range(0, len(rows), BULK_BATCH_SIZE):
+            batch = rows[start : start + BULK_BATCH_SIZE]
+            names = list(batch[0])
+            data = values(
+                *(column_clause(name, table.c[name].type) for name in names),
+                name='data',
+            ).data([tuple(row[name] for name in names) for row in batch])
+            stmt = (
+                update(table)
+                .where(table.c.id == data.c.id)
+                # A column of NULLs only would be text otherwise
+                .values(
+                    {
+                        name: cast(data.c[name], table.c[name].type)
+                        for name in names
+                        if name != 'id'
+                    }
+                )
+                .returning(*table.c)
+            )
+
+            try:
+                records.extend((await self._session.execute(stmt)).all())
+            except IntegrityError as error:
+                if 'ForeignKeyViolationError' in str(error):
+                    raise BadRelatedEntityError from error
+                raise error
+
+        return await self._convert_db_to_entities(records, **kwargs)
+
+    async def delete_many(self, ids: Sequence[UUID]) -> Sequence[UUID]:
+        if not ids:
+            return []
+
+        stmt = (
+            delete(self.model_cls).where(self._any_id(ids)).returning(self.model_cls.id)
+        )
+
+        return list((await self._session.scalars(stmt)).all())
@@ -11,3 +11,5 @@ class BrandRepositoryBase(GenericRepository[BrandEntity], ABC):
 
 class SABrandRepository(GenericSARepository, BrandRepositoryBase):
     model_cls = Brand
+    sort_key = 'name'
+    select_columns = True
@@ -1,6 +1,9 @@
 from abc import ABC, abstractmethod
+from typing import Iterable
+from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import select, literal, Select, ColumnElement, Row
+from sqlalchemy.orm import aliased
 
 from core.entities.category import CategoryEntity
 from core.repositories.base import GenericRepository, GenericSARepository, T
@@ -15,32 +18,114 @@ class CategoryRepositoryBase(GenericRepository[CategoryEntity], ABC):
     async def get_root_categories(self, depth: int) -> list[CategoryEntity]:
         raise NotImplementedError
 
+    @abstractmethod
+    async def get_all(self) -> list[CategoryEntity]:
+        """
+        Get all categories without subcategories (`child` is empty)
+        """
+        raise NotImplementedError
+
 
 class SACategoryRepository(GenericSARepository, CategoryRepositoryBase):
     model_cls = Category
 
-    async def _convert_to_entity_with_depth(
-        self, category: Category, depth: int = 0, cur_depth=0
-    ) -> CategoryEntity:
-        if cur_depth >= depth:
-            sub_categories = []
-        else:
-            sub_categories = [
-                await self._convert_to_entity_with_depth(
-                    sub_category, depth, cur_depth + 1
+    def _construct_subtree_stmt(
+        self, roots_clause: ColumnElement[bool], depth: int
+    ) -> Select:
+        """
+        Creates a recursive SELECT query for retrieving categories matching
+        `roots_clause` together with all their subcategories down to `depth`
+
+        :param roots_clause: Condition for the top categories of the trees
+        :param depth: Depth of returned subcategories
+        :return: SELECT statement returning (id, name, parent_id, depth) rows
+        """
+        tree = (
+            select(
+                Category.id,
+                Category.name,
+                Category.parent_id,
+                literal(0).label('depth'),
+            )
+            .where(roots_clause)
+            .cte('category_tree', recursive=True)
+        )
+
+        sub_category = aliased(Category)
+        tree = tree.union_all(
+            select(
+                sub_category.id,
+                sub_category.name,
+                sub_category.parent_id,
+                (tree.c.depth + 1).label('depth'),
+            )
+            .join(tree, sub_category.parent_id == tree.c.id)
+            .where(tree.c.depth < depth)
+        )
+
+        return select(tree)
+
+    @staticmethod
+    def _build_trees(rows: Iterable[Row]) -> list[CategoryEntity]:
+        """
+        Builds category trees from flat (id, name, parent_id, depth) rows in O(n)
+
+        :param rows: Rows returned by the subtree query
+        :return: Top categories with filled `child`
+        """
+        rows = list(rows)
+
+        # Nodes are keyed by (id, depth), so a broken tree with a cycle
+        # is unrolled down to the requested depth instead of looping
+        nodes = {
+            (row.id, row.depth): CategoryEntity(
+                id=row.id, name=row.name, parent_id=row.parent_id, child=[]
+            )
+            for row in rows
+        }
+
+        roots = []
+        for row in rows:
+            node = nodes[(row.id, row.depth)]
+            if row.depth == 0:
+                roots.append(node)
+            else:
+                nodes[(row.parent_id, row.depth - 1)].child.append(node)
+
+        return roots
+
+    async def _get_trees(
+        self, roots_clause: ColumnElement[bool], depth: int
+    ) -> list[CategoryEntity]:
+        stmt = self._construct_subtree_stmt(roots_clause, depth)
+        result = await self._session.execute(stmt)
+
+        return self._build_trees(result.all())
+
+    async def _convert_db_to_entity(
+        self, record: Category, depth: int = 0, **kwargs
+    ) -> T:
+        return (await self._convert_db_to_entities([record], depth))[0]
+
+    async def _convert_db_to_entities(
+        self, records: Iterable[Category], depth: int = 0, **kwargs
+    ) -> list[CategoryEntity]:
+        records = list(records)
+        if depth == 0 or not records:
+            return [
+                CategoryEntity(
+                    id=record.id, name=record.name, parent_id=record.parent_id, child=[]
                 )
-                for sub_category in await category.awaitable_attrs.child
+                for record in records
             ]
 
-        return CategoryEntity(
-            id=category.id,
-            name=category.name,
-            parent_id=category.parent_id,
-            child=sub_categories,
+        # Subcategories of all the records are loaded with one query
+        trees = await self._get_trees(
+            Category.id.in_([record.id for record in records]), depth
         )
+        trees_by_id = {tree.id: tree for tree in trees}
 
-    async def _convert_db_to_entity(self, record: Category, **kwargs) -> T:
-        return await self._convert_to_entity_with_depth(record, **kwargs)
+        return [trees_by_id[record.id] for record in records]
 
     async def _convert_entity_to_update_dict(
         self, entity: CategoryEntity, **kwargs
@@ -50,13 +135,21 @@ class SACategoryRepository(GenericSARepository, CategoryRepositoryBase):
     async def _convert_entity_to_db(self, entity: CategoryEntity, **kwargs) -> Base:
         return self.model_cls(**entity.model_dump(exclude={'child'}))
 
+    async def get_by_id(
+        self, id: UUID, depth: int = 0, **kwargs
+    ) -> CategoryEntity | None:
+        trees = await self._get_trees(Category.id == id, depth)
+
+        return trees[0] if trees else None
+
     async def get_root_categories(self, depth: int) -> list[CategoryEntity]:
-        stmt = select(Category).where(Category.parent_id == None)  # noqa
-        records = await self._session.scalars(stmt)
+        return await self._get_trees(Category.parent_id.is_(None), depth)
 
-        categories = records.all()
+    async def get_all(self) -> list[CategoryEntity]:
+        stmt = select(Category.id, Category.name, Category.parent_id)
+        result = await self._session.execute(stmt)
 
         return [
-            await self._convert_db_to_entity(category, depth=depth)
-            for category in categories
+            CategoryEntity(id=row.id, name=row.name, parent_id=row.parent_id)
+            for row in result
         ]
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
+from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import func, select, tuple_
 
 from core.entities.country import CountryEntity
 from core.repositories.base import GenericRepository, GenericSARepository
@@ -14,9 +15,35 @@ class CountryRepositoryBase(GenericRepository[Country], ABC):
     async def get_by_code(self, code: str) -> CountryEntity | None:
         raise NotImplementedError()
 
+    @abstractmethod
+    async def get_all(self) -> list[CountryEntity]:
+        """
+        Get all countries in the order they are stored in
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def get_name_order(self) -> list[UUID]:
+        """
+        Get the ids of all countries in the order of cursor pages
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def count_up_to(self, name: str, country_id: UUID) -> int:
+        """
+        Count the countries up to the given one in the order of cursor pages,
+        the country may not exist
+
+        :return: Position of the country following the given one
+        """
+        raise NotImplementedError()
+
 
 class SACountryRepository(GenericSARepository, CountryRepositoryBase):
     model_cls = Country
+    sort_key = 'name'
+    select_columns = True
 
     async def get_by_code(self, code: str) -> CountryEntity | None:
         stmt = select(Country).where(Country.code == code)
@@ -24,3 +51,18 @@ class SACountryRepository(GenericSARepository, CountryRepositoryBase):
         if record is None:
             return None
         return CountryEntity.model_validate(record)
+
+    async def get_all(self) -> list[CountryEntity]:
+        records = await self._fetch_all(self._select())
+        return await self._convert_db_to_entities(records)
+
+    async def get_name_order(self) -> list[UUID]:
+        stmt = select(Country.id).order_by(Country.name, Country.id)
+        return list(await self._session.scalars(stmt))
+
+    async def count_up_to(self, name: str, country_id: UUID) -> int:
+        # Compared in the database to follow its collation
+        stmt = select(func.count()).where(
+            tuple_(Country.name, Country.id) <= tuple_(name, country_id)
+        )
+        return await self._session.scalar(stmt)
@@ -11,3 +11,5 @@ class ManufacturerRepositoryBase(GenericRepository[ManufacturerEntity], ABC):
 
 class SAManufacturerRepository(GenericSARepository, ManufacturerRepositoryBase):
     model_cls = Manufacturer
+    sort_key = 'name'
+    select_columns = True
@@ -1,7 +1,7 @@
 from abc import abstractmethod, ABC
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 
-from sqlalchemy import select, update
+from sqlalchemy import and_, delete, func, select, text, update
 
 from core.entities.phone_key import PhoneKeyEntity
 from core.exceptions.base import EntityNotFoundError
@@ -24,6 +24,46 @@ class PhoneKeyRepositoryBase(GenericRepository[PhoneKeyEntity], ABC):
     async def mark_as_used_by_key(self, key: str) -> PhoneKeyEntity:
         raise NotImplementedError
 
+    @abstractmethod
+    async def delete_expired(self, before: datetime, limit: int) -> int:
+        """
+        Deletes a batch of keys expired before the date or already used.
+        Keys locked by other transactions are skipped
+
+        :param before: Keys expiring earlier are deleted
+        :param limit: Batch size
+        :return: Number of deleted keys
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_oldest_expiration(self, before: datetime) -> datetime | None:
+        """
+        :return: Expiration date of the oldest key expired before the date,
+            None if there are no such keys
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def is_partitioned(self) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def create_partition(self, day: date) -> None:
+        """
+        Creates the partition of keys created on the day, if it does not exist
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def drop_partitions(self, before: date) -> list[str]:
+        """
+        Drops the partitions of keys created before the day
+
+        :return: Names of the dropped partitions
+        """
+        raise NotImplementedError
+
 
 class SAPhoneKeyRepository(GenericSARepository, PhoneKeyRepositoryBase):
     model_cls = PhoneKey
@@ -58,3 +98,75 @@ class SAPhoneKeyRepository(GenericSARepository, PhoneKeyRepositoryBase):
             raise EntityNotFoundError(entity=PhoneKeyEntity, find_query=key)
 
         return PhoneKeyEntity.model_validate(record)
+
+    async def delete_expired(self, before: datetime, limit: int) -> int:
+        # Separate deletes, so both conditions are ranges of the expiration
+        # index: expired keys, then used keys among the few not expired yet
+        deleted = 0
+        for condition in (
+            PhoneKey.expires_at < before,
+            and_(PhoneKey.expires_at >= before, PhoneKey.is_used),
+        ):
+            if deleted >= limit:
+                break
+
+            batch = (
+                select(PhoneKey.id)
+                .where(condition)
+                .limit(limit - deleted)
+                .with_for_update(skip_locked=True)
+            )
+            result = await self._session.execute(
+                delete(PhoneKey).where(PhoneKey.id.in_(batch))
+            )
+            deleted += result.rowcount
+
+        return deleted
+
+    async def get_oldest_expiration(self, before: datetime) -> datetime | None:
+        stmt = select(func.min(PhoneKey.expires_at)).where(PhoneKey.expires_at < before)
+        return await self._session.scalar(stmt)
+
+    async def is_partitioned(self) -> bool:
+        stmt = text(
+            'SELECT EXISTS (SELECT FROM pg_partitioned_table '
+            'WHERE partrelid = CAST(:table AS regclass))'
+        )
+        return await self._session.scalar(stmt, {'table': PhoneKey.__tablename__})
+
+    async def create_partition(self, day: date) -> None:
+        name = _partition_name(day)
+        # Names and bounds are built from a date, so they are safe to inline
+        await self._session.execute(
+            text(
+                f'CREATE TABLE IF NOT EXISTS {name} '
+                f'PARTITION OF {PhoneKey.__tablename__} '
+                f"FOR VALUES FROM ('{day}') TO ('{day + timedelta(days=1)}')"
+            )
+        )
+
+    async def drop_partitions(self, before: date) -> list[str]:
+        stmt = text(
+            'SELECT CAST(inhrelid AS regclass) FROM pg_inherits '
+            'WHERE inhparent = CAST(:table AS regclass)'
+        )
+        partitions = await self._session.scalars(
+            stmt, {'table': PhoneKey.__tablename__}
+        )
+
+        dropped = [
+            name
+            for name in map(str, partitions)
+            if name.startswith(PARTITION_PREFIX) and name < _partition_name(before)
+        ]
+        for name in dropped:
+            await self._session.execute(text(f'DROP TABLE {name}'))
+
+        return dropped
+
+
+PARTITION_PREFIX = f'{PhoneKey.__tablename__}_p'
+
+
+def _partition_name(day: date) -> str:
+    return f'{PARTITION_PREFIX}{day:%Y%m%d}'
@@ -1,15 +1,196 @@
-from abc import ABC
+from abc import ABC, abstractmethod
+from typing import Sequence
+from uuid import UUID
 
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Select, literal_column, not_, select
+from sqlalchemy.orm import joinedload, raiseload
 
-from core.entities.product import ProductEntity
-from core.repositories.base import GenericRepository, GenericSARepository
+from core.entities.brand import BrandEntity
+from core.entities.category import CategoryEntity
+from core.entities.country import CountryEntity
+from core.entities.manufacturer import ManufacturerEntity
+from core.entities.pagination import CursorPage
+from core.entities.product import ProductEntity, ProductFilter, ProductSort
+from core.repositories.base import (
+    GenericRepository,
+    GenericSARepository,
+    entity_list_adapter,
+)
+from database.base import Base
+from database.models import Product
 
 
 class ProductRepositoryBase(GenericRepository[ProductEntity], ABC):
-    pass
+    """
+    Read methods load products with all their relations
+    """
+
+    entity = ProductEntity
+
+    @abstractmethod
+    async def get_by_id(self, id: UUID) -> ProductEntity | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def list(
+        self,
+        offset: int = 0,
+        limit: int = 100,
+        filters: dict = None,
+    ) -> list[ProductEntity]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def list_filtered(
+        self,
+        filters: ProductFilter,
+        sort: ProductSort = 'price',
+        after: str | None = None,
+        limit: int = 100,
+    ) -> CursorPage[ProductEntity]:
+        """
+        Get a page of products matching all the filter conditions
+
+        :param filters: Filter conditions
+        :param sort: Sort column, '-' prefix for descending order
+        :param after: Cursor of the previous page, None for the first page
+        :param limit:
+        :raise BadCursorError: Cursor is malformed or was issued for another sort
+        :return: Page of products with a cursor of the next page
+        """
+        raise NotImplementedError
 
 
 class ProductSARepository(GenericSARepository[ProductEntity], ProductRepositoryBase):
-    def __init__(self, session: AsyncSession) -> None:
-        super().__init__(session, ProductEntity)
+    model_cls = Product
+    sort_key = 'price'
+
+    relations = ('brand', 'manufacturer', 'manufacturing_country', 'category')
+    relation_entities = {
+        'brand': BrandEntity,
+        'manufacturer': ManufacturerEntity,
+        'manufacturing_country': CountryEntity,
+    }
+
+    def _with_relations(self, stmt: Select) -> Select:
+        """
+        Adds the relations to a SELECT query, accessing any other relation
+        raises instead of lazy loading.
+        Every relation is many-to-one, so joining them keeps a page to one query
+
+        :param stmt: SELECT statement of products
+        :return: SELECT statement
+        """
+        return stmt.options(
+            *(joinedload(getattr(Product, relation)) for relation in self.relations),
+            raiseload('*'),
+        )
+
+    @staticmethod
+    def _apply_product_filters(stmt: Select, filters: ProductFilter) -> Select:
+        if filters.category_ids is not None:
+            stmt = stmt.where(Product.category_id.in_(filters.category_ids))
+        if filters.brand_id is not None:
+            stmt = stmt.where(Product.brand_id == filters.brand_id)
+        if filters.manufacturer_id is not None:
+            stmt = stmt.where(Product.manufacturer_id == filters.manufacturer_id)
+        if filters.manufacturing_country_id is not None:
+            stmt = stmt.where(
+                Product.manufacturing_country_id == filters.manufacturing_country_id
+            )
+        if filters.min_price is not None:
+            stmt = stmt.where(Product.price >= filters.min_price)
+        if filters.max_price is not None:
+            stmt = stmt.where(Product.price <= filters.max_price)
+        # Conditions of the partial indexes are rendered inline: with bound
+        # parameters the cached generic plan of the prepared statement could
+        # not use the partial indexes and every query would be planned anew
+        if filters.is_active is True:
+            stmt = stmt.where(Product.is_active)
+        elif filters.is_active is False:
+            stmt = stmt.where(not_(Product.is_active))
+        if filters.in_stock is True:
+            stmt = stmt.where(Product.stock > literal_column('0'))
+        elif filters.in_stock is False:
+            stmt = stmt.where(Product.stock == literal_column('0'))
+
+        return stmt
+
+    def _record_to_dict(self, record: Product) -> dict:
+        data = {
+            column.key: getattr(record, column.key) for column in Product.__table__.c
+        }
+
+        # Only loaded relationships are in __dict__, reading the others would lazy load
+        loaded = record.__dict__
+        for relation, entity_cls in self.relation_entities.items():
+            if loaded.get(relation) is not None:
+                data[relation] = entity_cls.model_validate(loaded[relation])
+
+        category = loaded.get('category')
+        if category is not None:
+            data['category'] = CategoryEntity(
+                id=category.id,
+                name=category.name,
+                parent_id=category.parent_id,
+                child=[],
+            )
+
+        return data
+
+    async def _convert_db_to_entity(self, record: Product, **kwargs) -> ProductEntity:
+        return ProductEntity.model_validate(self._record_to_dict(record))
+
+    async def _convert_db_to_entities(
+        self, records: Sequence[Product], **kwargs
+    ) -> list[ProductEntity]:
+        return entity_list_adapter(ProductEntity).validate_python(
+            [self._record_to_dict(record) for record in records]
+        )
+
+    async def _convert_entity_to_db(self, entity: ProductEntity, **kwargs) -> Base:
+        return self.model_cls(**entity.model_dump(exclude=set(self.relations)))
+
+    async def _convert_entity_to_update_dict(
+        self, entity: ProductEntity, **kwargs
+    ) -> dict:
+        return entity.model_dump(exclude={'id', *self.relations})
+
+    async def get_by_id(self, id: UUID, **kwargs) -> ProductEntity | None:
+        stmt = self._with_relations(self._construct_get_stmt(id))
+        record = await self._session.scalar(stmt)
+
+        if record is None:
+            return None
+
+        return await self._convert_db_to_entity(record)
+
+    async def list(
+        self,
+        offset: int = 0,
+        limit: int = 100,
+        filters: dict = None,
+        **kwargs,
+    ) -> list[ProductEntity]:
+        stmt = self._construct_list_stmt(offset=offset, limit=limit, **(filters or {}))
+        records = await self._session.scalars(self._with_relations(stmt))
+
+        return await self._convert_db_to_entities(records.all())
+
+    async def list_filtered(
+        self,
+        filters: ProductFilter,
+        sort: ProductSort = 'price',
+        after: str | None = None,
+        limit: int = 100,
+    ) -> CursorPage[ProductEntity]:
+        stmt = self._with_relations(select(Product))
+        stmt = self._apply_product_filters(stmt, filters)
+
+        return await self._get_page(
+            stmt,
+            after,
+            limit,
+            sort_key=sort.removeprefix('-'),
+            descending=sort.startswith('-'),
+        )
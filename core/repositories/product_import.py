@@ -0,0 +1,55 @@
+from abc import ABC, abstractmethod
+from typing import Sequence
+from uuid import UUID
+
+from sqlalchemy import insert, select
+
+from core.entities.product_import import ProductImportEntity, ProductImportErrorEntity
+from core.repositories.base import GenericRepository, GenericSARepository
+from database.models import ProductImport, ProductImportError
+
+
+class ProductImportRepositoryBase(GenericRepository[ProductImportEntity], ABC):
+    entity = ProductImportEntity
+
+    @abstractmethod
+    async def add_errors(self, errors: Sequence[ProductImportErrorEntity]) -> None:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def get_errors(
+        self, import_id: UUID, limit: int
+    ) -> list[ProductImportErrorEntity]:
+        """
+        :return: First errors of the import by line
+        """
+        raise NotImplementedError()
+
+
+class SAProductImportRepository(GenericSARepository, ProductImportRepositoryBase):
+    model_cls = ProductImport
+    select_columns = True
+
+    async def add_errors(self, errors: Sequence[ProductImportErrorEntity]) -> None:
+        if not errors:
+            return
+
+        await self._session.execute(
+            insert(ProductImportError), [error.model_dump() for error in errors]
+        )
+
+    async def get_errors(
+        self, import_id: UUID, limit: int
+    ) -> list[ProductImportErrorEntity]:
+        stmt = (
+            select(*ProductImportError.__table__.c)
+            .where(ProductImportError.import_id == import_id)
+            .order_by(ProductImportError.line)
+            .limit(limit)
+        )
+        records = (await self._session.execute(stmt)).all()
+
+        return [
+            ProductImportErrorEntity.model_validate(record, from_attributes=True)
+            for record in records
+        ]
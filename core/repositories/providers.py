@@ -8,6 +8,9 @@ from core.repositories.category import SACategoryRepository
 from core.repositories.country import SACountryRepository
 from core.repositories.manufacturer import SAManufacturerRepository
 from core.repositories.phone_key import SAPhoneKeyRepository
+from core.repositories.product import ProductSARepository
+from core.repositories.product_import import SAProductImportRepository
+from core.repositories.table_version import SATableVersionRepository
 from core.repositories.user import SAUserRepository
 from database.base import get_async_session
 
@@ -42,3 +45,21 @@ def get_category_repository(
     session: Annotated[AsyncSession, Depends(get_async_session)],
 ):
     return SACategoryRepository(session)
+
+
+def get_table_version_repository(
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+):
+    return SATableVersionRepository(session)
+
+
+def get_product_repository(
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+):
+    return ProductSARepository(session)
+
+
+def get_product_import_repository(
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+):
+    return SAProductImportRepository(session)
@@ -0,0 +1,78 @@
+from abc import ABC, abstractmethod
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.models import TableVersion
+
+
+class TableVersionRepositoryBase(ABC):
+    @abstractmethod
+    async def get_version(self, table_name: str) -> int:
+        """
+        Get the current change counter of a table
+
+        :param table_name: Tracked table name
+        :return: Version, 0 if the table has never been changed
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_versions(self, table_names: tuple[str, ...]) -> dict[str, int]:
+        """
+        Get the current change counters of several tables in one go
+
+        :param table_names: Tracked table names
+        :return: Versions by table name, 0 for tables that have never been changed
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def lock_version(self, table_name: str) -> int:
+        """
+        Get the current change counter of a table and lock it until the end
+        of the transaction, so no one else can change the table meanwhile.
+        The counter of a table that has never been changed is created to be locked
+
+        :param table_name: Tracked table name
+        :return: Version, 0 if the table has never been changed
+        """
+        raise NotImplementedError
+
+
+class SATableVersionRepository(TableVersionRepositoryBase):
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def get_version(self, table_name: str) -> int:
+        stmt = select(TableVersion.version).where(TableVersion.table_name == table_name)
+        version = await self._session.scalar(stmt)
+
+        return version or 0
+
+    async def get_versions(self, table_names: tuple[str, ...]) -> dict[str, int]:
+        stmt = select(TableVersion.table_name, TableVersion.version).where(
+            TableVersion.table_name.in_(table_names)
+        )
+        versions = dict((await self._session.execute(stmt)).tuples().all())
+
+        return {table_name: versions.get(table_name, 0) for table_name in table_names}
+
+    async def lock_version(self, table_name: str) -> int:
+        # A table that has never been changed has no row to lock yet
+        insert_stmt = (
+            insert(TableVersion)
+            .values(table_name=table_name, version=0)
+            .on_conflict_do_nothing(index_elements=[TableVersion.table_name])
+        )
+        await self._session.execute(insert_stmt)
+
+        stmt = (
+            select(TableVersion.version)
+            .where(TableVersion.table_name == table_name)
+            .with_for_update()
+        )
+        version = await self._session.scalar(stmt)
+
+        return version or 0
@@ -1,6 +1,7 @@
 from abc import abstractmethod, ABC
+from typing import AsyncIterator
 
-from sqlalchemy import select
+from sqlalchemy import exists, func, select
 
 from core.entities.user import UserEntity
 from core.repositories.base import GenericRepository, GenericSARepository
@@ -14,6 +15,38 @@ class UserRepositoryBase(GenericRepository[UserEntity], ABC):
     async def get_by_phone(self, phone: str) -> UserEntity | None:
         raise NotImplementedError
 
+    @abstractmethod
+    async def is_avatar_used(self, avatar_key: str) -> bool:
+        """
+        Avatars are stored by content, users uploading the same image share
+        the file
+
+        :return: True if any user has this avatar
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def lock_avatar(self, avatar_key: str) -> None:
+        """
+        Serializes the users of an avatar file until the transaction ends:
+        the check that nobody has the avatar and the deletion of the file
+        against saving the same file for another user and committing it
+
+        :param avatar_key: Path of the avatar
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def stream_avatar_keys(self, prefix: str, batch_size: int) -> AsyncIterator[str]:
+        """
+        Avatars of users starting with the prefix, fetched from the database
+        in batches
+
+        :param prefix: Beginning of the avatar paths, e.g. a directory
+        :param batch_size: Rows fetched at once
+        """
+        raise NotImplementedError
+
 
 class SAUserRepository(GenericSARepository, UserRepositoryBase):
     model_cls = User
@@ -24,3 +57,22 @@ class SAUserRepository(GenericSARepository, UserRepositoryBase):
         if user is None:
             return None
         return self.entity.model_validate(user)
+
+    async def is_avatar_used(self, avatar_key: str) -> bool:
+        stmt = select(exists().where(User.avatar_key == avatar_key))
+        return await self._session.scalar(stmt)
+
+    async def lock_avatar(self, avatar_key: str) -> None:
+        stmt = select(func.pg_advisory_xact_lock(func.hashtextextended(avatar_key, 0)))
+        await self._session.execute(stmt)
+
+    async def stream_avatar_keys(
+        self, prefix: str, batch_size: int
+    ) -> AsyncIterator[str]:
+        stmt = (
+            select(User.avatar_key)
+            .where(User.avatar_key.startswith(prefix, autoescape=True))
+            .execution_options(yield_per=batch_size)
+        )
+        async for avatar_key in await self._session.stream_scalars(stmt):
+            yield avatar_key
@@ -1,19 +1,114 @@
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Callable, TypeVar
 
 from jose import jwt
 from passlib.context import CryptContext
 
 from config import get_settings
+from core.metrics import metrics
 
-pwd_context = CryptContext(schemes=['bcrypt'], deprecated='auto')
+R = TypeVar('R')
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt in a dedicated thread pool of a limited size.
+
+    A bcrypt call takes hundreds of milliseconds of CPU, on the event loop
+    it would stall every other request. bcrypt releases the GIL, so the pool
+    threads hash in parallel with the loop, and the pool size caps how many
+    CPUs password checks can take at once; the rest wait in the queue
+    """
+
+    def __init__(self, rounds: int = 12, max_workers: int = 2):
+        """
+        :param rounds: bcrypt work factor (log2 of the number of iterations)
+            for new hashes, existing hashes are checked with their own factor
+        :param max_workers: Number of threads hashing at the same time
+        """
+        self.context = CryptContext(
+            schemes=['bcrypt'], deprecated='auto', bcrypt__rounds=rounds
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='password-hasher'
+        )
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+
+    def _track(self, function: Callable[..., R], *args) -> R:
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+        try:
+            return function(*args)
+        finally:
+            with self._lock:
+                self.running -= 1
+
+    def _untrack_cancelled(self, future: Future) -> None:
+        # A call cancelled before a thread picked it up never leaves the queue
+        if future.cancelled():
+            with self._lock:
+                self.queued -= 1
+
+    async def _run(self, function: Callable[..., R], *args) -> R:
+        with self._lock:
+            self.queued += 1
+
+        future = self._executor.submit(self._track, function, *args)
+        future.add_done_callback(self._untrack_cancelled)
+
+        return await asyncio.wrap_future(future)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self.context.hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(self.context.verify, password, hashed_password)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+@lru_cache
+def get_password_hasher() -> PasswordHasher:
+    settings = get_settings()
+    hasher = PasswordHasher(
+        rounds=settings.bcrypt_rounds,
+        max_workers=settings.password_hashing_workers,
+    )
+
+    metrics.gauge(
+        'password_hashing_queue_depth',
+        'Password hashing calls waiting for a free thread',
+        lambda: hasher.queued,
+    )
+    metrics.gauge(
+        'password_hashing_in_progress',
+        'Password hashing calls running in the thread pool',
+        lambda: hasher.running,
+    )
+
+    return hasher
 
 
 def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+    """
+    Blocks for the duration of bcrypt, use `PasswordHasher.verify` in async code
+    """
+    return get_password_hasher().context.verify(plain_password, hashed_password)
 
 
 def get_password_hash(password):
-    return pwd_context.hash(password)
+    """
+    Blocks for the duration of bcrypt, use `PasswordHasher.hash` in async code
+    """
+    return get_password_hasher().context.hash(password)
 
 
 def create_access_token(data: dict, expires_delta: timedelta = timedelta(minutes=15)):
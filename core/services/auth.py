@@ -6,8 +6,10 @@ from fastapi.security import OAuth2PasswordRequestForm
 from api.schemas.auth import RegisterRequest, ResetPasswordRequest
 from config import Settings
 from core.entities.auth import Token
-from core.exceptions.auth import BadCredentialsError
-from core.security import create_access_token, get_password_hash, verify_password
+from core.entities.user import UserEntity
+from core.exceptions.auth import BadCredentialsError, LoginAttemptsLimitError
+from core.rate_limiters.base import RateLimiterBase
+from core.security import create_access_token, PasswordHasher
 from core.services.phone_key import PhoneKeyServiceBase
 from core.services.user import UserServiceBase
 
@@ -17,10 +19,14 @@ class AuthServiceBase(ABC):
         self,
         user_service: UserServiceBase,
         phone_key_service: PhoneKeyServiceBase,
+        password_hasher: PasswordHasher,
+        rate_limiter: RateLimiterBase,
         settings: Settings,
     ):
         self._user_service = user_service
         self._phone_key_service = phone_key_service
+        self._password_hasher = password_hasher
+        self._rate_limiter = rate_limiter
         self._settings = settings
 
     @abstractmethod
@@ -28,7 +34,19 @@ class AuthServiceBase(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    async def login_user(self, login_data: OAuth2PasswordRequestForm) -> Token:
+    async def login_user(
+        self, login_data: OAuth2PasswordRequestForm, client_ip: str
+    ) -> Token:
+        """
+        :param login_data:
+        :param client_ip: Failed attempts are limited per phone number and client IP,
+            all attempts are also limited per phone number
+        :raises LoginAttemptsLimitError: Too many failed attempts
+            for the phone number from the client IP or too many attempts
+            for the phone number
+        :raises BadCredentialsError:
+        :return: Token
+        """
         raise NotImplementedError
 
     @abstractmethod
@@ -37,12 +55,16 @@ class AuthServiceBase(ABC):
 
 
 class AuthService(AuthServiceBase):
-    def _create_token(self, user_id):
+    def _create_token(self, user: UserEntity):
         access_token_expires = timedelta(
             minutes=self._settings.access_token_expires_minutes
         )
+        claims = {'sub': str(user.id)}
+        if self._settings.superuser_token_claim:
+            claims['is_superuser'] = user.is_superuser
+
         access_token = create_access_token(
-            data={'sub': str(user_id)}, expires_delta=access_token_expires
+            data=claims, expires_delta=access_token_expires
         )
 
         return Token(access_token=access_token)
@@ -54,22 +76,44 @@ class AuthService(AuthServiceBase):
 
         new_user = await self._user_service.create(
             phone=phone_key.phone,
-            hashed_password=get_password_hash(register_data.password),
+            hashed_password=await self._password_hasher.hash(register_data.password),
         )
 
         await self._phone_key_service.use_by_key(phone_key.key)
 
-        return self._create_token(new_user.id)
+        return self._create_token(new_user)
+
+    async def login_user(
+        self, login_data: OAuth2PasswordRequestForm, client_ip: str
+    ) -> Token:
+        # Keyed on the client IP too, so nobody else can lock the user out
+        rate_limit_key = f'login:{login_data.username}:{client_ip}'
+        # Caps guessing spread across many IPs. It is far higher and not reset
+        # by a successful login, so the user is locked out only by such an attack
+        phone_rate_limit_key = f'login:{login_data.username}'
+        # Counted before bcrypt, so guessing costs the attacker no server CPU
+        # and concurrent guesses cannot get around the limits
+        for key, limit in (
+            (rate_limit_key, self._settings.login_attempts_limit),
+            (phone_rate_limit_key, self._settings.login_phone_attempts_limit),
+        ):
+            is_allowed = await self._rate_limiter.hit(
+                key, limit=limit, window=self._settings.login_attempts_window
+            )
+            if not is_allowed:
+                raise LoginAttemptsLimitError
 
-    async def login_user(self, login_data: OAuth2PasswordRequestForm) -> Token:
         user = await self._user_service.get_by_phone(login_data.username)
 
-        if user is None or not verify_password(
+        if user is None or not await self._password_hasher.verify(
             login_data.password, user.hashed_password
         ):
             raise BadCredentialsError
 
-        return self._create_token(user.id)
+        # Only failed attempts stay counted from the client IP
+        await self._rate_limiter.reset(rate_limit_key)
+
+        return self._create_token(user)
 
     async def reset_password(self, reset_data: ResetPasswordRequest) -> None:
         phone_key = await self._phone_key_service.get_ready_to_use_by_key(
@@ -77,7 +121,7 @@ class AuthService(AuthServiceBase):
         )
 
         user = await self._user_service.get_by_phone(phone_key.phone)
-        user.hashed_password = get_password_hash(reset_data.password)
+        hashed_password = await self._password_hasher.hash(reset_data.password)
 
-        await self._user_service.update(user)
+        await self._user_service.set_password(user, hashed_password)
         await self._phone_key_service.use_by_key(phone_key.key)
@@ -1,9 +1,12 @@
 from abc import ABC, abstractmethod
 from uuid import UUID
 
-from api.schemas.brand import BrandCreate, BrandUpdate
+from api.schemas.brand import BrandBulkUpdate, BrandCreate, BrandUpdate
+from core.entities.bulk import BulkResult
 from core.entities.brand import BrandEntity
+from core.entities.pagination import CursorPage
 from core.repositories.brand import BrandRepositoryBase
+from core.services import bulk
 from core.unit_of_work import UnitOfWorkBase
 
 
@@ -20,6 +23,18 @@ class BrandServiceBase(ABC):
     async def get_all(self, limit: int, offset: int) -> list[BrandEntity]:
         raise NotImplementedError
 
+    @abstractmethod
+    async def get_all_after(
+        self, after: str | None, limit: int
+    ) -> CursorPage[BrandEntity]:
+        """
+        :param after: Cursor of the previous page, None for the first page
+        :param limit:
+        :raises BadCursorError:
+        :return: Page ordered by name
+        """
+        raise NotImplementedError
+
     @abstractmethod
     async def get_by_id(self, brand_id: UUID) -> BrandEntity | None:
         raise NotImplementedError
@@ -36,11 +51,37 @@ class BrandServiceBase(ABC):
     async def delete(self, brand_id: UUID) -> None:
         raise NotImplementedError
 
+    @abstractmethod
+    async def create_many(self, brands: list[BrandCreate]) -> BulkResult[BrandEntity]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def update_many(
+        self, brands: list[BrandBulkUpdate]
+    ) -> BulkResult[BrandEntity]:
+        """
+        :return: Updated brands, missing and repeated ids are reported as errors
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete_many(self, brand_ids: list[UUID]) -> BulkResult[UUID]:
+        """
+        :return: Ids of deleted brands, missing and repeated ids are reported
+            as errors
+        """
+        raise NotImplementedError
+
 
 class BrandService(BrandServiceBase):
     async def get_all(self, limit: int, offset: int) -> list[BrandEntity]:
         return await self.brand_repository.list(limit=limit, offset=offset)
 
+    async def get_all_after(
+        self, after: str | None, limit: int
+    ) -> CursorPage[BrandEntity]:
+        return await self.brand_repository.list_after(after=after, limit=limit)
+
     async def get_by_id(self, brand_id: UUID) -> BrandEntity | None:
         return await self.brand_repository.get_by_id(brand_id)
 
@@ -59,3 +100,28 @@ class BrandService(BrandServiceBase):
     async def delete(self, brand_id: UUID) -> None:
         await self.brand_repository.delete(brand_id)
         await self.uow.commit()
+
+    async def create_many(self, brands: list[BrandCreate]) -> BulkResult[BrandEntity]:
+        entities = {
+            index: BrandEntity.model_validate(brand)
+            for index, brand in enumerate(brands)
+        }
+        result = await bulk.create_many(self.brand_repository, entities)
+        await self.uow.commit()
+        return result
+
+    async def update_many(
+        self, brands: list[BrandBulkUpdate]
+    ) -> BulkResult[BrandEntity]:
+        entities = {
+            index: BrandEntity.model_validate(brand)
+            for index, brand in enumerate(brands)
+        }
+        result = await bulk.update_many(self.brand_repository, entities, 'Brand')
+        await self.uow.commit()
+        return result
+
+    async def delete_many(self, brand_ids: list[UUID]) -> BulkResult[UUID]:
+        result = await bulk.delete_many(self.brand_repository, brand_ids, 'Brand')
+        await self.uow.commit()
+        return result
@@ -0,0 +1,115 @@
+"""
+Steps shared by the bulk writes of services. Items are passed by their
+position in the request, so errors point at the items that caused them
+"""
+
+from typing import TypeVar
+from uuid import UUID
+
+from core.entities.base import BaseEntity
+from core.entities.bulk import BulkItemError, BulkResult
+from core.repositories.base import GenericRepository
+
+T = TypeVar('T', bound=BaseEntity)
+
+
+def _sorted(errors: list[BulkItemError]) -> list[BulkItemError]:
+    return sorted(errors, key=lambda error: error.index)
+
+
+def _unique(ids: dict[int, UUID], errors: list[BulkItemError]) -> dict[UUID, int]:
+    """
+    :return: Positions of the first occurrences of the ids, the others
+        are reported as errors
+    """
+    unique = {}
+    for index, id in ids.items():
+        if id in unique:
+            errors.append(BulkItemError(index=index, detail=f'Duplicate id {id}'))
+        else:
+            unique[id] = index
+    return unique
+
+
+async def create_many(
+    repository: GenericRepository[T],
+    entities: dict[int, T],
+    errors: list[BulkItemError] | None = None,
+) -> BulkResult[T]:
+    """
+    :param entities: Entities to create by position
+    :param errors: Errors of the items rejected beforehand
+    """
+    created = await repository.add_many(list(entities.values()))
+
+    return BulkResult(items=created, errors=_sorted(errors or []))
+
+
+async def update_many(
+    repository: GenericRepository[T],
+    entities: dict[int, T],
+    name: str,
+    errors: list[BulkItemError] | None = None,
+) -> BulkResult[T]:
+    """
+    Updates the entities, those missing from the table are reported as errors
+
+    :param entities: Entities to update by position
+    :param name: Name of the entity in error messages
+    :param errors: Errors of the items rejected beforehand
+    """
+    errors = list(errors or [])
+    unique = _unique({index: entity.id for index, entity in entities.items()}, errors)
+
+    updated = await repository.update_many(
+        [entities[index] for index in unique.values()]
+    )
+    updated_by_id = {entity.id: entity for entity in updated}
+
+    items = []
+    for id, index in unique.items():
+        if id in updated_by_id:
+            items.append(updated_by_id[id])
+        else:
+            errors.append(
+                BulkItemError(index=index, detail=f'{name} with id {id} not found')
+            )
+
+    return BulkResult(items=items, errors=_sorted(errors))
+
+
+async def delete_many(
+    repository: GenericRepository[T], ids: list[UUID], name: str
+) -> BulkResult[UUID]:
+    """
+    Deletes the entities, ids missing from the table or still referred to
+    by other records are reported as errors
+
+    :param name: Name of the entity in error messages
+    """
+    errors = []
+    unique = _unique(dict(enumerate(ids)), errors)
+
+    # Deleting a referred record would fail the whole statement
+    referenced = await repository.referenced_ids(list(unique))
+    deleted = set(
+        await repository.delete_many([id for id in unique if id not in referenced])
+    )
+
+    items = []
+    for id, index in unique.items():
+        if id in referenced:
+            errors.append(
+                BulkItemError(
+                    index=index,
+                    detail=f'{name} with id {id} is used by {referenced[id]}',
+                )
+            )
+        elif id in deleted:
+            items.append(id)
+        else:
+            errors.append(
+                BulkItemError(index=index, detail=f'{name} with id {id} not found')
+            )
+
+    return BulkResult(items=items, errors=_sorted(errors))
@@ -1,19 +1,29 @@
 from abc import ABC, abstractmethod
 from uuid import UUID
 
-from api.schemas.category import CategoryUpdate, CategoryCreate
+from api.schemas.category import CategoryBulkUpdate, CategoryUpdate, CategoryCreate
+from core.caches.category_tree import CategoryTreeCache
+from core.entities.bulk import BulkItemError, BulkResult
 from core.entities.category import CategoryEntity
+from core.exceptions.category import CategoryCantBeItsOwnParent
 from core.repositories.category import CategoryRepositoryBase
+from core.repositories.table_version import TableVersionRepositoryBase
+from core.services import bulk
 from core.unit_of_work import UnitOfWorkBase
+from database.models import Category
 
 
 class CategoryServiceBase(ABC):
     def __init__(
         self,
         category_repository: CategoryRepositoryBase,
+        table_version_repository: TableVersionRepositoryBase,
+        tree_cache: CategoryTreeCache,
         uow: UnitOfWorkBase,
     ):
         self.category_repository = category_repository
+        self.table_version_repository = table_version_repository
+        self.tree_cache = tree_cache
         self.uow = uow
 
     @abstractmethod
@@ -24,6 +34,14 @@ class CategoryServiceBase(ABC):
     async def get_root_categories(self, depth: int) -> list[CategoryEntity]:
         raise NotImplementedError
 
+    @abstractmethod
+    async def get_subtree_ids(self, category_id: UUID) -> list[UUID]:
+        """
+        :return: Ids of the category and all its subcategories at any depth,
+            an empty list if the category does not exist
+        """
+        raise NotImplementedError
+
     @abstractmethod
     async def update(self, category_id: UUID, data: CategoryUpdate) -> CategoryEntity:
         raise NotImplementedError
@@ -36,27 +54,178 @@ class CategoryServiceBase(ABC):
     async def create(self, data: CategoryCreate) -> CategoryEntity:
         raise NotImplementedError
 
+    @abstractmethod
+    async def create_many(
+        self, categories: list[CategoryCreate]
+    ) -> BulkResult[CategoryEntity]:
+        """
+        :return: Created categories, those with a missing parent are reported
+            as errors
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def update_many(
+        self, categories: list[CategoryBulkUpdate]
+    ) -> BulkResult[CategoryEntity]:
+        """
+        :return: Updated categories, missing and repeated ids, missing parents
+            and categories set as their own parents are reported as errors
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete_many(self, category_ids: list[UUID]) -> BulkResult[UUID]:
+        """
+        :return: Ids of deleted categories, missing and repeated ids are
+            reported as errors
+        """
+        raise NotImplementedError
+
 
 class CategoryService(CategoryServiceBase):
+    """
+    Reads are served from the in-process category tree snapshot,
+    writes patch the snapshot after they are committed
+    """
+
+    table_name = Category.__tablename__
+
+    async def _get_tree_cache(self) -> CategoryTreeCache:
+        """
+        Returns the tree snapshot, reloading it if the table has been changed
+        """
+        if self.tree_cache.is_fresh:
+            return self.tree_cache
+
+        async with self.tree_cache.lock:
+            if self.tree_cache.is_fresh:
+                return self.tree_cache
+
+            version = await self.table_version_repository.get_version(self.table_name)
+            if version == self.tree_cache.version:
+                self.tree_cache.mark_checked()
+            else:
+                categories = await self.category_repository.get_all()
+                self.tree_cache.load(categories, version)
+
+        return self.tree_cache
+
     async def get_by_id(self, category_id: UUID, depth: int) -> CategoryEntity:
-        return await self.category_repository.get_by_id(category_id, depth=depth)
+        tree_cache = await self._get_tree_cache()
+        return tree_cache.get_by_id(category_id, depth)
 
     async def get_root_categories(self, depth: int) -> list[CategoryEntity]:
-        return await self.category_repository.get_root_categories(depth)
+        tree_cache = await self._get_tree_cache()
+        return tree_cache.get_root_categories(depth)
+
+    async def get_subtree_ids(self, category_id: UUID) -> list[UUID]:
+        tree_cache = await self._get_tree_cache()
+        return tree_cache.get_subtree_ids(category_id)
 
     async def update(self, category_id: UUID, data: CategoryUpdate) -> CategoryEntity:
+        version = await self.table_version_repository.lock_version(self.table_name)
         category = await self.category_repository.update(
             CategoryEntity(id=category_id, **data.model_dump()), depth=0
         )
+        new_version = await self.table_version_repository.get_version(self.table_name)
         await self.uow.commit()
+
+        self.tree_cache.apply(version, new_version, put=category)
         return category
 
     async def delete(self, category_id: UUID) -> None:
+        version = await self.table_version_repository.lock_version(self.table_name)
         await self.category_repository.delete(category_id)
+        new_version = await self.table_version_repository.get_version(self.table_name)
         await self.uow.commit()
 
+        self.tree_cache.apply(version, new_version, remove=category_id)
+
     async def create(self, data: CategoryCreate) -> CategoryEntity:
+        version = await self.table_version_repository.lock_version(self.table_name)
         category = CategoryEntity(**data.model_dump())
         category = await self.category_repository.add(category)
+        new_version = await self.table_version_repository.get_version(self.table_name)
         await self.uow.commit()
+
+        self.tree_cache.apply(version, new_version, put=category)
         return category
+
+    async def _check_parents(
+        self, entities: dict[int, CategoryEntity], errors: list[BulkItemError]
+    ) -> dict[int, CategoryEntity]:
+        """
+        :return: The entities whose parents exist, the others are reported as errors
+        """
+        parent_ids = {entity.parent_id for entity in entities.values()} - {None}
+        existing_ids = await self.category_repository.existing_ids(parent_ids)
+
+        checked = {}
+        for index, entity in entities.items():
+            if entity.parent_id is None or entity.parent_id in existing_ids:
+                checked[index] = entity
+            else:
+                errors.append(
+                    BulkItemError(
+                        index=index,
+                        detail=f'Category with id {entity.parent_id} does not exist',
+                    )
+                )
+        return checked
+
+    async def create_many(
+        self, categories: list[CategoryCreate]
+    ) -> BulkResult[CategoryEntity]:
+        # Serializes with other writers, parents cannot be deleted meanwhile
+        await self.table_version_repository.lock_version(self.table_name)
+
+        errors = []
+        entities = await self._check_parents(
+            {
+                index: CategoryEntity(**category.model_dump())
+                for index, category in enumerate(categories)
+            },
+            errors,
+        )
+        result = await bulk.create_many(self.category_repository, entities, errors)
+        await self.uow.commit()
+
+        # Patching the snapshot item by item would cost more than a reload
+        self.tree_cache.invalidate()
+        return result
+
+    async def update_many(
+        self, categories: list[CategoryBulkUpdate]
+    ) -> BulkResult[CategoryEntity]:
+        await self.table_version_repository.lock_version(self.table_name)
+
+        errors = []
+        entities = {}
+        for index, category in enumerate(categories):
+            try:
+                entities[index] = CategoryEntity(**category.model_dump())
+            except CategoryCantBeItsOwnParent:
+                errors.append(
+                    BulkItemError(
+                        index=index, detail='Category cannot be its own parent'
+                    )
+                )
+        entities = await self._check_parents(entities, errors)
+        result = await bulk.update_many(
+            self.category_repository, entities, 'Category', errors
+        )
+        await self.uow.commit()
+
+        self.tree_cache.invalidate()
+        return result
+
+    async def delete_many(self, category_ids: list[UUID]) -> BulkResult[UUID]:
+        await self.table_version_repository.lock_version(self.table_name)
+        result = await bulk.delete_many(
+            self.category_repository, category_ids, 'Category'
+        )
+        await self.uow.commit()
+
+        self.tree_cache.invalidate()
+        return result
@@ -1,16 +1,42 @@
 from abc import abstractmethod, ABC
 from uuid import UUID
 
+from core.caches.country import CountryCache
 from core.entities.country import CountryEntity
 from core.repositories.country import CountryRepositoryBase
+from core.repositories.table_version import TableVersionRepositoryBase
+from database.models import Country
 
 
 class CountryServiceBase(ABC):
-    def __init__(self, country_repository: CountryRepositoryBase):
+    def __init__(
+        self,
+        country_repository: CountryRepositoryBase,
+        table_version_repository: TableVersionRepositoryBase,
+        country_cache: CountryCache,
+    ):
         self.country_repository = country_repository
+        self.table_version_repository = table_version_repository
+        self.country_cache = country_cache
 
     @abstractmethod
-    async def get_all(self, limit: int, offset: int) -> list[CountryEntity]:
+    async def get_all_json(self, limit: int, offset: int) -> bytes:
+        """
+        :return: JSON array of the countries
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_all_after_json(
+        self, after: str | None, limit: int
+    ) -> tuple[bytes, str | None]:
+        """
+        :param after: Cursor of the previous page, None for the first page
+        :param limit:
+        :raises BadCursorError:
+        :return: JSON array of the page ordered by name and the cursor
+            of the next page, None on the last page
+        """
         raise NotImplementedError
 
     @abstractmethod
@@ -21,13 +47,74 @@ class CountryServiceBase(ABC):
     async def get_by_code(self, country_code: str) -> CountryEntity | None:
         raise NotImplementedError
 
+    @abstractmethod
+    async def reload(self) -> None:
+        """
+        Reads the countries from the database now instead of on first use
+        """
+        raise NotImplementedError
+
 
 class CountryService(CountryServiceBase):
-    async def get_all(self, limit: int, offset: int) -> list[CountryEntity]:
-        return await self.country_repository.list(limit=limit, offset=offset)
+    """
+    Reads are served from the in-process copy of the country table,
+    the copy is reloaded when the table version changes
+    """
+
+    table_name = Country.__tablename__
+
+    async def _get_cache(self) -> CountryCache:
+        """
+        Returns the copy, reloading it if the table has been changed
+        """
+        if self.country_cache.is_fresh:
+            return self.country_cache
+
+        async with self.country_cache.lock:
+            if self.country_cache.is_fresh:
+                return self.country_cache
+
+            version = await self.table_version_repository.get_version(self.table_name)
+            if version == self.country_cache.version:
+                self.country_cache.mark_checked()
+            else:
+                await self._load(version)
+
+        return self.country_cache
+
+    async def _load(self, version: int) -> None:
+        countries = await self.country_repository.get_all()
+        name_order = await self.country_repository.get_name_order()
+        self.country_cache.load(countries, name_order, version)
+
+    async def get_all_json(self, limit: int, offset: int) -> bytes:
+        country_cache = await self._get_cache()
+        return country_cache.get_all_json(limit, offset)
+
+    async def get_all_after_json(
+        self, after: str | None, limit: int
+    ) -> tuple[bytes, str | None]:
+        country_cache = await self._get_cache()
+
+        start = 0
+        if after is not None:
+            name, country_id = country_cache.decode_cursor(after)
+            start = country_cache.get_position_after(name, country_id)
+            if start is None:
+                # The country is gone, only the database can place its name
+                start = await self.country_repository.count_up_to(name, country_id)
+
+        return country_cache.get_all_after_json(start, limit)
 
     async def get_by_id(self, country_id: UUID) -> CountryEntity | None:
-        return await self.country_repository.get_by_id(country_id)
+        country_cache = await self._get_cache()
+        return country_cache.get_by_id(country_id)
 
     async def get_by_code(self, country_code: str) -> CountryEntity | None:
-        return await self.country_repository.get_by_code(country_code)
+        country_cache = await self._get_cache()
+        return country_cache.get_by_code(country_code)
+
+    async def reload(self) -> None:
+        async with self.country_cache.lock:
+            version = await self.table_version_repository.get_version(self.table_name)
+            await self._load(version)
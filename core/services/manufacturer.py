@@ -1,9 +1,16 @@
 from abc import abstractmethod, ABC
 from uuid import UUID
 
-from api.schemas.manufacturer import ManufacturerCreate, ManufacturerUpdate
+from api.schemas.manufacturer import (
+    ManufacturerBulkUpdate,
+    ManufacturerCreate,
+    ManufacturerUpdate,
+)
+from core.entities.bulk import BulkResult
 from core.entities.manufacturer import ManufacturerEntity
+from core.entities.pagination import CursorPage
 from core.repositories.manufacturer import ManufacturerRepositoryBase
+from core.services import bulk
 from core.unit_of_work import UnitOfWorkBase
 
 
@@ -24,6 +31,18 @@ class ManufacturerServiceBase(ABC):
     async def get_all(self, limit: int, offset: int) -> list[ManufacturerEntity]:
         raise NotImplementedError
 
+    @abstractmethod
+    async def get_all_after(
+        self, after: str | None, limit: int
+    ) -> CursorPage[ManufacturerEntity]:
+        """
+        :param after: Cursor of the previous page, None for the first page
+        :param limit:
+        :raises BadCursorError:
+        :return: Page ordered by name
+        """
+        raise NotImplementedError
+
     @abstractmethod
     async def create(self, manufacturer: ManufacturerCreate) -> ManufacturerEntity:
         raise NotImplementedError
@@ -38,11 +57,39 @@ class ManufacturerServiceBase(ABC):
     async def delete(self, manufacturer_id: UUID) -> None:
         raise NotImplementedError
 
+    @abstractmethod
+    async def create_many(
+        self, manufacturers: list[ManufacturerCreate]
+    ) -> BulkResult[ManufacturerEntity]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def update_many(
+        self, manufacturers: list[ManufacturerBulkUpdate]
+    ) -> BulkResult[ManufacturerEntity]:
+        """
+        :return: Updated manufacturers, missing and repeated ids are reported as errors
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete_many(self, manufacturer_ids: list[UUID]) -> BulkResult[UUID]:
+        """
+        :return: Ids of deleted manufacturers, missing and repeated ids are reported
+            as errors
+        """
+        raise NotImplementedError
+
 
 class ManufacturerService(ManufacturerServiceBase):
     async def get_all(self, limit: int, offset: int) -> list[ManufacturerEntity]:
         return await self.manufacturer_repository.list(offset=offset, limit=limit)
 
+    async def get_all_after(
+        self, after: str | None, limit: int
+    ) -> CursorPage[ManufacturerEntity]:
+        return await self.manufacturer_repository.list_after(after=after, limit=limit)
+
     async def create(self, manufacturer: ManufacturerCreate) -> ManufacturerEntity:
         entity = ManufacturerEntity.model_validate(manufacturer)
         new_manufacturer = await self.manufacturer_repository.add(entity)
@@ -63,3 +110,34 @@ class ManufacturerService(ManufacturerServiceBase):
 
     async def get_by_id(self, manufacturer_id: UUID) -> ManufacturerEntity | None:
         return await self.manufacturer_repository.get_by_id(manufacturer_id)
+
+    async def create_many(
+        self, manufacturers: list[ManufacturerCreate]
+    ) -> BulkResult[ManufacturerEntity]:
+        entities = {
+            index: ManufacturerEntity.model_validate(manufacturer)
+            for index, manufacturer in enumerate(manufacturers)
+        }
+        result = await bulk.create_many(self.manufacturer_repository, entities)
+        await self.uow.commit()
+        return result
+
+    async def update_many(
+        self, manufacturers: list[ManufacturerBulkUpdate]
+    ) -> BulkResult[ManufacturerEntity]:
+        entities = {
+            index: ManufacturerEntity.model_validate(manufacturer)
+            for index, manufacturer in enumerate(manufacturers)
+        }
+        result = await bulk.update_many(
+            self.manufacturer_repository, entities, 'Manufacturer'
+        )
+        await self.uow.commit()
+        return result
+
+    async def delete_many(self, manufacturer_ids: list[UUID]) -> BulkResult[UUID]:
+        result = await bulk.delete_many(
+            self.manufacturer_repository, manufacturer_ids, 'Manufacturer'
+        )
+        await self.uow.commit()
+        return result
@@ -2,12 +2,14 @@ import uuid
 from abc import abstractmethod, ABC
 from datetime import datetime, timedelta
 
+from config import Settings
 from core.entities.phone_key import PhoneKeyEntity
 from core.exceptions.phone_key import (
     PhoneKeyCreateLimitError,
     BadPhoneKeyError,
     BadConfirmationCodeError,
 )
+from core.rate_limiters.base import RateLimiterBase
 from core.repositories.phone_key import PhoneKeyRepositoryBase
 from core.unit_of_work import UnitOfWorkBase
 
@@ -16,9 +18,13 @@ class PhoneKeyServiceBase(ABC):
     def __init__(
         self,
         phone_key_repository: PhoneKeyRepositoryBase,
+        rate_limiter: RateLimiterBase,
+        settings: Settings,
         uow: UnitOfWorkBase,
     ):
         self.phone_key_repository = phone_key_repository
+        self.rate_limiter = rate_limiter
+        self.settings = settings
         self.uow = uow
 
     @abstractmethod
@@ -72,8 +78,12 @@ class PhoneKeyService(PhoneKeyServiceBase):
         return await self.phone_key_repository.get_last_hour_keys_by_phone(phone)
 
     async def create(self, phone: str) -> PhoneKeyEntity:
-        phone_keys = await self.get_last_hour_keys_by_phone(phone)
-        if len(phone_keys) >= 3:
+        is_allowed = await self.rate_limiter.hit(
+            f'phone_key:{phone}',
+            limit=self.settings.phone_key_create_limit,
+            window=self.settings.phone_key_create_window,
+        )
+        if not is_allowed:
             raise PhoneKeyCreateLimitError
 
         key = str(uuid.uuid4())  # Получение ключа от стороннего сервиса
@@ -0,0 +1,64 @@
+from abc import ABC, abstractmethod
+from uuid import UUID
+
+from core.entities.pagination import CursorPage
+from core.entities.product import ProductEntity, ProductFilter, ProductSort
+from core.repositories.product import ProductRepositoryBase
+from core.services.category import CategoryServiceBase
+
+
+class ProductServiceBase(ABC):
+    def __init__(
+        self,
+        product_repository: ProductRepositoryBase,
+        category_service: CategoryServiceBase,
+    ):
+        self.product_repository = product_repository
+        self.category_service = category_service
+
+    @abstractmethod
+    async def get_by_id(self, product_id: UUID) -> ProductEntity | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_all_after(
+        self,
+        filters: ProductFilter,
+        category_id: UUID | None,
+        sort: ProductSort,
+        after: str | None,
+        limit: int,
+    ) -> CursorPage[ProductEntity]:
+        """
+        :param filters: Filter conditions
+        :param category_id: Only products of the category and its subcategories
+        :param sort: Sort column, '-' prefix for descending order
+        :param after: Cursor of the previous page, None for the first page
+        :param limit:
+        :raises BadCursorError:
+        :return: Page of products
+        """
+        raise NotImplementedError
+
+
+class ProductService(ProductServiceBase):
+    async def get_by_id(self, product_id: UUID) -> ProductEntity | None:
+        return await self.product_repository.get_by_id(product_id)
+
+    async def get_all_after(
+        self,
+        filters: ProductFilter,
+        category_id: UUID | None,
+        sort: ProductSort,
+        after: str | None,
+        limit: int,
+    ) -> CursorPage[ProductEntity]:
+        if category_id is not None:
+            # Subcategories are taken from the category tree snapshot,
+            # so the product query stays a plain IN filter
+            category_ids = await self.category_service.get_subtree_ids(category_id)
+            filters = filters.model_copy(update={'category_ids': category_ids})
+
+        return await self.product_repository.list_filtered(
+            filters, sort=sort, after=after, limit=limit
+        )
@@ -0,0 +1,54 @@
+from abc import ABC, abstractmethod
+from uuid import UUID
+
+from core.entities.product_import import ProductImportEntity, ProductImportErrorEntity
+from core.repositories.product_import import ProductImportRepositoryBase
+from core.unit_of_work import UnitOfWorkBase
+
+
+class ProductImportServiceBase(ABC):
+    def __init__(
+        self,
+        product_import_repository: ProductImportRepositoryBase,
+        uow: UnitOfWorkBase,
+    ):
+        self.product_import_repository = product_import_repository
+        self.uow = uow
+
+    @abstractmethod
+    async def create(self, filename: str) -> ProductImportEntity:
+        """
+        Creates a pending import job, the file is imported by `ProductImporter`
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_by_id(self, import_id: UUID) -> ProductImportEntity | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_errors(
+        self, import_id: UUID, limit: int
+    ) -> list[ProductImportErrorEntity]:
+        """
+        :return: First failed rows by line
+        """
+        raise NotImplementedError
+
+
+class ProductImportService(ProductImportServiceBase):
+    async def create(self, filename: str) -> ProductImportEntity:
+        product_import = await self.product_import_repository.add(
+            ProductImportEntity(filename=filename)
+        )
+        await self.uow.commit()
+
+        return product_import
+
+    async def get_by_id(self, import_id: UUID) -> ProductImportEntity | None:
+        return await self.product_import_repository.get_by_id(import_id)
+
+    async def get_errors(
+        self, import_id: UUID, limit: int
+    ) -> list[ProductImportErrorEntity]:
+        return await self.product_import_repository.get_errors(import_id, limit)
@@ -3,11 +3,24 @@ from typing import Annotated
 from fastapi import Depends
 
 from config import Settings, get_settings
+from core.caches.category_tree import CategoryTreeCache
+from core.caches.country import CountryCache
+from core.caches.providers import (
+    get_category_tree_cache,
+    get_country_cache,
+    get_user_cache,
+)
+from core.caches.user import UserCache
+from core.images import ImageProcessor, get_image_processor
+from core.rate_limiters.base import RateLimiterBase
+from core.rate_limiters.providers import get_rate_limiter
 from core.repositories.brand import BrandRepositoryBase
 from core.repositories.category import CategoryRepositoryBase
 from core.repositories.country import CountryRepositoryBase
 from core.repositories.manufacturer import ManufacturerRepositoryBase
 from core.repositories.phone_key import PhoneKeyRepositoryBase
+from core.repositories.product import ProductRepositoryBase
+from core.repositories.product_import import ProductImportRepositoryBase
 from core.repositories.providers import (
     get_brand_repository,
     get_user_repository,
@@ -15,14 +28,26 @@ from core.repositories.providers import (
     get_country_repository,
     get_manufacturer_repository,
     get_category_repository,
+    get_table_version_repository,
+    get_product_repository,
+    get_product_import_repository,
 )
+from core.repositories.table_version import TableVersionRepositoryBase
 from core.repositories.user import UserRepositoryBase
+from core.security import PasswordHasher, get_password_hasher
+from core.storages.base import FileStorageBase
+from core.storages.providers import get_file_storage
 from core.services.auth import AuthService, AuthServiceBase
 from core.services.brand import BrandService, BrandServiceBase
 from core.services.category import CategoryServiceBase, CategoryService
 from core.services.country import CountryService, CountryServiceBase
 from core.services.manufacturer import ManufacturerService, ManufacturerServiceBase
 from core.services.phone_key import PhoneKeyService, PhoneKeyServiceBase
+from core.services.product import ProductService, ProductServiceBase
+from core.services.product_import import (
+    ProductImportService,
+    ProductImportServiceBase,
+)
 from core.services.user import UserService, UserServiceBase
 from core.unit_of_work import UnitOfWorkBase, get_uow
 
@@ -36,28 +61,48 @@ def get_brand_service(
 
 def get_user_service(
     user_repository: Annotated[UserRepositoryBase, Depends(get_user_repository)],
+    user_cache: Annotated[UserCache, Depends(get_user_cache)],
+    file_storage: Annotated[FileStorageBase, Depends(get_file_storage)],
+    image_processor: Annotated[ImageProcessor, Depends(get_image_processor)],
     uow: Annotated[UnitOfWorkBase, Depends(get_uow)],
 ) -> UserServiceBase:
-    return UserService(user_repository=user_repository, uow=uow)
+    return UserService(
+        user_repository=user_repository,
+        user_cache=user_cache,
+        file_storage=file_storage,
+        image_processor=image_processor,
+        uow=uow,
+    )
 
 
 def get_phone_key_service(
     phone_key_repository: Annotated[
         PhoneKeyRepositoryBase, Depends(get_phone_key_repository)
     ],
+    rate_limiter: Annotated[RateLimiterBase, Depends(get_rate_limiter)],
+    settings: Annotated[Settings, Depends(get_settings)],
     uow: Annotated[UnitOfWorkBase, Depends(get_uow)],
 ) -> PhoneKeyServiceBase:
-    return PhoneKeyService(phone_key_repository=phone_key_repository, uow=uow)
+    return PhoneKeyService(
+        phone_key_repository=phone_key_repository,
+        rate_limiter=rate_limiter,
+        settings=settings,
+        uow=uow,
+    )
 
 
 def get_auth_service(
     user_service: Annotated[UserServiceBase, Depends(get_user_service)],
     phone_key_service: Annotated[PhoneKeyServiceBase, Depends(get_phone_key_service)],
+    password_hasher: Annotated[PasswordHasher, Depends(get_password_hasher)],
+    rate_limiter: Annotated[RateLimiterBase, Depends(get_rate_limiter)],
     settings: Annotated[Settings, Depends(get_settings)],
 ) -> AuthServiceBase:
     return AuthService(
         user_service=user_service,
         phone_key_service=phone_key_service,
+        password_hasher=password_hasher,
+        rate_limiter=rate_limiter,
         settings=settings,
     )
 
@@ -66,8 +111,16 @@ def get_country_service(
     country_repository: Annotated[
         CountryRepositoryBase, Depends(get_country_repository)
     ],
+    table_version_repository: Annotated[
+        TableVersionRepositoryBase, Depends(get_table_version_repository)
+    ],
+    country_cache: Annotated[CountryCache, Depends(get_country_cache)],
 ) -> CountryServiceBase:
-    return CountryService(country_repository=country_repository)
+    return CountryService(
+        country_repository=country_repository,
+        table_version_repository=table_version_repository,
+        country_cache=country_cache,
+    )
 
 
 def get_manufacturer_service(
@@ -83,6 +136,37 @@ def get_category_service(
     category_repository: Annotated[
         CategoryRepositoryBase, Depends(get_category_repository)
     ],
+    table_version_repository: Annotated[
+        TableVersionRepositoryBase, Depends(get_table_version_repository)
+    ],
+    tree_cache: Annotated[CategoryTreeCache, Depends(get_category_tree_cache)],
     uow: Annotated[UnitOfWorkBase, Depends(get_uow)],
 ) -> CategoryServiceBase:
-    return CategoryService(category_repository=category_repository, uow=uow)
+    return CategoryService(
+        category_repository=category_repository,
+        table_version_repository=table_version_repository,
+        tree_cache=tree_cache,
+        uow=uow,
+    )
+
+
+def get_product_service(
+    product_repository: Annotated[
+        ProductRepositoryBase, Depends(get_product_repository)
+    ],
+    category_service: Annotated[CategoryServiceBase, Depends(get_category_service)],
+) -> ProductServiceBase:
+    return ProductService(
+        product_repository=product_repository, category_service=category_service
+    )
+
+
+def get_product_import_service(
+    product_import_repository: Annotated[
+        ProductImportRepositoryBase, Depends(get_product_import_repository)
+    ],
+    uow: Annotated[UnitOfWorkBase, Depends(get_uow)],
+) -> ProductImportServiceBase:
+    return ProductImportService(
+        product_import_repository=product_import_repository, uow=uow
+    )
@@ -1,14 +1,13 @@
+import asyncio
 import io
-import uuid
 from abc import ABC, abstractmethod
-from pathlib import Path
+from typing import AsyncIterable, AsyncIterator
 from uuid import UUID
 
-import aiofiles
 from PIL import Image
-from fastapi import UploadFile
 
 from api.schemas.user import UserUpdate
+from core.caches.user import UserCache
 from core.entities.user import UserEntity
 from core.exceptions.user import (
     BirthdayCanBeChangedOnceError,
@@ -16,7 +15,10 @@ from core.exceptions.user import (
     BadAvatarTypeError,
     BadAvatarResolutionError,
 )
+from core.avatars import avatar_variant_path, avatar_variant_paths
+from core.images import ImageProcessor
 from core.repositories.user import UserRepositoryBase
+from core.storages.base import FileStorageBase
 from core.unit_of_work import UnitOfWorkBase
 
 
@@ -24,9 +26,15 @@ class UserServiceBase(ABC):
     def __init__(
         self,
         user_repository: UserRepositoryBase,
+        user_cache: UserCache,
+        file_storage: FileStorageBase,
+        image_processor: ImageProcessor,
         uow: UnitOfWorkBase,
     ):
         self._users_repository = user_repository
+        self._user_cache = user_cache
+        self._file_storage = file_storage
+        self._image_processor = image_processor
         self._uow = uow
 
     @abstractmethod
@@ -46,8 +54,17 @@ class UserServiceBase(ABC):
     ) -> UserEntity:
         raise NotImplementedError
 
+    @abstractmethod
+    async def set_password(
+        self, current_user: UserEntity, hashed_password: str
+    ) -> UserEntity:
+        raise NotImplementedError
+
     @abstractmethod
     async def get_by_id(self, user_id: UUID) -> UserEntity | None:
+        """
+        Users are served from the user cache when possible
+        """
         raise NotImplementedError
 
     @abstractmethod
@@ -55,7 +72,25 @@ class UserServiceBase(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    async def set_avatar(self, current_user: UserEntity, avatar: UploadFile) -> str:
+    async def set_avatar(
+        self,
+        current_user: UserEntity,
+        content_type: str | None,
+        chunks: AsyncIterable[bytes],
+    ) -> str:
+        """
+        Saves the avatar as it is read, reading stops at the first problem.
+        Square variants of the avatar are saved next to it, see `core.avatars`
+
+        :param current_user:
+        :param content_type: Content type declared by the client
+        :param chunks: Data of the avatar file
+        :raises BadAvatarSizeError:
+        :raises BadAvatarTypeError:
+        :raises BadAvatarResolutionError:
+        :raises FileStorageError: The saved avatar can't be read back
+        :return: URL of the avatar
+        """
         raise NotImplementedError
 
     @abstractmethod
@@ -63,7 +98,19 @@ class UserServiceBase(ABC):
         raise NotImplementedError
 
 
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+JPEG_SIGNATURE = b'\xff\xd8\xff'
+# Pillow format names and the extensions they are saved with
+AVATAR_FORMATS = {'PNG': 'png', 'JPEG': 'jpeg'}
+
+
 class UserService(UserServiceBase):
+    avatar_max_size = 10 * 1024 * 1024
+    avatar_max_resolution = 1200
+    avatar_max_header_size = 256 * 1024
+    # Avatars are stored by content hash, see `FileStorageBase.save_content_addressed`
+    avatar_directory = 'avatars'
+
     async def update(
         self, current_user: UserEntity, update_data: UserUpdate
     ) -> UserEntity:
@@ -79,6 +126,17 @@ class UserService(UserServiceBase):
 
         current_user = await self._users_repository.update(current_user)
         await self._uow.commit()
+        self._user_cache.invalidate(current_user.id)
+        return current_user
+
+    async def set_password(
+        self, current_user: UserEntity, hashed_password: str
+    ) -> UserEntity:
+        current_user.hashed_password = hashed_password
+
+        current_user = await self._users_repository.update(current_user)
+        await self._uow.commit()
+        self._user_cache.invalidate(current_user.id)
         return current_user
 
     async def create(self, phone: str, hashed_password: str) -> UserEntity:
@@ -92,53 +150,155 @@ class UserService(UserServiceBase):
         return new_user
 
     async def get_by_id(self, user_id: UUID) -> UserEntity | None:
-        return await self._users_repository.get_by_id(user_id)
+        user = self._user_cache.get(user_id)
+        if user is not None:
+            return user
+
+        user = await self._users_repository.get_by_id(user_id)
+        if user is not None:
+            self._user_cache.put(user)
+        return user
 
     async def get_by_phone(self, phone: str) -> UserEntity | None:
         return await self._users_repository.get_by_phone(phone)
 
-    async def set_avatar(self, current_user: UserEntity, avatar: UploadFile) -> str:
-        if avatar.size > 10 * 1024 * 1024:
-            raise BadAvatarSizeError
-
-        if avatar.content_type not in ('image/jpeg', 'image/png'):
+    async def set_avatar(
+        self,
+        current_user: UserEntity,
+        content_type: str | None,
+        chunks: AsyncIterable[bytes],
+    ) -> str:
+        if content_type not in ('image/jpeg', 'image/png'):
             raise BadAvatarTypeError
 
-        file_bytes = io.BytesIO(await avatar.read())
-        image = Image.open(file_bytes)
-        width, height = image.size
-        if width >= 1200 or height >= 1200:
-            raise BadAvatarResolutionError
+        chunks = aiter(chunks)
 
-        output_directory = Path(f'static/users/{current_user.id}')
-        output_directory.mkdir(exist_ok=True)
+        # The header is inspected before anything is written, it also decides
+        # the file extension
+        header = b''
+        extension = None
+        async for chunk in chunks:
+            header += chunk
+            if len(header) > self.avatar_max_size:
+                raise BadAvatarSizeError
 
-        extension = avatar.filename.split('.')[-1]
-        random_str = str(uuid.uuid4()).replace('-', '')[:4]
-        filename = f'avatar-{random_str}.{extension}'
-        path_to_avatar = output_directory / filename
+            extension = await asyncio.to_thread(self._inspect_avatar_header, header)
+            if extension is not None:
+                break
 
-        async with aiofiles.open(path_to_avatar, mode='wb') as file:
-            await file.write(file_bytes.getbuffer())
+        if extension is None:
+            raise BadAvatarTypeError
+
+        # The lock is held until the user is committed with the avatar
+        avatar_key = await self._file_storage.save_content_addressed(
+            self.avatar_directory,
+            extension,
+            self._limit_avatar_size(header, chunks),
+            lock=self._users_repository.lock_avatar,
+        )
+
+        try:
+            # The worker reads the stored file, the upload is never held
+            # in memory as a whole
+            async with self._file_storage.local_copy(avatar_key) as avatar_path:
+                variants = await self._image_processor.make_avatar_variants(avatar_path)
+        except OSError:
+            # The header is fine but the image data is broken
+            await self._delete_avatar_files(avatar_key)
+            raise BadAvatarTypeError
+        await asyncio.gather(
+            *(
+                self._file_storage.save_bytes(
+                    avatar_variant_path(avatar_key, size, extension), variant
+                )
+                for (size, extension), variant in variants.items()
+            )
+        )
 
-        old_avatar = current_user.avatar_url
-        current_user.avatar_url = str(path_to_avatar)
+        old_avatar = current_user.avatar_key
+        current_user.avatar_key = avatar_key
 
         await self._users_repository.update(current_user)
         await self._uow.commit()
+        self._user_cache.invalidate(current_user.id)
 
         if old_avatar is not None:
-            Path(old_avatar).unlink(missing_ok=True)
+            await self._delete_avatar_files(old_avatar)
+
+        return self._file_storage.get_url(avatar_key)
+
+    async def _limit_avatar_size(
+        self, header: bytes, chunks: AsyncIterator[bytes]
+    ) -> AsyncIterator[bytes]:
+        """
+        Passes the rest of the avatar through, checking the size on every chunk
+        """
+        size = len(header)
+        yield header
+
+        async for chunk in chunks:
+            size += len(chunk)
+            if size > self.avatar_max_size:
+                raise BadAvatarSizeError
+            yield chunk
+
+    async def _delete_avatar_files(self, avatar_key: str) -> None:
+        """
+        Deletes the avatar and its variants unless another user has the same
+        avatar. Call it after the user is committed with the new avatar
+        """
+        # An upload of the same file waits, or is waited for, on the lock
+        await self._users_repository.lock_avatar(avatar_key)
+        try:
+            if await self._users_repository.is_avatar_used(avatar_key):
+                return
+
+            await asyncio.gather(
+                *(
+                    self._file_storage.delete(path)
+                    for path in (avatar_key, *avatar_variant_paths(avatar_key))
+                )
+            )
+        finally:
+            await self._uow.commit()
+
+    def _inspect_avatar_header(self, header: bytes) -> str | None:
+        """
+        Runs in a thread, Pillow parsing must not hold the event loop
+
+        :param header: Beginning of the file
+        :return: File extension of the image format,
+            None if the header is not complete yet
+        """
+        if len(header) < len(PNG_SIGNATURE):
+            return None
+        if not header.startswith((PNG_SIGNATURE, JPEG_SIGNATURE)):
+            raise BadAvatarTypeError
+
+        try:
+            # Only the header is parsed, the pixel data is not decoded
+            image = Image.open(io.BytesIO(header), formats=list(AVATAR_FORMATS))
+        except OSError:
+            # The header is incomplete: JPEG metadata may precede the dimensions,
+            # keep reading up to a limit
+            if len(header) > self.avatar_max_header_size:
+                raise BadAvatarTypeError
+            return None
+
+        width, height = image.size
+        if width >= self.avatar_max_resolution or height >= self.avatar_max_resolution:
+            raise BadAvatarResolutionError
 
-        return current_user.avatar_url
+        return AVATAR_FORMATS[image.format]
 
     async def delete_avatar(self, current_user: UserEntity) -> None:
-        if current_user.avatar_url is None:
+        if current_user.avatar_key is None:
             return
 
-        avatar_path = current_user.avatar_url
-        current_user.avatar_url = None
+        avatar_key = current_user.avatar_key
+        current_user.avatar_key = None
         await self._users_repository.update(current_user)
         await self._uow.commit()
+        self._user_cache.invalidate(current_user.id)
 
-        Path(avatar_path).unlink(missing_ok=True)
+        await self._delete_avatar_files(avatar_key)
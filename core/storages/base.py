@@ -0,0 +1,93 @@
+from abc import ABC, abstractmethod
+from typing import AsyncContextManager, AsyncIterable, Awaitable, Callable
+
+
+class FileStorageBase(ABC):
+    """
+    Storage of uploaded files addressed by slash-separated paths.
+    Paths are what the database keeps, clients get URLs from `get_url`
+    """
+
+    @abstractmethod
+    async def save(self, path: str, chunks: AsyncIterable[bytes]) -> None:
+        """
+        Writes the file as the chunks arrive. The file appears under the path
+        only once it is complete, if reading the chunks fails nothing is left
+
+        :param path: Path of the file, missing directories are created
+        :param chunks: Data of the file
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def save_content_addressed(
+        self,
+        directory: str,
+        extension: str,
+        chunks: AsyncIterable[bytes],
+        lock: Callable[[str], Awaitable[None]] | None = None,
+    ) -> str:
+        """
+        Saves the file under the hash of its content, see
+        `content_addressed_path`. A file with the same content is stored once,
+        so the file under a path never changes and may be cached forever
+
+        :param directory: Directory the file is saved in
+        :param extension: Extension of the file, without a dot
+        :param chunks: Data of the file
+        :param lock: Awaited with the path once the content is read, before
+            an existing file is looked up. Whoever deletes shared files takes
+            the same lock, so a reused file is not deleted under the caller
+        :return: Path of the file
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def content_addressed_path(directory: str, digest: str, extension: str) -> str:
+        """
+        Files are sharded into two levels of subdirectories by the first
+        characters of the hash, so no directory grows beyond a few hundred entries
+
+        :param digest: Hex SHA-256 of the content
+        """
+        return f'{directory}/{digest[:2]}/{digest[2:4]}/{digest}.{extension}'
+
+    async def save_bytes(self, path: str, data: bytes) -> None:
+        async def chunks():
+            yield data
+
+        await self.save(path, chunks())
+
+    @abstractmethod
+    async def delete(self, path: str) -> None:
+        """
+        Deletes the file, a missing file is not an error
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def local_copy(self, path: str) -> AsyncContextManager[str]:
+        """
+        Makes the file available on the local disk for the code that reads it
+        without the storage, e.g. in a worker process. The file is not read
+        into memory
+
+        :raises FileStorageError: The file can't be read from the storage
+        :return: Context manager giving the filesystem path of the file,
+            a downloaded copy is deleted on exit
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_url(self, path: str) -> str:
+        """
+        :return: URL clients download the file from
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def close(self) -> None:
+        """
+        Releases threads and connections of the storage
+        """
+        raise NotImplementedError
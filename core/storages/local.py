@@ -0,0 +1,154 @@
+import asyncio
+import hashlib
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import partial
+from pathlib import Path
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    BinaryIO,
+    Callable,
+    TypeVar,
+)
+
+from core.storages.base import FileStorageBase
+
+R = TypeVar('R')
+
+
+def _write(file: BinaryIO, data: bytes, digest) -> None:
+    file.write(data)
+    digest.update(data)
+
+
+def _touch(path: Path) -> bool:
+    """
+    Updates the modification time, so the avatar collector does not take
+    a file that is being reused for an orphan
+
+    :return: False if there is no file
+    """
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        return False
+    return True
+
+
+class LocalFileStorage(FileStorageBase):
+    """
+    Files on the local disk. Every filesystem call runs in a dedicated thread
+    pool, so a slow disk delays the upload but not the event loop
+    """
+
+    def __init__(
+        self,
+        root: Path = Path('static'),
+        base_url: str = 'static',
+        max_workers: int = 4,
+        write_buffer_size: int = 1024 * 1024,
+    ):
+        """
+        :param root: Directory the paths are relative to
+        :param base_url: URL the root directory is served at
+        :param max_workers: Number of threads doing filesystem calls
+        :param write_buffer_size: Chunks are collected up to this many bytes
+            and written at once, a trip to the thread pool per network chunk
+            costs more than the write itself
+        """
+        self.root = root
+        self.base_url = base_url.rstrip('/')
+        self.write_buffer_size = write_buffer_size
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='file-storage'
+        )
+
+    async def _run(self, function: Callable[..., R], *args, **kwargs) -> R:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, partial(function, *args, **kwargs)
+        )
+
+    async def _write_temp(
+        self, directory: Path, chunks: AsyncIterable[bytes]
+    ) -> tuple[Path, str]:
+        """
+        Writes the chunks to a temporary file in the directory, the caller
+        renames it. Nothing is left if reading the chunks fails
+
+        :return: Path of the temporary file and SHA-256 of its content
+        """
+        await self._run(directory.mkdir, parents=True, exist_ok=True)
+
+        temp_path = directory / f'.upload-{uuid.uuid4().hex}'
+        digest = hashlib.sha256()
+        file = await self._run(open, temp_path, 'wb')
+        try:
+            try:
+                buffer = bytearray()
+                async for chunk in chunks:
+                    buffer += chunk
+                    if len(buffer) >= self.write_buffer_size:
+                        await self._run(_write, file, bytes(buffer), digest)
+                        buffer.clear()
+                if buffer:
+                    await self._run(_write, file, bytes(buffer), digest)
+            finally:
+                await self._run(file.close)
+        except BaseException:
+            await self._run(temp_path.unlink, missing_ok=True)
+            raise
+
+        return temp_path, digest.hexdigest()
+
+    async def save(self, path: str, chunks: AsyncIterable[bytes]) -> None:
+        full_path = self.root / path
+        # Written next to the target and renamed over it once complete
+        temp_path, _ = await self._write_temp(full_path.parent, chunks)
+        try:
+            await self._run(os.replace, temp_path, full_path)
+        except BaseException:
+            await self._run(temp_path.unlink, missing_ok=True)
+            raise
+
+    async def save_content_addressed(
+        self,
+        directory: str,
+        extension: str,
+        chunks: AsyncIterable[bytes],
+        lock: Callable[[str], Awaitable[None]] | None = None,
+    ) -> str:
+        temp_path, digest = await self._write_temp(self.root / directory, chunks)
+        path = self.content_addressed_path(directory, digest, extension)
+        full_path = self.root / path
+        try:
+            if lock is not None:
+                await lock(path)
+            if await self._run(_touch, full_path):
+                # The same content is stored already
+                await self._run(temp_path.unlink)
+            else:
+                await self._run(full_path.parent.mkdir, parents=True, exist_ok=True)
+                await self._run(os.replace, temp_path, full_path)
+        except BaseException:
+            await self._run(temp_path.unlink, missing_ok=True)
+            raise
+
+        return path
+
+    async def delete(self, path: str) -> None:
+        await self._run((self.root / path).unlink, missing_ok=True)
+
+    @asynccontextmanager
+    async def local_copy(self, path: str) -> AsyncIterator[str]:
+        yield str(self.root / path)
+
+    def get_url(self, path: str) -> str:
+        return f'{self.base_url}/{path}'
+
+    async def close(self) -> None:
+        self._executor.shutdown(wait=False)
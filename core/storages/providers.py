@@ -0,0 +1,29 @@
+from functools import lru_cache
+from pathlib import Path
+
+from config import get_settings
+from core.storages.base import FileStorageBase
+from core.storages.local import LocalFileStorage
+from core.storages.s3 import S3FileStorage
+
+
+@lru_cache
+def get_file_storage() -> FileStorageBase:
+    settings = get_settings()
+    if settings.file_storage_backend == 's3':
+        return S3FileStorage(
+            endpoint_url=settings.s3_endpoint_url,
+            bucket=settings.s3_bucket,
+            access_key_id=settings.s3_access_key_id,
+            secret_access_key=settings.s3_secret_access_key,
+            region=settings.s3_region,
+            public_url=settings.file_storage_url,
+            part_size=settings.s3_part_size,
+            max_connections=settings.s3_max_connections,
+        )
+
+    return LocalFileStorage(
+        root=Path('static'),
+        base_url=settings.file_storage_url or 'static',
+        max_workers=settings.file_storage_workers,
+    )
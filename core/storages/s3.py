@@ -0,0 +1,377 @@
+import asyncio
+import hashlib
+import hmac
+import mimetypes
+import os
+import posixpath
+import tempfile
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import AsyncIterable, AsyncIterator, Awaitable, Callable
+from urllib.parse import quote
+from xml.etree import ElementTree
+
+import httpx
+
+from core.exceptions.storage import FileStorageError
+from core.storages.base import FileStorageBase
+
+EMPTY_SHA256 = hashlib.sha256(b'').hexdigest()
+S3_NAMESPACE = '{http://s3.amazonaws.com/doc/2006-03-01/}'
+# Objects under content-addressed paths never change
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+
+def sign_request(
+    method: str,
+    url: httpx.URL,
+    headers: dict[str, str],
+    payload_hash: str,
+    access_key_id: str,
+    secret_access_key: str,
+    region: str,
+    now: datetime,
+) -> dict[str, str]:
+    """
+    Signs the request with AWS Signature Version 4
+
+    :param headers: Headers to sign, `host` and `x-amz-*` are added
+    :param payload_hash: Hex SHA-256 of the body or `UNSIGNED-PAYLOAD`
+    :return: All headers of the request including `authorization`
+    """
+    amz_date = now.strftime('%Y%m%dT%H%M%SZ')
+    headers = {name.lower(): value for name, value in headers.items()}
+    headers['host'] = url.netloc.decode()
+    headers['x-amz-date'] = amz_date
+    headers['x-amz-content-sha256'] = payload_hash
+
+    signed_headers = ';'.join(sorted(headers))
+    canonical_headers = ''.join(
+        f'{name}:{headers[name].strip()}\n' for name in sorted(headers)
+    )
+    canonical_query = '&'.join(
+        f'{quote(name, safe="-_.~")}={quote(value, safe="-_.~")}'
+        for name, value in sorted(url.params.multi_items())
+    )
+    canonical_request = '\n'.join(
+        [
+            method,
+            quote(url.path, safe='/-_.~'),
+            canonical_query,
+            canonical_headers,
+            signed_headers,
+            payload_hash,
+        ]
+    )
+
+    scope = f'{amz_date[:8]}/{region}/s3/aws4_request'
+    string_to_sign = '\n'.join(
+        [
+            'AWS4-HMAC-SHA256',
+            amz_date,
+            scope,
+            hashlib.sha256(canonical_request.encode()).hexdigest(),
+        ]
+    )
+
+    key = f'AWS4{secret_access_key}'.encode()
+    for part in (amz_date[:8], region, 's3', 'aws4_request'):
+        key = hmac.new(key, part.encode(), hashlib.sha256).digest()
+    signature = hmac.new(key, string_to_sign.encode(), hashlib.sha256).hexdigest()
+
+    headers['authorization'] = (
+        f'AWS4-HMAC-SHA256 Credential={access_key_id}/{scope}, '
+        f'SignedHeaders={signed_headers}, Signature={signature}'
+    )
+    return headers
+
+
+class S3FileStorage(FileStorageBase):
+    """
+    Files in a bucket of an S3-compatible object storage (AWS S3, MinIO, ...),
+    addressed in path style.
+
+    Requests go through one pooled HTTP client. Files of up to `part_size`
+    bytes are sent with a single PUT, larger ones with a multipart upload:
+    a part is sent while the next one is being read. Objects appear only once
+    complete, a failed upload is aborted. Objects are stored with
+    the `Content-Type` of their extension, content-addressed ones also with
+    a `Cache-Control` that lets them be cached forever
+    """
+
+    def __init__(
+        self,
+        endpoint_url: str,
+        bucket: str,
+        access_key_id: str,
+        secret_access_key: str,
+        region: str = 'us-east-1',
+        public_url: str | None = None,
+        part_size: int = 8 * 1024 * 1024,
+        max_connections: int = 20,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        """
+        :param endpoint_url: URL of the storage API
+        :param bucket: Name of the bucket
+        :param region: Region the requests are signed for
+        :param public_url: URL the bucket is served at, e.g. a CDN,
+            the bucket URL by default
+        :param part_size: Size of the parts of a multipart upload,
+            at least 5 MiB
+        :param max_connections: Size of the connection pool
+        :param transport: Transport of the HTTP client, for tests
+        """
+        self.bucket = bucket
+        self.region = region
+        self.public_url = (public_url or f'{endpoint_url}/{bucket}').rstrip('/')
+        self.part_size = part_size
+        self._access_key_id = access_key_id
+        self._secret_access_key = secret_access_key
+        self._client = httpx.AsyncClient(
+            base_url=endpoint_url,
+            limits=httpx.Limits(max_connections=max_connections),
+            timeout=httpx.Timeout(30, connect=5),
+            transport=transport,
+        )
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        params: dict[str, str] | None = None,
+        headers: dict[str, str] | None = None,
+        content: bytes = b'',
+        payload_hash: str | None = None,
+        stream: bool = False,
+    ) -> httpx.Response:
+        request = self._client.build_request(
+            method, f'/{self.bucket}/{path}', params=params, content=content
+        )
+        if payload_hash is None:
+            payload_hash = (
+                hashlib.sha256(content).hexdigest() if content else EMPTY_SHA256
+            )
+        request.headers.update(
+            sign_request(
+                method,
+                request.url,
+                headers or {},
+                payload_hash,
+                self._access_key_id,
+                self._secret_access_key,
+                self.region,
+                datetime.now(timezone.utc),
+            )
+        )
+        return await self._client.send(request, stream=stream)
+
+    async def _upload(
+        self,
+        path: str,
+        chunks: AsyncIterable[bytes],
+        headers: dict[str, str] | None = None,
+    ) -> tuple[str, bytes | None]:
+        """
+        Reads the chunks and uploads them in parts if they exceed one part
+
+        :param path: Object the parts are uploaded to
+        :param headers: Headers the object is stored with
+        :return: SHA-256 of the content and the content itself if it fits
+            in one part, then nothing is uploaded yet
+        """
+        digest = hashlib.sha256()
+        buffer = bytearray()
+        upload_id = None
+        parts: list[str] = []
+        pending: asyncio.Task | None = None
+
+        async def upload_part(number: int, data: bytes) -> None:
+            response = await self._request(
+                'PUT',
+                path,
+                params={'partNumber': str(number), 'uploadId': upload_id},
+                content=data,
+                payload_hash='UNSIGNED-PAYLOAD',
+            )
+            response.raise_for_status()
+            parts[number - 1] = response.headers['etag']
+
+        try:
+            async for chunk in chunks:
+                digest.update(chunk)
+                buffer += chunk
+                if len(buffer) < self.part_size:
+                    continue
+
+                if upload_id is None:
+                    upload_id = await self._create_multipart_upload(path, headers)
+                # One part is in flight while the next one is read
+                if pending is not None:
+                    await pending
+                parts.append('')
+                pending = asyncio.create_task(upload_part(len(parts), bytes(buffer)))
+                buffer.clear()
+
+            if upload_id is None:
+                return digest.hexdigest(), bytes(buffer)
+
+            if pending is not None:
+                await pending
+            if buffer:
+                parts.append('')
+                await upload_part(len(parts), bytes(buffer))
+            await self._complete_multipart_upload(path, upload_id, parts)
+        except BaseException:
+            if pending is not None:
+                pending.cancel()
+            if upload_id is not None:
+                await self._request('DELETE', path, params={'uploadId': upload_id})
+            raise
+
+        return digest.hexdigest(), None
+
+    async def _create_multipart_upload(
+        self, path: str, headers: dict[str, str] | None = None
+    ) -> str:
+        response = await self._request(
+            'POST', path, params={'uploads': ''}, headers=headers
+        )
+        response.raise_for_status()
+        root = ElementTree.fromstring(response.content)
+        return root.findtext(f'{S3_NAMESPACE}UploadId') or root.findtext('UploadId')
+
+    async def _complete_multipart_upload(
+        self, path: str, upload_id: str, parts: list[str]
+    ) -> None:
+        body = ''.join(
+            f'<Part><PartNumber>{number}</PartNumber><ETag>{etag}</ETag></Part>'
+            for number, etag in enumerate(parts, start=1)
+        )
+        response = await self._request(
+            'POST',
+            path,
+            params={'uploadId': upload_id},
+            content=(
+                f'<CompleteMultipartUpload>{body}</CompleteMultipartUpload>'
+            ).encode(),
+        )
+        response.raise_for_status()
+        # The storage may report a failure in the body of a 200 response
+        if b'<Error>' in response.content:
+            raise httpx.HTTPStatusError(
+                f'Multipart upload of {path} failed: {response.text}',
+                request=response.request,
+                response=response,
+            )
+
+    @staticmethod
+    def _object_headers(path: str, immutable: bool = False) -> dict[str, str]:
+        """
+        :param immutable: The object is content-addressed
+        :return: Headers the object is stored and then served with
+        """
+        content_type, _ = mimetypes.guess_type(path)
+        headers = {'content-type': content_type or 'application/octet-stream'}
+        if immutable:
+            headers['cache-control'] = IMMUTABLE_CACHE_CONTROL
+        return headers
+
+    async def _put(
+        self, path: str, data: bytes, digest: str, headers: dict[str, str]
+    ) -> None:
+        response = await self._request(
+            'PUT', path, headers=headers, content=data, payload_hash=digest
+        )
+        response.raise_for_status()
+
+    async def _exists(self, path: str) -> bool:
+        response = await self._request('HEAD', path)
+        if response.status_code == 404:
+            return False
+        response.raise_for_status()
+        return True
+
+    async def save(self, path: str, chunks: AsyncIterable[bytes]) -> None:
+        headers = self._object_headers(path)
+        digest, data = await self._upload(path, chunks, headers)
+        if data is not None:
+            await self._put(path, data, digest, headers)
+
+    async def save_content_addressed(
+        self,
+        directory: str,
+        extension: str,
+        chunks: AsyncIterable[bytes],
+        lock: Callable[[str], Awaitable[None]] | None = None,
+    ) -> str:
+        # A large file is uploaded before its hash is known, then copied
+        temp_path = f'{directory}/.upload-{uuid.uuid4().hex}'
+        digest, data = await self._upload(temp_path, chunks)
+        path = self.content_addressed_path(directory, digest, extension)
+        headers = self._object_headers(path, immutable=True)
+
+        try:
+            if lock is not None:
+                await lock(path)
+            if await self._exists(path):
+                return path
+
+            if data is not None:
+                await self._put(path, data, digest, headers)
+            else:
+                # The copy gets the headers of the object instead of those
+                # of the temporary upload
+                response = await self._request(
+                    'PUT',
+                    path,
+                    headers={
+                        **headers,
+                        'x-amz-copy-source': quote(f'/{self.bucket}/{temp_path}'),
+                        'x-amz-metadata-directive': 'REPLACE',
+                    },
+                )
+                response.raise_for_status()
+        finally:
+            if data is None:
+                await self.delete(temp_path)
+
+        return path
+
+    async def delete(self, path: str) -> None:
+        response = await self._request('DELETE', path)
+        if response.status_code != 404:
+            response.raise_for_status()
+
+    @asynccontextmanager
+    async def local_copy(self, path: str) -> AsyncIterator[str]:
+        # The object is read back chunk by chunk into a temporary file
+        file = await asyncio.to_thread(
+            tempfile.NamedTemporaryFile,
+            suffix=posixpath.splitext(path)[1],
+            delete=False,
+        )
+        try:
+            try:
+                response = await self._request('GET', path, stream=True)
+                try:
+                    response.raise_for_status()
+                    async for chunk in response.aiter_bytes():
+                        await asyncio.to_thread(file.write, chunk)
+                finally:
+                    await response.aclose()
+            except httpx.HTTPError as error:
+                raise FileStorageError(f'Reading {path} failed: {error}') from error
+            finally:
+                await asyncio.to_thread(file.close)
+
+            yield file.name
+        finally:
+            await asyncio.to_thread(os.unlink, file.name)
+
+    def get_url(self, path: str) -> str:
+        return f'{self.public_url}/{path}'
+
+    async def close(self) -> None:
+        await self._client.aclose()
@@ -0,0 +1,134 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from core.metrics import metrics
+from core.rate_limiters.postgres import SARateLimiter
+from core.repositories.phone_key import SAPhoneKeyRepository
+
+logger = logging.getLogger(__name__)
+
+
+class PhoneKeySweeper:
+    """
+    Background task deleting expired and used phone keys in batches,
+    expired rate limit counters are deleted along the way.
+
+    Each batch is a short transaction of its own, so the sweep never holds
+    many row locks at once. If `phone_key` is partitioned by day, partitions
+    of the next days are created ahead and the old ones are dropped whole
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        interval: float = 60,
+        batch_size: int = 1000,
+        partition_retention_days: int = 2,
+    ):
+        """
+        :param session_factory: Factory of the sweeper's own sessions
+        :param interval: Seconds between sweeps
+        :param batch_size: Rows deleted per transaction
+        :param partition_retention_days: Partitions of keys created this many
+            days ago and earlier are dropped
+        """
+        self._session_factory = session_factory
+        self._rate_limiter = SARateLimiter(session_factory)
+        self.interval = interval
+        self.batch_size = batch_size
+        self.partition_retention_days = partition_retention_days
+
+        self.deleted = metrics.counter(
+            'phone_key_sweeper_deleted_total', 'Phone keys deleted by the sweeper'
+        )
+        self.counters_deleted = metrics.counter(
+            'rate_limit_counter_sweeper_deleted_total',
+            'Rate limit counters deleted by the sweeper',
+        )
+        self.errors = metrics.counter(
+            'phone_key_sweeper_errors_total', 'Sweeps failed with an error'
+        )
+        self.throughput = metrics.gauge(
+            'phone_key_sweeper_throughput',
+            'Phone keys deleted per second during the last sweep',
+        )
+        self.lag = metrics.gauge(
+            'phone_key_sweeper_lag_seconds',
+            'Time since the oldest expired phone key left after the last sweep '
+            'has expired, 0 if the sweep caught up',
+        )
+        self.last_sweep = metrics.gauge(
+            'phone_key_sweeper_last_sweep_timestamp_seconds',
+            'Unix time the last successful sweep finished at',
+        )
+
+    async def sweep(self) -> int:
+        """
+        Deletes everything expired by now, batch by batch
+
+        :return: Number of deleted phone keys
+        """
+        started_at = time.monotonic()
+        now = datetime.utcnow()
+
+        async with self._session_factory.begin() as session:
+            repository = SAPhoneKeyRepository(session)
+            if await repository.is_partitioned():
+                await self._maintain_partitions(repository, now)
+
+        deleted = 0
+        while True:
+            async with self._session_factory.begin() as session:
+                batch = await SAPhoneKeyRepository(session).delete_expired(
+                    now, self.batch_size
+                )
+            deleted += batch
+            self.deleted.inc(batch)
+            if batch < self.batch_size:
+                break
+
+        while True:
+            batch = await self._rate_limiter.delete_expired(now, self.batch_size)
+            self.counters_deleted.inc(batch)
+            if batch < self.batch_size:
+                break
+
+        async with self._session_factory() as session:
+            oldest = await SAPhoneKeyRepository(session).get_oldest_expiration(now)
+
+        elapsed = time.monotonic() - started_at
+        self.throughput.set(deleted / elapsed if elapsed else 0)
+        self.lag.set((now - oldest).total_seconds() if oldest else 0)
+        self.last_sweep.set(time.time())
+
+        return deleted
+
+    async def _maintain_partitions(
+        self, repository: SAPhoneKeyRepository, now: datetime
+    ) -> None:
+        today = now.date()
+        for days in range(3):
+            await repository.create_partition(today + timedelta(days=days))
+
+        dropped = await repository.drop_partitions(
+            today - timedelta(days=self.partition_retention_days - 1)
+        )
+        if dropped:
+            logger.info('Dropped phone key partitions %s', ', '.join(dropped))
+
+    async def run(self) -> None:
+        """
+        Sweeps every `interval` seconds until cancelled
+        """
+        while True:
+            try:
+                await self.sweep()
+            except Exception:
+                self.errors.inc()
+                logger.exception('Phone key sweep failed')
+
+            await asyncio.sleep(self.interval)
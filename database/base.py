@@ -2,7 +2,7 @@ import uuid
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import Depends
+from fastapi import Depends, Request
 from sqlalchemy.ext.asyncio import (
     async_sessionmaker,
     create_async_engine,
@@ -11,23 +11,46 @@ from sqlalchemy.ext.asyncio import (
 )
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
-from config import get_settings, Settings
+from config import Settings
 
 
 class Base(AsyncAttrs, DeclarativeBase):
     id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
 
 
-async def get_async_engine(settings: Annotated[Settings, Depends(get_settings)]):
-    return create_async_engine(settings.database_url)
+def create_engine(settings: Settings) -> AsyncEngine:
+    """
+    Creates an engine with a connection pool configured from the settings.
+    The engine is meant to be created once per process and shared
 
+    :param settings: Application settings
+    :return: Async engine
+    """
+    return create_async_engine(
+        settings.database_url,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        pool_recycle=settings.db_pool_recycle,
+        connect_args={
+            'prepared_statement_cache_size': settings.db_statement_cache_size
+        },
+    )
 
-async def get_async_session_factory(
-    engine: Annotated[AsyncEngine, Depends(get_async_engine)],
-) -> async_sessionmaker:
+
+async def get_async_engine(request: Request) -> AsyncEngine:
+    return request.app.state.engine
+
+
+def create_session_factory(engine: AsyncEngine) -> async_sessionmaker:
     return async_sessionmaker(engine, expire_on_commit=False)
 
 
+async def get_async_session_factory(request: Request) -> async_sessionmaker:
+    return request.app.state.async_session_factory
+
+
 async def get_async_session(
     async_session_factory: Annotated[
         async_sessionmaker, Depends(get_async_session_factory)
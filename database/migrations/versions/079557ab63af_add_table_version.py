@@ -0,0 +1,45 @@
+"""Add table_version
+
+Revision ID: 079557ab63af
+Revises: d36f55d4d718
+Create Date: 2026-10-17 11:03:27.918442
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from database.models.table_version import (
+    BUMP_TABLE_VERSION_FUNCTION,
+    BUMP_TABLE_VERSION_TRIGGER,
+)
+
+
+# revision identifiers, used by Alembic.
+revision: str = '079557ab63af'
+down_revision: Union[str, None] = 'd36f55d4d718'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'table_version',
+        sa.Column('table_name', sa.String(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('id', sa.Uuid(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('table_name'),
+    )
+    op.execute(BUMP_TABLE_VERSION_FUNCTION)
+    op.execute(
+        BUMP_TABLE_VERSION_TRIGGER % {'name': 'category', 'fullname': 'category'}
+    )
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER category_bump_version ON category')
+    op.execute('DROP FUNCTION bump_table_version()')
+    op.drop_table('table_version')
@@ -0,0 +1,33 @@
+"""add user avatar key index
+
+Revision ID: 2117e028d6a8
+Revises: 2dbdab01bffb
+Create Date: 2026-10-17 19:08:49.387219
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2117e028d6a8'
+down_revision: Union[str, None] = '2dbdab01bffb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Built once with its final operator class, after the keys are rewritten
+    op.create_index(
+        'ix_user_avatar_key',
+        'user',
+        ['avatar_key'],
+        unique=False,
+        postgresql_ops={'avatar_key': 'text_pattern_ops'},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_user_avatar_key', table_name='user')
@@ -0,0 +1,35 @@
+"""store user avatar key
+
+Revision ID: 2dbdab01bffb
+Revises: ace2c5267af6
+Create Date: 2026-10-17 19:06:18.053009
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2dbdab01bffb'
+down_revision: Union[str, None] = 'ace2c5267af6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Avatars are kept as storage paths, the storage builds their URLs
+    op.alter_column('user', 'avatar_url', new_column_name='avatar_key')
+    op.execute(
+        'UPDATE "user" SET avatar_key = substr(avatar_key, 8) '
+        "WHERE avatar_key LIKE 'static/%'"
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        'UPDATE "user" SET avatar_key = \'static/\' || avatar_key '
+        'WHERE avatar_key IS NOT NULL'
+    )
+    op.alter_column('user', 'avatar_key', new_column_name='avatar_url')
@@ -0,0 +1,28 @@
+"""track country version
+
+Revision ID: 4e8b2f6a1c93
+Revises: 8f3a6c2d91e7
+Create Date: 2026-10-17 22:41:15.308214
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+from database.models.table_version import BUMP_TABLE_VERSION_TRIGGER
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4e8b2f6a1c93'
+down_revision: Union[str, None] = '8f3a6c2d91e7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(BUMP_TABLE_VERSION_TRIGGER % {'name': 'country', 'fullname': 'country'})
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER country_bump_version ON country')
@@ -0,0 +1,32 @@
+"""track brand and manufacturer versions
+
+Revision ID: 5c1d7e9a4b20
+Revises: 2117e028d6a8
+Create Date: 2026-10-17 20:14:02.561734
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+from database.models.table_version import BUMP_TABLE_VERSION_TRIGGER
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1d7e9a4b20'
+down_revision: Union[str, None] = '2117e028d6a8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('brand', 'manufacturer')
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.execute(BUMP_TABLE_VERSION_TRIGGER % {'name': table, 'fullname': table})
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.execute(f'DROP TRIGGER {table}_bump_version ON {table}')
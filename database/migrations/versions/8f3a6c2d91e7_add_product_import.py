@@ -0,0 +1,67 @@
+"""add product import
+
+Revision ID: 8f3a6c2d91e7
+Revises: 5c1d7e9a4b20
+Create Date: 2026-10-17 21:36:48.204117
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f3a6c2d91e7'
+down_revision: Union[str, None] = '5c1d7e9a4b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('product', sa.Column('sku', sa.String(), nullable=True))
+    op.create_unique_constraint('product_sku_key', 'product', ['sku'])
+
+    op.create_table(
+        'product_import',
+        sa.Column('filename', sa.String(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('rows_read', sa.Integer(), nullable=False),
+        sa.Column('rows_failed', sa.Integer(), nullable=False),
+        sa.Column('inserted', sa.Integer(), nullable=False),
+        sa.Column('updated', sa.Integer(), nullable=False),
+        sa.Column('unchanged', sa.Integer(), nullable=False),
+        sa.Column('error', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.Column('id', sa.Uuid(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_table(
+        'product_import_error',
+        sa.Column('import_id', sa.Uuid(), nullable=False),
+        sa.Column('line', sa.Integer(), nullable=False),
+        sa.Column('detail', sa.String(), nullable=False),
+        sa.Column('id', sa.Uuid(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ['import_id'], ['product_import.id'], ondelete='CASCADE'
+        ),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        op.f('ix_product_import_error_import_id'),
+        'product_import_error',
+        ['import_id'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        op.f('ix_product_import_error_import_id'), table_name='product_import_error'
+    )
+    op.drop_table('product_import_error')
+    op.drop_table('product_import')
+    op.drop_constraint('product_sku_key', 'product', type_='unique')
+    op.drop_column('product', 'sku')
@@ -0,0 +1,105 @@
+"""partition phone key by creation date
+
+Optional: the table is only partitioned when asked to with
+`alembic -x partition_phone_key=true upgrade heads`, otherwise the revision
+changes nothing. To partition later, downgrade to 10eae8ed8a23 and upgrade
+again with the flag.
+
+`phone_key` is range partitioned by `created_at`, one partition per day,
+and the sweeper creates the partitions of the next days and drops the old
+ones. Unique constraints of a partitioned table must include the partition
+key, so the primary key becomes (id, created_at) and the key is unique
+together with its creation date. Only the keys created since yesterday
+are moved, older ones are expired anyway.
+
+Revision ID: ace2c5267af6
+Revises: 10eae8ed8a23
+Create Date: 2026-10-17 18:42:17.048065
+
+"""
+
+from datetime import datetime, timedelta
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ace2c5267af6'
+down_revision: Union[str, None] = '10eae8ed8a23'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def is_partitioned() -> bool:
+    return op.get_bind().scalar(
+        sa.text(
+            'SELECT EXISTS (SELECT FROM pg_partitioned_table '
+            "WHERE partrelid = CAST('phone_key' AS regclass))"
+        )
+    )
+
+
+def detach_old_table() -> None:
+    op.rename_table('phone_key', 'phone_key_old')
+    op.drop_index('ix_phone_key_phone_created_at', table_name='phone_key_old')
+    op.drop_index('ix_phone_key_expires_at', table_name='phone_key_old')
+    op.drop_constraint('phone_key_key_key', 'phone_key_old')
+    op.drop_constraint('phone_key_pkey', 'phone_key_old')
+
+
+def create_indexes() -> None:
+    op.create_index(
+        'ix_phone_key_phone_created_at', 'phone_key', ['phone', 'created_at']
+    )
+    op.create_index('ix_phone_key_expires_at', 'phone_key', ['expires_at'])
+
+
+def upgrade() -> None:
+    flag = context.get_x_argument(as_dictionary=True).get('partition_phone_key')
+    if flag != 'true' or is_partitioned():
+        return
+
+    detach_old_table()
+    op.execute(
+        'CREATE TABLE phone_key ('
+        'LIKE phone_key_old INCLUDING DEFAULTS, '
+        'CONSTRAINT phone_key_pkey PRIMARY KEY (id, created_at), '
+        'CONSTRAINT phone_key_key_key UNIQUE (key, created_at)'
+        ') PARTITION BY RANGE (created_at)'
+    )
+    # Catches keys of days the sweeper has not created a partition for
+    op.execute('CREATE TABLE phone_key_default PARTITION OF phone_key DEFAULT')
+
+    today = datetime.utcnow().date()
+    for days in range(-1, 3):
+        day = today + timedelta(days=days)
+        op.execute(
+            f'CREATE TABLE phone_key_p{day:%Y%m%d} PARTITION OF phone_key '
+            f"FOR VALUES FROM ('{day}') TO ('{day + timedelta(days=1)}')"
+        )
+
+    create_indexes()
+    op.execute(
+        'INSERT INTO phone_key SELECT * FROM phone_key_old '
+        f"WHERE created_at >= '{today - timedelta(days=1)}'"
+    )
+    op.drop_table('phone_key_old')
+
+
+def downgrade() -> None:
+    if not is_partitioned():
+        return
+
+    detach_old_table()
+    op.execute(
+        'CREATE TABLE phone_key ('
+        'LIKE phone_key_old INCLUDING DEFAULTS, '
+        'CONSTRAINT phone_key_pkey PRIMARY KEY (id), '
+        'CONSTRAINT phone_key_key_key UNIQUE (key)'
+        ')'
+    )
+    create_indexes()
+    op.execute('INSERT INTO phone_key SELECT * FROM phone_key_old')
+    op.drop_table('phone_key_old')
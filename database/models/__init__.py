@@ -5,6 +5,9 @@ from .brand import Brand
 from .product import Product
 from .manufacturer import Manufacturer
 from .country import Country
+from .table_version import TableVersion
+from .rate_limit_counter import RateLimitCounter
+from .product_import import ProductImport, ProductImportError
 
 __all__ = (
     'User',
@@ -14,4 +17,8 @@ __all__ = (
     'Product',
     'Manufacturer',
     'Country',
+    'TableVersion',
+    'RateLimitCounter',
+    'ProductImport',
+    'ProductImportError',
 )
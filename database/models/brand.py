@@ -1,12 +1,19 @@
+from sqlalchemy import Index
 from sqlalchemy.orm import Mapped, mapped_column
 
 from database.base import Base
+from database.models.table_version import track_table_version
 
 
 class Brand(Base):
     __tablename__ = 'brand'
+    # Serves lookups by name as well as keyset pages
+    __table_args__ = (Index('ix_brand_name_id', 'name', 'id'),)
 
-    name: Mapped[str] = mapped_column(index=True)
+    name: Mapped[str] = mapped_column()
 
     def __repr__(self):
         return f'<Brand: id={self.id} name={self.name}>'
+
+
+track_table_version(Brand.__table__)
@@ -4,6 +4,7 @@ from sqlalchemy import ForeignKey
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from database.base import Base
+from database.models.table_version import track_table_version
 
 
 class Category(Base):
@@ -12,10 +13,13 @@ class Category(Base):
     name: Mapped[str] = mapped_column()
 
     parent_id: Mapped[UUID | None] = mapped_column(
-        ForeignKey('category.id', ondelete='SET NULL')
+        ForeignKey('category.id', ondelete='SET NULL'), index=True
     )
 
     parent: Mapped['Category'] = relationship(
         back_populates='child', remote_side='[Category.id]'
     )
     child: Mapped[list['Category']] = relationship(back_populates='parent')
+
+
+track_table_version(Category.__table__)
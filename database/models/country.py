@@ -1,11 +1,17 @@
+from sqlalchemy import Index
 from sqlalchemy.orm import mapped_column, Mapped
 import sqlalchemy as sa
 
 from database.base import Base
+from database.models.table_version import track_table_version
 
 
 class Country(Base):
     __tablename__ = 'country'
+    __table_args__ = (Index('ix_country_name_id', 'name', 'id'),)
 
     code: Mapped[str] = mapped_column(sa.String(2), index=True)
     name: Mapped[str] = mapped_column()
+
+
+track_table_version(Country.__table__)
@@ -1,9 +1,15 @@
+from sqlalchemy import Index
 from sqlalchemy.orm import Mapped, mapped_column
 
 from database.base import Base
+from database.models.table_version import track_table_version
 
 
 class Manufacturer(Base):
     __tablename__ = 'manufacturer'
+    __table_args__ = (Index('ix_manufacturer_name_id', 'name', 'id'),)
 
     name: Mapped[str] = mapped_column()
+
+
+track_table_version(Manufacturer.__table__)
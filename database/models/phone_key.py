@@ -1,5 +1,6 @@
 from datetime import datetime
 
+from sqlalchemy import Index
 from sqlalchemy.orm import Mapped, mapped_column
 
 from database.base import Base
@@ -7,6 +8,7 @@ from database.base import Base
 
 class PhoneKey(Base):
     __tablename__ = 'phone_key'
+    __table_args__ = (Index('ix_phone_key_phone_created_at', 'phone', 'created_at'),)
 
     key: Mapped[str] = mapped_column(unique=True)
 
@@ -16,7 +18,7 @@ class PhoneKey(Base):
     is_used: Mapped[bool] = mapped_column(default=False)
 
     created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
-    expires_at: Mapped[datetime] = mapped_column()
+    expires_at: Mapped[datetime] = mapped_column(index=True)
     verified_at: Mapped[datetime | None] = mapped_column()
     used_at: Mapped[datetime | None] = mapped_column()
 
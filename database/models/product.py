@@ -1,7 +1,7 @@
 from typing import TYPE_CHECKING
 from uuid import UUID
 
-from sqlalchemy import CheckConstraint, ForeignKey
+from sqlalchemy import CheckConstraint, ForeignKey, Index, text
 from sqlalchemy.dialects.postgresql import ENUM
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 import sqlalchemy as sa
@@ -15,7 +15,113 @@ if TYPE_CHECKING:
 
 class Product(Base):
     __tablename__ = 'product'
+    # The catalog lists only active products, so its indexes skip inactive ones.
+    # Every index ends with (sort column, id) to serve keyset pages without sorting,
+    # each filter has an index per sort column
+    __table_args__ = (
+        Index(
+            'ix_product_active_price_id',
+            'price',
+            'id',
+            postgresql_where=text('is_active'),
+        ),
+        Index(
+            'ix_product_active_discount_id',
+            'discount',
+            'id',
+            postgresql_where=text('is_active'),
+        ),
+        Index(
+            'ix_product_active_name_id',
+            'name',
+            'id',
+            postgresql_where=text('is_active'),
+        ),
+        Index(
+            'ix_product_in_stock_price_id',
+            'price',
+            'id',
+            postgresql_where=text('is_active AND stock > 0'),
+        ),
+        Index(
+            'ix_product_in_stock_discount_id',
+            'discount',
+            'id',
+            postgresql_where=text('is_active AND stock > 0'),
+        ),
+        Index(
+            'ix_product_in_stock_name_id',
+            'name',
+            'id',
+            postgresql_where=text('is_active AND stock > 0'),
+        ),
+        Index(
+            'ix_product_active_category_id_price_id',
+            'category_id',
+            'price',
+            'id',
+            postgresql_where=text('is_active'),
+        ),
+        Index(
+            'ix_product_active_category_id_discount_id',
+            'category_id',
+            'discount',
+            'id',
+            postgresql_where=text('is_active'),
+        ),
+        Index(
+            'ix_product_active_category_id_name_id',
+            'category_id',
+            'name',
+            'id',
+            postgresql_where=text('is_active'),
+        ),
+        Index(
+            'ix_product_active_brand_id_price_id',
+            'brand_id',
+            'price',
+            'id',
+            postgresql_where=text('is_active'),
+        ),
+        Index(
+            'ix_product_active_brand_id_discount_id',
+            'brand_id',
+            'discount',
+            'id',
+            postgresql_where=text('is_active'),
+        ),
+        Index(
+            'ix_product_active_brand_id_name_id',
+            'brand_id',
+            'name',
+            'id',
+            postgresql_where=text('is_active'),
+        ),
+        Index(
+            'ix_product_active_manufacturer_id_price_id',
+            'manufacturer_id',
+            'price',
+            'id',
+            postgresql_where=text('is_active'),
+        ),
+        Index(
+            'ix_product_active_manufacturer_id_discount_id',
+            'manufacturer_id',
+            'discount',
+            'id',
+            postgresql_where=text('is_active'),
+        ),
+        Index(
+            'ix_product_active_manufacturer_id_name_id',
+            'manufacturer_id',
+            'name',
+            'id',
+            postgresql_where=text('is_active'),
+        ),
+    )
 
+    # Article of the supplier catalog, imported products are matched by it
+    sku: Mapped[str | None] = mapped_column(unique=True)
     name: Mapped[str] = mapped_column()
     description: Mapped[str] = mapped_column()
 
@@ -36,12 +142,20 @@ class Product(Base):
     )
 
     brand_id: Mapped[UUID | None] = mapped_column(ForeignKey('brand.id'))
-    manufacturing_country_id: Mapped[UUID] = mapped_column(ForeignKey('country.id'))
+    manufacturing_country_id: Mapped[UUID] = mapped_column(
+        ForeignKey('country.id'), index=True
+    )
     manufacturer_id: Mapped[UUID | None] = mapped_column(ForeignKey('manufacturer.id'))
     category_id: Mapped[UUID] = mapped_column(ForeignKey('category.id'))
 
     # TODO: поменять на back_populates
-    brand: Mapped['Brand'] = relationship(backref='products')
-    manufacturer: Mapped['Manufacturer'] = relationship(backref='products')
-    manufacturing_country: Mapped['Country'] = relationship(backref='products')
-    category: Mapped['Category'] = relationship(backref='products')
+    # Lazy loading would emit a query per product (and fails under asyncio),
+    # relations must be loaded explicitly with the query
+    brand: Mapped['Brand'] = relationship(backref='products', lazy='raise')
+    manufacturer: Mapped['Manufacturer'] = relationship(
+        backref='products', lazy='raise'
+    )
+    manufacturing_country: Mapped['Country'] = relationship(
+        backref='products', lazy='raise'
+    )
+    category: Mapped['Category'] = relationship(backref='products', lazy='raise')
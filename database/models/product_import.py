@@ -0,0 +1,45 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+
+from database.base import Base
+
+
+class ProductImport(Base):
+    """
+    Import of a supplier catalog file, updated as the file is read
+    """
+
+    __tablename__ = 'product_import'
+
+    filename: Mapped[str] = mapped_column()
+    # `pending`, `running`, `done` or `failed`
+    status: Mapped[str] = mapped_column(default='pending')
+
+    rows_read: Mapped[int] = mapped_column(default=0)
+    rows_failed: Mapped[int] = mapped_column(default=0)
+    inserted: Mapped[int] = mapped_column(default=0)
+    updated: Mapped[int] = mapped_column(default=0)
+    unchanged: Mapped[int] = mapped_column(default=0)
+    # Why the whole import failed
+    error: Mapped[str | None] = mapped_column()
+
+    created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+    finished_at: Mapped[datetime | None] = mapped_column()
+
+
+class ProductImportError(Base):
+    """
+    Row of an import file that was skipped
+    """
+
+    __tablename__ = 'product_import_error'
+
+    import_id: Mapped[UUID] = mapped_column(
+        ForeignKey('product_import.id', ondelete='CASCADE'), index=True
+    )
+    # Line of the file the row starts at, the header is line 1 of CSV files
+    line: Mapped[int] = mapped_column()
+    detail: Mapped[str] = mapped_column()
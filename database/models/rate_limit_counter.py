@@ -0,0 +1,22 @@
+from datetime import datetime
+
+from sqlalchemy import UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from database.base import Base
+
+
+class RateLimitCounter(Base):
+    """
+    Number of attempts of a rate limited action in one fixed time window
+    """
+
+    __tablename__ = 'rate_limit_counter'
+    __table_args__ = (UniqueConstraint('key', 'window_start'),)
+
+    key: Mapped[str] = mapped_column()
+    window_start: Mapped[datetime] = mapped_column()
+    hits: Mapped[int] = mapped_column()
+
+    # The counter is still needed for the window after its own
+    expires_at: Mapped[datetime] = mapped_column(index=True)
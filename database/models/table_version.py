@@ -0,0 +1,57 @@
+from sqlalchemy import DDL, Table, event
+from sqlalchemy.orm import Mapped, mapped_column
+
+from database.base import Base
+
+
+class TableVersion(Base):
+    """
+    Change counter of a table. Tracked tables bump their counter with
+    a statement-level trigger, so every write to them (including raw SQL)
+    makes in-process caches of their data detectably stale
+    """
+
+    __tablename__ = 'table_version'
+
+    table_name: Mapped[str] = mapped_column(unique=True)
+    version: Mapped[int] = mapped_column(default=0)
+
+
+BUMP_TABLE_VERSION_FUNCTION = """
+CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO table_version (id, table_name, version)
+    VALUES (gen_random_uuid(), TG_TABLE_NAME, 1)
+    ON CONFLICT (table_name)
+    DO UPDATE SET version = table_version.version + 1;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+BUMP_TABLE_VERSION_TRIGGER = """
+CREATE TRIGGER %(name)s_bump_version
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON %(fullname)s
+FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version()
+"""
+
+event.listen(
+    Base.metadata,
+    'before_create',
+    DDL(BUMP_TABLE_VERSION_FUNCTION).execute_if(dialect='postgresql'),
+)
+
+
+def track_table_version(table: Table) -> None:
+    """
+    Installs the version bumping trigger on the table when it is created
+
+    :param table: Tracked table
+    """
+    event.listen(
+        table,
+        'after_create',
+        DDL(BUMP_TABLE_VERSION_TRIGGER, context={'name': table.name}).execute_if(
+            dialect='postgresql'
+        ),
+    )
@@ -1,5 +1,6 @@
 from datetime import datetime, date
 
+from sqlalchemy import Index
 from sqlalchemy.orm import Mapped, mapped_column
 
 from database.base import Base
@@ -7,11 +8,20 @@ from database.base import Base
 
 class User(Base):
     __tablename__ = 'user'
+    # Pattern ops serve both lookups of an avatar and of all avatars under
+    # a directory (`LIKE 'avatars/ab/cd/%'`) whatever the collation
+    __table_args__ = (
+        Index(
+            'ix_user_avatar_key',
+            'avatar_key',
+            postgresql_ops={'avatar_key': 'text_pattern_ops'},
+        ),
+    )
 
     first_name: Mapped[str | None] = mapped_column()
     last_name: Mapped[str | None] = mapped_column()
     birthday: Mapped[date | None] = mapped_column()
-    avatar_url: Mapped[str | None] = mapped_column()
+    avatar_key: Mapped[str | None] = mapped_column()
 
     phone: Mapped[str] = mapped_column(unique=True)
     hashed_password: Mapped[str] = mapped_column()
@@ -0,0 +1,239 @@
+"""
+Loads reference data into the database, repeated runs change nothing.
+
+    python -m database.seed countries [FILE]
+    python -m database.seed brands FILE
+    python -m database.seed manufacturers FILE
+    python -m database.seed categories FILE
+
+FILE is a CSV file with a header or a JSON array of objects, with the columns
+of the table. Countries are taken from pycountry without a file.
+
+Records are copied into a temporary table and merged into the table by
+their key: new records are inserted, changed ones are updated, records
+missing from the file are kept. The API notices the changed tables by their
+versions, it does not need a restart.
+"""
+
+import argparse
+import asyncio
+import csv
+import gettext
+import json
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Iterable
+
+import pycountry
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    MetaData,
+    Table,
+    and_,
+    exists,
+    func,
+    insert,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from config import get_settings
+from database.base import create_engine
+from database.models import Brand, Category, Country, Manufacturer
+
+# Order of the records in the file, the last of records with the same key wins
+POSITION_COLUMN = 'seed_position'
+
+
+class ReferenceTable:
+    """
+    Table seeded from files
+    """
+
+    def __init__(self, table: Table, key: tuple[str, ...], columns: tuple[str, ...]):
+        """
+        :param table: Seeded table
+        :param key: Columns the records of the file are matched with rows by
+        :param columns: Columns read from files, `id` is generated if missing
+        """
+        self.table = table
+        self.key = key
+        self.columns = columns
+
+    def parse(self, record: dict[str, Any]) -> tuple:
+        """
+        Converts a record of a file to the values of `columns`
+
+        :raise ValueError: A column is missing or has a bad value
+        """
+        values = []
+        for name in self.columns:
+            if name not in record:
+                raise ValueError(f'Column {name} is missing in {record}')
+
+            value = record[name]
+            if value == '' or value is None:
+                if not self.table.c[name].nullable:
+                    raise ValueError(f'Column {name} is empty in {record}')
+                value = None
+            elif self.table.c[name].type.python_type is uuid.UUID:
+                value = uuid.UUID(str(value))
+            values.append(value)
+
+        return tuple(values)
+
+
+REFERENCE_TABLES = {
+    'countries': ReferenceTable(Country.__table__, ('code',), ('code', 'name')),
+    'brands': ReferenceTable(Brand.__table__, ('name',), ('name',)),
+    'manufacturers': ReferenceTable(Manufacturer.__table__, ('name',), ('name',)),
+    # Category names are not unique, categories are matched by id
+    'categories': ReferenceTable(
+        Category.__table__, ('id',), ('id', 'name', 'parent_id')
+    ),
+}
+
+
+def read_file(path: Path) -> Iterable[dict[str, Any]]:
+    """
+    :param path: CSV file with a header or JSON array of objects
+    """
+    if path.suffix == '.json':
+        with path.open(encoding='utf-8') as file:
+            yield from json.load(file)
+        return
+
+    with path.open(encoding='utf-8', newline='') as file:
+        yield from csv.DictReader(file)
+
+
+def read_pycountry() -> Iterable[dict[str, Any]]:
+    """
+    Countries of ISO 3166-1 with Russian names
+    """
+    russian = gettext.translation('iso3166-1', pycountry.LOCALES_DIR, languages=['ru'])
+    for country in pycountry.countries:
+        yield {'code': country.alpha_2, 'name': russian.gettext(country.name)}
+
+
+async def seed_table(
+    connection: AsyncConnection,
+    reference_table: ReferenceTable,
+    records: Iterable[tuple],
+) -> tuple[int, int]:
+    """
+    Merges the records into the table within the transaction of the connection
+
+    :param records: Values of the `columns` of the reference table
+    :return: Numbers of inserted and updated rows
+    """
+    table = reference_table.table
+    staging = Table(
+        f'seed_{table.name}',
+        MetaData(),
+        Column(POSITION_COLUMN, BigInteger),
+        *(Column(name, table.c[name].type) for name in reference_table.columns),
+        prefixes=['TEMPORARY'],
+        postgresql_on_commit='DROP',
+    )
+    await connection.run_sync(staging.create)
+
+    # COPY in the binary format is by far the fastest way in
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(
+        staging.name,
+        records=((position, *values) for position, values in enumerate(records)),
+        columns=[POSITION_COLUMN, *reference_table.columns],
+    )
+    # Temporary tables are not analyzed automatically, the merge would be
+    # planned for an empty table
+    await connection.exec_driver_sql(f'ANALYZE {staging.name}')
+
+    key = [staging.c[name] for name in reference_table.key]
+    source = (
+        select(staging)
+        .distinct(*key)
+        .order_by(*key, staging.c[POSITION_COLUMN].desc())
+        .subquery()
+    )
+    matches = and_(*(table.c[name] == source.c[name] for name in reference_table.key))
+
+    # Concurrent seeding could insert the same keys twice, readers are not blocked
+    await connection.exec_driver_sql(
+        f'LOCK TABLE {table.name} IN SHARE ROW EXCLUSIVE MODE'
+    )
+
+    updated = 0
+    value_columns = [
+        name for name in reference_table.columns if name not in reference_table.key
+    ]
+    if value_columns:
+        result = await connection.execute(
+            update(table)
+            .where(
+                matches,
+                tuple_(*(table.c[name] for name in value_columns)).is_distinct_from(
+                    tuple_(*(source.c[name] for name in value_columns))
+                ),
+            )
+            .values({name: source.c[name] for name in value_columns})
+        )
+        updated = result.rowcount
+
+    columns = list(reference_table.columns)
+    values = [source.c[name] for name in columns]
+    if 'id' not in columns:
+        columns.insert(0, 'id')
+        values.insert(0, func.gen_random_uuid())
+    result = await connection.execute(
+        insert(table).from_select(
+            columns, select(*values).where(~exists().where(matches))
+        )
+    )
+    inserted = result.rowcount
+
+    # Dropped on commit anyway, unless more tables are seeded in the transaction
+    await connection.run_sync(staging.drop)
+
+    return inserted, updated
+
+
+async def main(table_name: str, path: Path | None) -> None:
+    reference_table = REFERENCE_TABLES[table_name]
+    if path is not None:
+        records = read_file(path)
+    elif table_name == 'countries':
+        records = read_pycountry()
+    else:
+        raise SystemExit(f'A file is required to seed {table_name}')
+
+    started_at = time.perf_counter()
+    parsed = [reference_table.parse(record) for record in records]
+
+    engine = create_engine(get_settings())
+    try:
+        async with engine.begin() as connection:
+            inserted, updated = await seed_table(connection, reference_table, parsed)
+    finally:
+        await engine.dispose()
+
+    print(
+        f'{table_name}: {len(parsed)} records, {inserted} inserted, '
+        f'{updated} updated in {time.perf_counter() - started_at:.2f} s'
+    )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().splitlines()[0],
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('table', choices=REFERENCE_TABLES)
+    parser.add_argument('file', type=Path, nargs='?')
+    args = parser.parse_args()
+
+    asyncio.run(main(args.table, args.file))
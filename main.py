@@ -1,23 +1,108 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from pathlib import Path
 
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from starlette.staticfiles import StaticFiles
+from fastapi.responses import JSONResponse, ORJSONResponse
 
+from api.compression import CompressionMiddleware
+from api.pagination import NEXT_CURSOR_HEADER
 from api.routers import router as main_router
+from api.static import CachedStaticFiles, ImmutableStaticFiles
+from config import get_settings
+from core.avatar_collector import AvatarCollector
+from core.caches.providers import get_country_cache
+from core.images import get_image_processor
+from core.metrics import EventLoopLagMonitor, metrics
+from core.repositories.country import SACountryRepository
+from core.repositories.table_version import SATableVersionRepository
+from core.security import get_password_hasher
+from core.services.country import CountryService
+from core.storages.local import LocalFileStorage
+from core.storages.providers import get_file_storage
+from core.sweeper import PhoneKeySweeper
+from database.base import create_engine, create_session_factory
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     Path('static/users/').mkdir(parents=True, exist_ok=True)
+
+    settings = get_settings()
+    engine = create_engine(settings)
+    app.state.engine = engine
+    app.state.async_session_factory = create_session_factory(engine)
+
+    # Countries are read from memory, loaded before the first request
+    async with app.state.async_session_factory() as session:
+        country_service = CountryService(
+            SACountryRepository(session),
+            SATableVersionRepository(session),
+            get_country_cache(),
+        )
+        await country_service.reload()
+
+    lag_monitor = EventLoopLagMonitor()
+    metrics.gauge(
+        'event_loop_lag_max_seconds',
+        'Largest event loop lag since the previous scrape',
+        lag_monitor.pop_max_lag,
+    )
+    tasks = [asyncio.create_task(lag_monitor.run())]
+
+    if settings.phone_key_sweep_interval > 0:
+        sweeper = PhoneKeySweeper(
+            app.state.async_session_factory,
+            interval=settings.phone_key_sweep_interval,
+            batch_size=settings.phone_key_sweep_batch_size,
+            partition_retention_days=settings.phone_key_partition_retention_days,
+        )
+        tasks.append(asyncio.create_task(sweeper.run()))
+
+    file_storage = get_file_storage()
+    if settings.avatar_collector_interval > 0 and isinstance(
+        file_storage, LocalFileStorage
+    ):
+        avatar_collector = AvatarCollector(
+            app.state.async_session_factory,
+            file_storage.root,
+            Path(settings.avatar_collector_state_path),
+            min_age=settings.avatar_collector_min_age,
+            files_per_second=settings.avatar_collector_files_per_second,
+            interval=settings.avatar_collector_interval,
+        )
+        tasks.append(asyncio.create_task(avatar_collector.run()))
+
     yield
 
+    for task in tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    get_password_hasher().shutdown()
+    await get_file_storage().close()
+    get_image_processor().shutdown()
+    await engine.dispose()
 
-app = FastAPI(lifespan=lifespan)
 
-app.mount('/static', StaticFiles(directory='static', check_dir=False), name='static')
+app = FastAPI(
+    lifespan=lifespan,
+    default_response_class=(
+        ORJSONResponse if get_settings().fast_json_responses else JSONResponse
+    ),
+)
+
+# Mounted before `/static`, which would serve the avatars without caching
+app.mount(
+    '/static/avatars',
+    ImmutableStaticFiles(directory='static/avatars', check_dir=False),
+    name='avatars',
+)
+app.mount(
+    '/static', CachedStaticFiles(directory='static', check_dir=False), name='static'
+)
 
 origins = [
     'http://localhost',
@@ -25,12 +110,20 @@ origins = [
     'http://localhost:3000',
 ]
 
+settings = get_settings()
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.compression_minimum_size,
+    thread_size=settings.compression_thread_size,
+    cache_size=settings.compression_cache_size,
+)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
     allow_credentials=True,
     allow_methods=['*'],
     allow_headers=['*'],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 app.include_router(main_router)
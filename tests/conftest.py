@@ -6,10 +6,11 @@ import pycountry
 import pytest
 from fastapi.testclient import TestClient
 from httpx import AsyncClient
-from sqlalchemy import insert
+from sqlalchemy import Engine, event, insert
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.pool import NullPool
 
+from config import get_settings
 from database.base import Base, get_async_session_factory
 from database.models import User, Country
 from main import app
@@ -91,6 +92,13 @@ def get_auth_headers(user: User, expires_minutes: int = 60) -> dict:
     return headers
 
 
+def get_metrics_headers() -> dict:
+    """
+    Headers of a metrics scraper
+    """
+    return {'Authorization': f'Bearer {get_settings().metrics_token}'}
+
+
 @pytest.fixture(scope='function')
 async def auth_headers(prepared_user: User, expires_minutes: int) -> dict:
     return get_auth_headers(prepared_user, expires_minutes)
@@ -115,3 +123,22 @@ async def superuser_client(
         app=app, base_url='http://test', headers=superuser_headers
     ) as ac:
         yield ac
+
+
+@pytest.fixture(scope='function')
+def statements() -> list[str]:
+    """
+    SQL statements sent to the test database while the test runs
+    """
+    executed = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        executed.append(statement)
+
+    # Listening on the class: pytest imports this module a second time as
+    # `tests.conftest`, and the app runs on the engine of that copy
+    event.listen(Engine, 'before_cursor_execute', before_cursor_execute)
+
+    yield executed
+
+    event.remove(Engine, 'before_cursor_execute', before_cursor_execute)
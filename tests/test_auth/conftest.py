@@ -0,0 +1,35 @@
+import pytest
+
+from core.security import PasswordHasher
+from database.models import User
+from tests.conftest import async_session_maker
+
+USER_PHONE = '+79000000000'
+USER_PASSWORD = 'password'
+
+
+@pytest.fixture(scope='session')
+def password_hasher() -> PasswordHasher:
+    # The lowest work factor keeps the tests fast
+    hasher = PasswordHasher(rounds=4, max_workers=1)
+
+    yield hasher
+
+    hasher.shutdown()
+
+
+@pytest.fixture(scope='function')
+async def prepared_user(password_hasher: PasswordHasher) -> User:
+    new_user = User(
+        phone=USER_PHONE,
+        hashed_password=await password_hasher.hash(USER_PASSWORD),
+        is_superuser=False,
+    )
+
+    async with async_session_maker.begin() as session:
+        session.add(new_user)
+
+    yield new_user
+
+    async with async_session_maker.begin() as session:
+        await session.delete(new_user)
@@ -0,0 +1,230 @@
+import asyncio
+import threading
+from uuid import uuid4
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from jose import jwt
+
+from config import get_settings
+from core.security import PasswordHasher, create_access_token
+from database.models import User
+from main import app
+from tests.conftest import client, get_metrics_headers
+from tests.test_auth.conftest import USER_PASSWORD, USER_PHONE
+
+API_PREFIX = '/auth'
+
+
+async def test_login(prepared_user: User):
+    response = client.post(
+        f'{API_PREFIX}/login',
+        data={'username': USER_PHONE, 'password': USER_PASSWORD},
+    )
+
+    assert response.status_code == 200, response.status_code
+    assert response.json()['access_token']
+
+
+@pytest.mark.parametrize(
+    'username, password',
+    [(USER_PHONE, 'wrong password'), ('+79999999999', USER_PASSWORD)],
+    ids=['wrong password', 'unknown user'],
+)
+async def test_login_bad_credentials(prepared_user: User, username, password):
+    response = client.post(
+        f'{API_PREFIX}/login', data={'username': username, 'password': password}
+    )
+
+    assert response.status_code == 401, response.status_code
+
+
+async def test_password_hasher_queue():
+    password_hasher = PasswordHasher(rounds=4, max_workers=1)
+    started = threading.Event()
+    release = threading.Event()
+
+    def hold() -> bool:
+        started.set()
+        return release.wait()
+
+    try:
+        held = asyncio.create_task(password_hasher._run(hold))
+        await asyncio.to_thread(started.wait)
+
+        hashed_password = password_hasher.context.hash(USER_PASSWORD)
+        tasks = [
+            asyncio.create_task(password_hasher.verify(USER_PASSWORD, hashed_password))
+            for _ in range(3)
+        ]
+        # Each task submits its call before it first waits
+        await asyncio.sleep(0)
+
+        # The only thread is held, the other calls wait in the queue
+        assert password_hasher.running == 1
+        assert password_hasher.queued == 3
+
+        release.set()
+        assert await held is True
+        assert await asyncio.gather(*tasks) == [True] * 3
+        assert password_hasher.queued == 0
+        assert password_hasher.running == 0
+    finally:
+        release.set()
+        password_hasher.shutdown()
+
+
+async def test_password_hashing_metrics(prepared_user: User):
+    client.post(
+        f'{API_PREFIX}/login',
+        data={'username': USER_PHONE, 'password': USER_PASSWORD},
+    )
+
+    response = client.get('/metrics', headers=get_metrics_headers())
+
+    assert response.status_code == 200, response.status_code
+    assert 'password_hashing_queue_depth 0' in response.text
+    assert 'password_hashing_in_progress 0' in response.text
+
+
+@pytest.mark.parametrize(
+    'metrics_token, headers, status_code',
+    [
+        ('token', {}, 401),
+        ('token', {'Authorization': 'Bearer wrong'}, 401),
+        ('', {'Authorization': 'Bearer '}, 404),
+    ],
+    ids=['no token', 'wrong token', 'disabled'],
+)
+async def test_metrics_token(metrics_token: str, headers: dict, status_code: int):
+    settings = get_settings().model_copy(update={'metrics_token': metrics_token})
+    app.dependency_overrides[get_settings] = lambda: settings
+    try:
+        response = client.get('/metrics', headers=headers)
+    finally:
+        del app.dependency_overrides[get_settings]
+
+    assert response.status_code == status_code, response.status_code
+
+
+async def test_login_superuser_claim(prepared_user: User):
+    settings = get_settings().model_copy(update={'superuser_token_claim': True})
+    app.dependency_overrides[get_settings] = lambda: settings
+    try:
+        response = client.post(
+            f'{API_PREFIX}/login',
+            data={'username': USER_PHONE, 'password': USER_PASSWORD},
+        )
+    finally:
+        del app.dependency_overrides[get_settings]
+
+    assert response.status_code == 200, response.status_code
+
+    payload = jwt.decode(
+        response.json()['access_token'],
+        settings.secret_key,
+        algorithms=[settings.algorithm],
+    )
+    assert payload['is_superuser'] is False
+
+
+@pytest.mark.parametrize(
+    'is_superuser, status_code', [(True, 404), (False, 401)], ids=['admin', 'user']
+)
+async def test_superuser_claim_without_lookup(
+    statements: list[str], is_superuser: bool, status_code: int
+):
+    # The token belongs to no user, so only the claim can let it through
+    token = create_access_token({'sub': str(uuid4()), 'is_superuser': is_superuser})
+
+    settings = get_settings().model_copy(update={'superuser_token_claim': True})
+    app.dependency_overrides[get_settings] = lambda: settings
+    try:
+        response = client.put(
+            f'/brands/{uuid4()}',
+            json={'name': 'Brand'},
+            headers={'Authorization': f'Bearer {token}'},
+        )
+    finally:
+        del app.dependency_overrides[get_settings]
+
+    assert response.status_code == status_code, response.text
+    assert not any('FROM "user"' in statement for statement in statements)
+
+
+async def test_superuser_claim_ignored_when_disabled(prepared_user: User):
+    # Issued while the claim was enabled and the user was a superuser
+    token = create_access_token({'sub': str(prepared_user.id), 'is_superuser': True})
+
+    response = client.put(
+        f'/brands/{uuid4()}',
+        json={'name': 'Brand'},
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == 401, response.text
+
+
+async def test_login_attempts_limit():
+    settings = get_settings().model_copy(update={'login_attempts_limit': 2})
+    app.dependency_overrides[get_settings] = lambda: settings
+    data = {'username': '+79990000000', 'password': USER_PASSWORD}
+    try:
+        responses = [client.post(f'{API_PREFIX}/login', data=data) for _ in range(3)]
+    finally:
+        del app.dependency_overrides[get_settings]
+
+    assert [response.status_code for response in responses] == [401, 401, 429]
+
+
+async def test_login_attempts_limit_counts_failures(prepared_user: User):
+    settings = get_settings().model_copy(update={'login_attempts_limit': 2})
+    app.dependency_overrides[get_settings] = lambda: settings
+    good = {'username': USER_PHONE, 'password': USER_PASSWORD}
+    bad = {'username': USER_PHONE, 'password': 'bad password'}
+    try:
+        async with AsyncClient(
+            transport=ASGITransport(app=app, client=('192.0.2.1', 1000)),
+            base_url='http://test',
+        ) as ac:
+            # A successful login resets the counter of failed attempts
+            responses = [
+                await ac.post(f'{API_PREFIX}/login', data=data)
+                for data in (bad, good, bad, bad, good)
+            ]
+        async with AsyncClient(
+            transport=ASGITransport(app=app, client=('192.0.2.2', 1000)),
+            base_url='http://test',
+        ) as ac:
+            # Failures from another IP do not lock the user out
+            other_response = await ac.post(f'{API_PREFIX}/login', data=good)
+    finally:
+        del app.dependency_overrides[get_settings]
+
+    assert [response.status_code for response in responses] == [
+        401,
+        200,
+        401,
+        401,
+        429,
+    ]
+    assert other_response.status_code == 200, other_response.text
+
+
+async def test_login_attempts_limit_per_phone():
+    settings = get_settings().model_copy(update={'login_phone_attempts_limit': 2})
+    app.dependency_overrides[get_settings] = lambda: settings
+    bad = {'username': '+79990000011', 'password': 'bad password'}
+    responses = []
+    try:
+        # Guesses spread across IPs are limited too
+        for client_ip in ('192.0.2.11', '192.0.2.12', '192.0.2.13'):
+            async with AsyncClient(
+                transport=ASGITransport(app=app, client=(client_ip, 1000)),
+                base_url='http://test',
+            ) as ac:
+                responses.append(await ac.post(f'{API_PREFIX}/login', data=bad))
+    finally:
+        del app.dependency_overrides[get_settings]
+
+    assert [response.status_code for response in responses] == [401, 401, 429]
@@ -2,6 +2,7 @@ import uuid
 
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import func, select, update
 
 from database.models import Brand
 from tests.conftest import client, async_session_maker
@@ -23,6 +24,34 @@ async def test_get_brands(prepared_brands: list[Brand], limit, offset):
         assert brand_data in brands
 
 
+@pytest.mark.parametrize('limit', [1, 7, 20])
+async def test_get_brands_by_cursor(prepared_brands: list[Brand], limit):
+    brand_ids = []
+    cursor = ''
+    while cursor is not None:
+        response = client.get(API_PREFIX, params={'limit': limit, 'cursor': cursor})
+
+        assert response.status_code == 200, response.status_code
+
+        page = response.json()
+        assert len(page) <= limit
+        brand_ids.extend(brand['id'] for brand in page)
+        cursor = response.headers.get('X-Next-Cursor')
+
+    async with async_session_maker() as session:
+        stmt = select(Brand.id).order_by(Brand.name, Brand.id)
+        expected_ids = (await session.scalars(stmt)).all()
+
+    assert brand_ids == [str(brand_id) for brand_id in expected_ids]
+
+
+@pytest.mark.parametrize('cursor', ['abc', 'WyJpZCIsMSwyXQ'], ids=['abc', 'wrong key'])
+async def test_get_brands_bad_cursor(cursor):
+    response = client.get(API_PREFIX, params={'cursor': cursor})
+
+    assert response.status_code == 400, response.status_code
+
+
 async def test_get_brand(prepared_brands: list[Brand]):
     brand = prepared_brands[0]
 
@@ -129,3 +158,132 @@ async def test_delete_bad_brand(superuser_client: AsyncClient):
     response = await superuser_client.delete(f'{API_PREFIX}/{uuid.uuid4()}')
 
     assert response.status_code == 204, response.status_code
+
+
+async def test_get_brands_conditional(
+    prepared_brands: list[Brand], statements: list[str]
+):
+    response = client.get(API_PREFIX)
+    etag = response.headers['etag']
+
+    assert response.headers['cache-control'] == 'public, no-cache'
+
+    statements.clear()
+    cached = client.get(API_PREFIX)
+    not_modified = client.get(API_PREFIX, headers={'If-None-Match': etag})
+
+    assert cached.json() == response.json()
+    assert cached.headers['etag'] == etag
+    assert not_modified.status_code == 304, not_modified.status_code
+    assert not_modified.content == b''
+    # Only the table version is read
+    assert not any('FROM brand' in statement for statement in statements)
+
+
+async def test_get_brands_conditional_after_write(
+    prepared_brands: list[Brand], superuser_client: AsyncClient
+):
+    etag = client.get(API_PREFIX).headers['etag']
+
+    response = await superuser_client.post(API_PREFIX, json={'name': 'Brand 0'})
+    assert response.status_code == 201, response.status_code
+
+    response = client.get(API_PREFIX, headers={'If-None-Match': etag})
+
+    assert response.status_code == 200, response.status_code
+    assert response.headers['etag'] != etag
+
+    # Writes bypassing the API are noticed too
+    async with async_session_maker.begin() as session:
+        await session.execute(update(Brand).values(name='Renamed'))
+
+    response = client.get(API_PREFIX)
+
+    assert {brand['name'] for brand in response.json()} == {'Renamed'}
+
+
+async def test_bulk_create_brands(
+    prepared_brands: list[Brand], superuser_client: AsyncClient, statements: list[str]
+):
+    names = [f'Bulk brand {i}' for i in range(2500)]
+
+    response = await superuser_client.post(
+        f'{API_PREFIX}/bulk', json=[{'name': name} for name in names]
+    )
+
+    assert response.status_code == 200, response.status_code
+    result = response.json()
+    assert [brand['name'] for brand in result['items']] == names
+    assert result['errors'] == []
+    # Rows are inserted 1000 per statement
+    assert len([s for s in statements if s.startswith('INSERT INTO brand')]) == 3
+
+    async with async_session_maker() as session:
+        db_names = set(
+            await session.scalars(select(Brand.name).where(Brand.name.in_(names)))
+        )
+    assert db_names == set(names)
+
+
+async def test_bulk_update_brands(
+    prepared_brands: list[Brand], superuser_client: AsyncClient
+):
+    first, second = prepared_brands[:2]
+    missing_id = str(uuid.uuid4())
+
+    response = await superuser_client.put(
+        f'{API_PREFIX}/bulk',
+        json=[
+            {'id': str(first.id), 'name': 'First'},
+            {'id': missing_id, 'name': 'Missing'},
+            {'id': str(second.id), 'name': 'Second'},
+            {'id': str(first.id), 'name': 'Again'},
+        ],
+    )
+
+    assert response.status_code == 200, response.status_code
+    result = response.json()
+    assert result['items'] == [
+        {'id': str(first.id), 'name': 'First'},
+        {'id': str(second.id), 'name': 'Second'},
+    ]
+    assert [error['index'] for error in result['errors']] == [1, 3]
+
+    async with async_session_maker() as session:
+        assert (await session.get(Brand, first.id)).name == 'First'
+
+
+async def test_bulk_update_brands_bad_body(superuser_client: AsyncClient):
+    response = await superuser_client.put(
+        f'{API_PREFIX}/bulk', json=[{'id': str(uuid.uuid4()), 'name': 'a'}]
+    )
+
+    assert response.status_code == 422, response.status_code
+
+
+async def test_bulk_delete_brands(
+    prepared_brands: list[Brand], superuser_client: AsyncClient
+):
+    ids = [str(brand.id) for brand in prepared_brands[:3]]
+    missing_id = str(uuid.uuid4())
+
+    response = await superuser_client.post(
+        f'{API_PREFIX}/bulk/delete', json=[*ids, missing_id]
+    )
+
+    assert response.status_code == 200, response.status_code
+    result = response.json()
+    assert result['items'] == ids
+    assert [error['index'] for error in result['errors']] == [3]
+
+    async with async_session_maker() as session:
+        count = await session.scalar(
+            select(func.count()).select_from(Brand).where(Brand.id.in_(ids))
+        )
+    assert count == 0
+
+
+async def test_bulk_create_brands_not_superuser():
+    response = client.post(f'{API_PREFIX}/bulk', json=[{'name': 'Brand'}])
+
+    assert response.status_code == 401, response.status_code
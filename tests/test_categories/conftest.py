@@ -18,3 +18,21 @@ async def prepared_category():
 
     async with async_session_maker.begin() as session:
         await session.execute(text(f'TRUNCATE TABLE {Category.__tablename__} CASCADE;'))
+
+
+@pytest.fixture(scope='function')
+async def prepared_category_chain():
+    """
+    Three nested categories: root -> child -> grandchild
+    """
+    root_category = Category(name='Напитки')
+    child_category = Category(name='Соки', parent=root_category)
+    grandchild_category = Category(name='Яблочные соки', parent=child_category)
+
+    async with async_session_maker.begin() as session:
+        session.add_all((root_category, child_category, grandchild_category))
+
+    yield root_category, child_category, grandchild_category
+
+    async with async_session_maker.begin() as session:
+        await session.execute(text(f'TRUNCATE TABLE {Category.__tablename__} CASCADE;'))
@@ -3,7 +3,11 @@ import uuid
 
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
 
+from core.repositories.category import SACategoryRepository
+from core.repositories.table_version import SATableVersionRepository
 from database.models import Category
 from tests.conftest import client, async_session_maker
 
@@ -94,6 +98,63 @@ async def test_get_category_depth_1(prepared_category: Category, url):
     assert len(category['child']) == len(prepared_category.child)
 
 
+@pytest.mark.parametrize('depth', [0, 1, 2, 5])
+async def test_get_category_subtree_depth(prepared_category_chain, depth: int):
+    root_category, child_category, grandchild_category = prepared_category_chain
+
+    response = client.get(f'{API_PREFIX}/{root_category.id}?depth={depth}')
+
+    assert response.status_code == 200, response.status_code
+
+    category = response.json()
+    expected_ids = [
+        str(child_category.id),
+        str(grandchild_category.id),
+    ]
+    for expected_id in expected_ids[:depth]:
+        assert len(category['child']) == 1
+        category = category['child'][0]
+        assert category['id'] == expected_id
+
+    assert category['child'] == []
+
+
+async def test_list_category_subtrees_in_one_query(
+    prepared_category_chain, statements: list[str]
+):
+    root_category, child_category, _ = prepared_category_chain
+
+    async with async_session_maker() as session:
+        repository = SACategoryRepository(session)
+        statements.clear()
+        categories = await repository.list(depth=2)
+
+    # The subtrees come from one recursive query after the list query
+    assert len(statements) == 2
+    categories = {category.id: category for category in categories}
+    assert [child.id for child in categories[root_category.id].child] == [
+        child_category.id
+    ]
+    assert len(categories[child_category.id].child) == 1
+
+
+async def test_get_categories_after_direct_write(prepared_category: Category):
+    response = client.get(f'{API_PREFIX}?depth=0')
+
+    assert response.status_code == 200, response.status_code
+    assert len(response.json()) == 1
+
+    # Written bypassing the API, so the in-process tree must notice
+    # the change through the table version
+    async with async_session_maker.begin() as session:
+        session.add(Category(name='Молочные продукты'))
+
+    response = client.get(f'{API_PREFIX}?depth=0')
+
+    assert response.status_code == 200, response.status_code
+    assert len(response.json()) == 2
+
+
 def test_get_bad_category():
     response = client.get(f'{API_PREFIX}/{uuid.uuid4()}')
 
@@ -267,3 +328,81 @@ async def test_delete_bad_category(superuser_client: AsyncClient):
     response = await superuser_client.delete(f'{API_PREFIX}/{uuid.uuid4()}')
 
     assert response.status_code == 204, response.status_code
+
+
+async def test_bulk_create_categories(
+    prepared_category: Category, superuser_client: AsyncClient
+):
+    missing_id = str(uuid.uuid4())
+
+    response = await superuser_client.post(
+        f'{API_PREFIX}/bulk',
+        json=[
+            {'name': 'Курица', 'parent_id': str(prepared_category.id)},
+            {'name': 'Рыба', 'parent_id': missing_id},
+            {'name': 'Овощи', 'parent_id': None},
+        ],
+    )
+
+    assert response.status_code == 200, response.status_code
+    result = response.json()
+    assert [category['name'] for category in result['items']] == ['Курица', 'Овощи']
+    assert result['errors'] == [
+        {'index': 1, 'detail': f'Category with id {missing_id} does not exist'}
+    ]
+
+    # The tree snapshot sees the new categories
+    response = client.get(f'{API_PREFIX}/{prepared_category.id}')
+    assert 'Курица' in [category['name'] for category in response.json()['child']]
+
+
+async def test_bulk_update_categories(
+    prepared_category: Category, superuser_client: AsyncClient
+):
+    child_id = str(prepared_category.child[0].id)
+
+    response = await superuser_client.put(
+        f'{API_PREFIX}/bulk',
+        json=[
+            {'id': child_id, 'name': 'Говядина', 'parent_id': None},
+            {'id': child_id, 'name': 'Сам себе', 'parent_id': child_id},
+        ],
+    )
+
+    assert response.status_code == 200, response.status_code
+    result = response.json()
+    assert result['items'] == [
+        {'id': child_id, 'name': 'Говядина', 'parent_id': None, 'child': []}
+    ]
+    assert result['errors'] == [
+        {'index': 1, 'detail': 'Category cannot be its own parent'}
+    ]
+
+
+async def test_bulk_delete_categories(
+    prepared_category: Category, superuser_client: AsyncClient
+):
+    ids = [str(category.id) for category in prepared_category.child]
+
+    response = await superuser_client.post(f'{API_PREFIX}/bulk/delete', json=ids)
+
+    assert response.status_code == 200, response.status_code
+    assert response.json() == {'items': ids, 'errors': []}
+
+    response = client.get(f'{API_PREFIX}/{prepared_category.id}')
+    assert response.json()['child'] == []
+
+
+async def test_lock_version_of_unchanged_table():
+    table_name = f'unchanged_{uuid.uuid4().hex}'
+
+    async with async_session_maker() as session, async_session_maker() as other:
+        assert await SATableVersionRepository(session).lock_version(table_name) == 0
+
+        # The version is locked even though the table has never been changed
+        await other.execute(text("SET lock_timeout = '100ms'"))
+        with pytest.raises(DBAPIError):
+            await SATableVersionRepository(other).lock_version(table_name)
+
+        await session.rollback()
+        await other.rollback()
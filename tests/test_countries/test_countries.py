@@ -3,6 +3,7 @@ import uuid
 import pytest
 from sqlalchemy import select
 
+from core.repositories.base import encode_cursor
 from database.models import Country
 from tests.conftest import client, async_session_maker
 
@@ -33,6 +34,25 @@ async def test_get_countries(offset, limit):
         assert country_data in countries
 
 
+async def test_get_countries_by_cursor():
+    async with async_session_maker() as session:
+        stmt = select(Country).order_by(Country.name, Country.id)
+        countries = await session.scalars(stmt)
+        db_countries = countries.all()
+
+    country_ids = []
+    cursor = ''
+    while cursor is not None:
+        response = client.get(API_PREFIX, params={'limit': 100, 'cursor': cursor})
+
+        assert response.status_code == 200, response.status_code
+
+        country_ids.extend(country['id'] for country in response.json())
+        cursor = response.headers.get('X-Next-Cursor')
+
+    assert country_ids == [str(country.id) for country in db_countries]
+
+
 async def test_get_country_by_id():
     async with async_session_maker() as session:
         stmt = select(Country).limit(1)
@@ -75,3 +95,76 @@ async def test_get_country_by_bad_code():
     response = client.get(f'{API_PREFIX}/code/ABD')
 
     assert response.status_code == 404, response.status_code
+
+
+async def test_get_countries_without_table_queries(statements: list[str]):
+    async with async_session_maker() as session:
+        db_country = await session.scalar(select(Country).limit(1))
+
+    # The first request may load the countries
+    client.get(API_PREFIX)
+    statements.clear()
+
+    assert client.get(API_PREFIX, params={'limit': 5, 'offset': 5}).status_code == 200
+    assert client.get(API_PREFIX, params={'cursor': ''}).status_code == 200
+    assert client.get(f'{API_PREFIX}/id/{db_country.id}').status_code == 200
+    assert client.get(f'{API_PREFIX}/code/{db_country.code}').status_code == 200
+    # Only the table version is checked
+    assert len(statements) == 4
+    assert all('table_version' in statement for statement in statements)
+
+
+async def test_get_countries_bad_cursor():
+    response = client.get(API_PREFIX, params={'cursor': 'bad'})
+
+    assert response.status_code == 400, response.status_code
+
+
+async def test_get_countries_after_direct_write():
+    client.get(API_PREFIX)
+    new_country = Country(name='Атлантида', code='XA')
+    async with async_session_maker.begin() as session:
+        session.add(new_country)
+
+    try:
+        # The write bumped the table version, the copy is reloaded
+        response = client.get(f'{API_PREFIX}/code/XA')
+        assert response.status_code == 200, response.status_code
+        assert response.json()['id'] == str(new_country.id)
+    finally:
+        async with async_session_maker.begin() as session:
+            await session.delete(new_country)
+
+    assert client.get(f'{API_PREFIX}/code/XA').status_code == 404
+
+
+async def test_get_countries_after_deleted_cursor():
+    async with async_session_maker() as session:
+        stmt = select(Country).order_by(Country.name, Country.id)
+        db_countries = (await session.scalars(stmt)).all()
+
+    # A cursor of a country that is gone is placed by the database
+    last_country = db_countries[2]
+    gone_id = uuid.UUID(int=last_country.id.int + 1)
+    cursor = encode_cursor('name', last_country.name, gone_id)
+
+    response = client.get(API_PREFIX, params={'limit': 2, 'cursor': cursor})
+
+    assert response.status_code == 200, response.status_code
+    assert [country['id'] for country in response.json()] == [
+        str(country.id) for country in db_countries[3:5]
+    ]
+
+
+async def test_get_countries_conditional():
+    response = client.get(f'{API_PREFIX}/?limit=10')
+    etag = response.headers['etag']
+
+    not_modified = client.get(
+        f'{API_PREFIX}/?limit=10', headers={'If-None-Match': etag}
+    )
+    other_page = client.get(f'{API_PREFIX}/?limit=20', headers={'If-None-Match': etag})
+
+    assert response.headers['cache-control'] == 'public, max-age=3600'
+    assert not_modified.status_code == 304, not_modified.status_code
+    assert other_page.status_code == 200, other_page.status_code
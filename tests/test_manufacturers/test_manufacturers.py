@@ -1,7 +1,9 @@
 import uuid
+from uuid import UUID
 
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import select
 
 from database.models import Manufacturer
 from tests.conftest import client, async_session_maker
@@ -24,6 +26,26 @@ def test_get_manufacturers(prepared_manufacturers: list[Manufacturer], limit, of
         assert manufacturer_data in manufacturers
 
 
+async def test_get_manufacturers_by_cursor(prepared_manufacturers: list[Manufacturer]):
+    manufacturer_ids = []
+    cursor = ''
+    while cursor is not None:
+        response = client.get(API_PREFIX, params={'limit': 8, 'cursor': cursor})
+
+        assert response.status_code == 200, response.status_code
+
+        manufacturer_ids.extend(manufacturer['id'] for manufacturer in response.json())
+        cursor = response.headers.get('X-Next-Cursor')
+
+    async with async_session_maker() as session:
+        stmt = select(Manufacturer.id).order_by(Manufacturer.name, Manufacturer.id)
+        expected_ids = (await session.scalars(stmt)).all()
+
+    assert manufacturer_ids == [
+        str(manufacturer_id) for manufacturer_id in expected_ids
+    ]
+
+
 async def test_get_manufacturer(prepared_manufacturers: list[Manufacturer]):
     manufacturer = prepared_manufacturers[0]
 
@@ -135,3 +157,31 @@ async def test_delete_bad_manufacturer(superuser_client: AsyncClient):
     response = await superuser_client.delete(f'{API_PREFIX}/{uuid.uuid4()}')
 
     assert response.status_code == 204, response.status_code
+
+
+async def test_bulk_manufacturers(
+    prepared_manufacturers: list[Manufacturer], superuser_client: AsyncClient
+):
+    response = await superuser_client.post(
+        f'{API_PREFIX}/bulk', json=[{'name': 'New manufacturer'}]
+    )
+    assert response.status_code == 200, response.status_code
+    (created,) = response.json()['items']
+
+    response = await superuser_client.put(
+        f'{API_PREFIX}/bulk', json=[{'id': created['id'], 'name': 'Renamed'}]
+    )
+    assert response.status_code == 200, response.status_code
+    assert response.json()['items'] == [{'id': created['id'], 'name': 'Renamed'}]
+
+    response = await superuser_client.post(
+        f'{API_PREFIX}/bulk/delete', json=[created['id'], created['id']]
+    )
+    assert response.status_code == 200, response.status_code
+    assert response.json()['items'] == [created['id']]
+    assert response.json()['errors'] == [
+        {'index': 1, 'detail': f'Duplicate id {created["id"]}'}
+    ]
+
+    async with async_session_maker() as session:
+        assert await session.get(Manufacturer, UUID(created['id'])) is None
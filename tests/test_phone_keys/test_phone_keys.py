@@ -1,6 +1,8 @@
+import asyncio
 from datetime import datetime, timedelta
 
 import pytest
+from httpx import AsyncClient
 from sqlalchemy import select
 
 from database.models import PhoneKey
@@ -46,6 +48,17 @@ async def test_create_rate_limit():
     assert response.status_code == 429
 
 
+async def test_create_rate_limit_concurrent(ac: AsyncClient):
+    body = {'phone': '+70000000001'}
+
+    responses = await asyncio.gather(
+        *(ac.post(f'{API_PREFIX}/', json=body) for _ in range(6))
+    )
+
+    status_codes = sorted(response.status_code for response in responses)
+    assert status_codes == [201, 201, 201, 429, 429, 429]
+
+
 async def test_create_success():
     body = {'phone': '+79307229334'}
 
@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from core.rate_limiters.postgres import SARateLimiter
+from core.sweeper import PhoneKeySweeper
+from database.models import PhoneKey, RateLimitCounter
+from tests.conftest import async_session_maker
+
+
+async def test_sweep():
+    now = datetime.utcnow()
+    phone_keys = [
+        PhoneKey(key=f'expired_{i}', phone='+79000000001', expires_at=now)
+        for i in range(5)
+    ]
+    phone_keys.append(
+        PhoneKey(
+            key='used',
+            phone='+79000000001',
+            expires_at=now + timedelta(minutes=10),
+            is_verified=True,
+            is_used=True,
+        )
+    )
+    phone_keys.append(
+        PhoneKey(
+            key='alive', phone='+79000000001', expires_at=now + timedelta(minutes=15)
+        )
+    )
+
+    async with async_session_maker.begin() as session:
+        session.add_all(phone_keys)
+    await SARateLimiter(async_session_maker).hit('test:sweep', limit=1, window=1e-6)
+
+    sweeper = PhoneKeySweeper(async_session_maker, batch_size=2)
+    deleted = await sweeper.sweep()
+
+    async with async_session_maker.begin() as session:
+        keys = await session.scalars(
+            select(PhoneKey.key).where(PhoneKey.phone == '+79000000001')
+        )
+        assert keys.all() == ['alive']
+
+        counters = await session.scalars(
+            select(RateLimitCounter).where(RateLimitCounter.key == 'test:sweep')
+        )
+        assert counters.all() == []
+
+        await session.execute(
+            PhoneKey.__table__.delete().where(PhoneKey.phone == '+79000000001')
+        )
+
+    # Keys left by other tests may be swept as well
+    assert deleted >= 6
+    assert sweeper.deleted.value == deleted
+    assert sweeper.counters_deleted.value >= 1
+    assert sweeper.lag.value == 0
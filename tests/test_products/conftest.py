@@ -0,0 +1,108 @@
+import pytest
+from sqlalchemy import text, select
+
+from database.models import Brand, Category, Country, Manufacturer, Product, User
+from tests.conftest import async_session_maker
+
+
+@pytest.fixture(scope='function')
+async def prepared_products() -> list[Product]:
+    """
+    Products of a root category and its subcategory, the last two of them
+    are out of stock and inactive respectively
+    """
+    root_category = Category(name='Молочные продукты')
+    child_category = Category(name='Сыры', parent=root_category)
+    brand = Brand(name='Brand')
+    manufacturer = Manufacturer(name='Manufacturer')
+
+    async with async_session_maker.begin() as session:
+        country = await session.scalar(select(Country).where(Country.code == 'RU'))
+
+        products = list()
+        for i in range(1, 11):
+            products.append(
+                Product(
+                    name=f'Product {i}',
+                    description='Description',
+                    price=i * 10,
+                    original_price=i * 10,
+                    discount=i % 3,
+                    stock=5,
+                    is_active=True,
+                    volume=1,
+                    volume_type='items',
+                    brand=brand if i % 2 else None,
+                    manufacturer=manufacturer,
+                    manufacturing_country=country,
+                    category=child_category if i > 5 else root_category,
+                )
+            )
+        products[-2].stock = 0
+        products[-1].is_active = False
+
+        session.add_all(products)
+
+    yield products
+
+    async with async_session_maker.begin() as session:
+        for table in (Product, Category, Brand, Manufacturer):
+            await session.execute(
+                text(f'TRUNCATE TABLE {table.__tablename__} CASCADE;')
+            )
+
+
+@pytest.fixture(scope='function')
+async def prepared_many_products() -> list[Product]:
+    """
+    100 active products of 10 brands, 5 manufacturers and 4 categories
+    """
+    categories = [Category(name=f'Category {i}') for i in range(4)]
+    brands = [Brand(name=f'Brand {i}') for i in range(10)]
+    manufacturers = [Manufacturer(name=f'Manufacturer {i}') for i in range(5)]
+
+    async with async_session_maker.begin() as session:
+        countries = (await session.scalars(select(Country).limit(3))).all()
+
+        products = list()
+        for i in range(100):
+            products.append(
+                Product(
+                    name=f'Product {i}',
+                    description='Description',
+                    price=i + 1,
+                    original_price=i + 1,
+                    discount=0,
+                    stock=1,
+                    is_active=True,
+                    volume=1,
+                    volume_type='items',
+                    brand=brands[i % len(brands)],
+                    manufacturer=manufacturers[i % len(manufacturers)],
+                    manufacturing_country=countries[i % len(countries)],
+                    category=categories[i % len(categories)],
+                )
+            )
+
+        session.add_all(products)
+
+    yield products
+
+    async with async_session_maker.begin() as session:
+        for table in (Product, Category, Brand, Manufacturer):
+            await session.execute(
+                text(f'TRUNCATE TABLE {table.__tablename__} CASCADE;')
+            )
+
+
+@pytest.fixture(scope='function')
+async def prepared_customer() -> User:
+    customer = User(phone='customer', hashed_password='customer')
+
+    async with async_session_maker.begin() as session:
+        session.add(customer)
+
+    yield customer
+
+    async with async_session_maker.begin() as session:
+        await session.delete(customer)
@@ -0,0 +1,178 @@
+import json
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select, text
+
+from database.models import Product, ProductImport
+from tests.conftest import async_session_maker, client
+
+API_PREFIX = '/products/imports'
+
+HEADER = (
+    'sku,name,description,price,original_price,discount,stock,is_active,'
+    'volume,volume_type,brand,manufacturer,country,category_id'
+)
+
+
+@pytest.fixture(scope='function')
+async def cleanup_imports():
+    yield
+
+    async with async_session_maker.begin() as session:
+        await session.execute(text('TRUNCATE TABLE product_import CASCADE;'))
+
+
+def make_csv(products: list[Product], price: int = 100) -> str:
+    category_id = products[0].category_id
+    return '\n'.join(
+        [
+            HEADER,
+            f'A-1,Cheese,Hard cheese,{price},120,0,5,true,1,kg,Brand,,RU,{category_id}',
+            # A quoted value spanning lines
+            f'A-2,Milk,"Fresh\nmilk",50,50,0,10,1,1,l,,Manufacturer,ru,{category_id}',
+            f'A-3,Bread,,40,40,0,1,true,1,items,Unknown,,RU,{category_id}',
+            f'A-4,Butter,,-1,40,0,1,true,1,items,,,RU,{category_id}',
+        ]
+    )
+
+
+async def upload(client: AsyncClient, filename: str, content: str) -> dict:
+    response = await client.post(
+        API_PREFIX, files={'file': (filename, content.encode(), 'text/csv')}
+    )
+    assert response.status_code == 202, response.json()
+
+    # The import runs in a background task before the response is complete
+    response = await client.get(f'{API_PREFIX}/{response.json()["id"]}')
+    assert response.status_code == 200, response.status_code
+    return response.json()
+
+
+async def test_import_products(
+    prepared_products: list[Product],
+    superuser_client: AsyncClient,
+    cleanup_imports,
+):
+    product_import = await upload(
+        superuser_client, 'catalog.csv', make_csv(prepared_products)
+    )
+
+    assert product_import['status'] == 'done', product_import['error']
+    assert product_import['rows_read'] == 4
+    assert product_import['rows_failed'] == 2
+    assert product_import['inserted'] == 2
+    assert product_import['updated'] == 0
+    assert [error['line'] for error in product_import['errors']] == [5, 6]
+    assert product_import['errors'][0]['detail'] == 'Brand "Unknown" does not exist'
+    assert product_import['errors'][1]['detail'].startswith('price: ')
+
+    async with async_session_maker() as session:
+        products = {
+            product.sku: product
+            for product in await session.scalars(
+                select(Product).where(Product.sku.is_not(None))
+            )
+        }
+
+    assert products.keys() == {'A-1', 'A-2'}
+    assert products['A-1'].brand_id is not None
+    assert products['A-2'].description == 'Fresh\nmilk'
+    assert products['A-2'].volume_type == 'l'
+
+    # Unchanged rows are not written again, changed ones are updated
+    product_import = await upload(
+        superuser_client, 'catalog.csv', make_csv(prepared_products, price=90)
+    )
+
+    assert product_import['status'] == 'done', product_import['error']
+    assert product_import['inserted'] == 0
+    assert product_import['updated'] == 1
+    assert product_import['unchanged'] == 1
+
+    async with async_session_maker() as session:
+        price = await session.scalar(select(Product.price).where(Product.sku == 'A-1'))
+
+    assert price == 90
+
+
+async def test_import_products_jsonl(
+    prepared_products: list[Product],
+    superuser_client: AsyncClient,
+    cleanup_imports,
+):
+    row = {
+        'sku': 'B-1',
+        'name': 'Kefir',
+        'price': 70.5,
+        'original_price': 70.5,
+        'stock': 3,
+        'volume': 0.5,
+        'volume_type': 'l',
+        'country': 'RU',
+        'category_id': str(prepared_products[0].category_id),
+    }
+    # The last row of a sku wins
+    content = '\n'.join(
+        [json.dumps(row), 'not json', '', json.dumps({**row, 'name': 'Kefir 1%'})]
+    )
+
+    product_import = await upload(superuser_client, 'catalog.jsonl', content)
+
+    assert product_import['status'] == 'done', product_import['error']
+    assert product_import['rows_read'] == 3
+    assert product_import['rows_failed'] == 1
+    assert product_import['errors'][0]['line'] == 2
+    assert product_import['inserted'] == 1
+
+    async with async_session_maker() as session:
+        name = await session.scalar(select(Product.name).where(Product.sku == 'B-1'))
+
+    assert name == 'Kefir 1%'
+
+
+async def test_import_products_missing_columns(
+    superuser_client: AsyncClient, cleanup_imports
+):
+    product_import = await upload(superuser_client, 'catalog.csv', 'sku,name\nA,B')
+
+    assert product_import['status'] == 'failed'
+    assert product_import['error'].startswith('Columns category_id, country, ')
+
+    async with async_session_maker() as session:
+        tables = await session.scalar(
+            text(
+                'SELECT count(*) FROM pg_tables '
+                "WHERE tablename ~ '^product_import_[0-9a-f]{32}$'"
+            )
+        )
+
+    # The staging table is dropped
+    assert tables == 0
+
+
+async def test_import_products_bad_file(superuser_client: AsyncClient, cleanup_imports):
+    response = await superuser_client.post(
+        API_PREFIX, files={'file': ('catalog.xlsx', b'data', 'application/zip')}
+    )
+
+    assert response.status_code == 400, response.status_code
+
+    async with async_session_maker() as session:
+        assert await session.scalar(select(ProductImport.id)) is None
+
+
+async def test_import_products_not_superuser():
+    response = client.post(
+        API_PREFIX, files={'file': ('catalog.csv', HEADER.encode(), 'text/csv')}
+    )
+
+    assert response.status_code == 401, response.status_code
+
+
+async def test_get_product_import_not_found(superuser_client: AsyncClient):
+    response = await superuser_client.get(
+        f'{API_PREFIX}/00000000-0000-0000-0000-000000000000'
+    )
+
+    assert response.status_code == 404, response.status_code
@@ -0,0 +1,228 @@
+import uuid
+
+import pytest
+from httpx import AsyncClient
+
+from core.entities.product import ProductFilter
+from core.repositories.product import ProductSARepository
+from database.models import Product, User
+from tests.conftest import client, async_session_maker, get_auth_headers
+
+API_PREFIX = '/products'
+
+
+def get_all_pages(params: dict) -> list[dict]:
+    products = []
+    cursor = None
+    while True:
+        response = client.get(API_PREFIX, params={**params, 'cursor': cursor})
+
+        assert response.status_code == 200, response.status_code
+
+        products.extend(response.json())
+        cursor = response.headers.get('X-Next-Cursor')
+        if cursor is None:
+            return products
+
+
+@pytest.mark.parametrize('limit', [1, 3, 20])
+@pytest.mark.parametrize('sort', ['price', '-price', 'discount', '-discount', 'name'])
+async def test_get_products_by_cursor(prepared_products: list[Product], limit, sort):
+    products = get_all_pages({'limit': limit, 'sort': sort})
+
+    active_products = [product for product in prepared_products if product.is_active]
+    sort_key = sort.removeprefix('-')
+    expected_products = sorted(
+        active_products,
+        key=lambda product: (getattr(product, sort_key), product.id),
+        reverse=sort.startswith('-'),
+    )
+
+    assert [product['id'] for product in products] == [
+        str(product.id) for product in expected_products
+    ]
+
+
+async def test_get_products_by_category(prepared_products: list[Product]):
+    root_category = prepared_products[0].category
+    child_category = prepared_products[-1].category
+
+    root_products = get_all_pages({'category_id': str(root_category.id)})
+    child_products = get_all_pages({'category_id': str(child_category.id)})
+    unknown_products = get_all_pages({'category_id': str(uuid.uuid4())})
+
+    # Products of subcategories are included
+    assert len(root_products) == 9
+    assert len(child_products) == 4
+    assert unknown_products == []
+    assert all(
+        product['category']['id'] == str(child_category.id)
+        for product in child_products
+    )
+
+
+@pytest.mark.parametrize(
+    'params, expected_names',
+    [
+        ({'min_price': 20, 'max_price': 40}, ['Product 2', 'Product 3', 'Product 4']),
+        ({'in_stock': True, 'min_price': 80}, ['Product 8']),
+        ({'in_stock': False}, ['Product 9']),
+    ],
+)
+async def test_get_products_filtered(
+    prepared_products: list[Product], params, expected_names
+):
+    products = get_all_pages(params)
+
+    assert [product['name'] for product in products] == expected_names
+
+
+async def test_get_inactive_products(
+    prepared_products: list[Product], superuser_headers: dict
+):
+    response = client.get(
+        API_PREFIX, params={'is_active': False}, headers=superuser_headers
+    )
+
+    assert response.status_code == 200, response.status_code
+    assert [product['name'] for product in response.json()] == ['Product 10']
+
+
+@pytest.mark.parametrize('authorized', [False, True])
+async def test_get_inactive_products_not_superuser(
+    prepared_products: list[Product], prepared_customer: User, authorized: bool
+):
+    headers = get_auth_headers(prepared_customer) if authorized else {}
+    response = client.get(API_PREFIX, params={'is_active': False}, headers=headers)
+
+    assert response.status_code == 401, response.status_code
+
+
+@pytest.mark.parametrize(
+    'caller, status_code',
+    [('anonymous', 404), ('customer', 404), ('superuser', 200)],
+)
+async def test_get_inactive_product(
+    prepared_products: list[Product],
+    prepared_customer: User,
+    superuser_headers: dict,
+    caller: str,
+    status_code: int,
+):
+    headers = {
+        'anonymous': {},
+        'customer': get_auth_headers(prepared_customer),
+        'superuser': superuser_headers,
+    }[caller]
+
+    response = client.get(f'{API_PREFIX}/{prepared_products[-1].id}', headers=headers)
+
+    assert response.status_code == status_code, response.status_code
+
+
+async def test_get_products_by_brand(prepared_products: list[Product]):
+    brand = prepared_products[0].brand
+
+    products = get_all_pages({'brand_id': str(brand.id)})
+
+    assert [product['name'] for product in products] == [
+        'Product 1',
+        'Product 3',
+        'Product 5',
+        'Product 7',
+        'Product 9',
+    ]
+    assert all(product['brand']['id'] == str(brand.id) for product in products)
+
+
+async def test_get_products_bad_cursor(prepared_products: list[Product]):
+    response = client.get(API_PREFIX, params={'limit': 1, 'sort': 'price'})
+    cursor = response.headers['X-Next-Cursor']
+
+    response = client.get(API_PREFIX, params={'sort': 'name', 'cursor': cursor})
+
+    assert response.status_code == 400, response.status_code
+
+
+async def test_get_product(prepared_products: list[Product]):
+    product = prepared_products[1]
+
+    response = client.get(f'{API_PREFIX}/{product.id}')
+
+    assert response.status_code == 200, response.status_code
+
+    product_data = response.json()
+
+    assert product_data['id'] == str(product.id)
+    assert product_data['price'] == 20
+    assert product_data['brand'] is None
+    assert product_data['manufacturer']['id'] == str(product.manufacturer_id)
+    assert product_data['manufacturing_country']['code'] == 'RU'
+    assert product_data['category'] == {
+        'id': str(product.category_id),
+        'name': 'Молочные продукты',
+        'parent_id': None,
+        'child': [],
+    }
+
+
+async def test_get_bad_product():
+    response = client.get(f'{API_PREFIX}/{uuid.uuid4()}')
+
+    assert response.status_code == 404, response.status_code
+
+
+@pytest.mark.parametrize('limit', [5, 50])
+async def test_get_products_query_count(
+    prepared_many_products: list[Product], statements: list[str], limit
+):
+    response = client.get(API_PREFIX, params={'limit': limit})
+
+    assert response.status_code == 200, response.status_code
+    assert len(response.json()) == limit
+    assert all(product['brand'] is not None for product in response.json())
+
+    # All relations are joined to the products query
+    assert len(statements) == 1, statements
+
+
+async def test_product_repository_loads_relations(
+    prepared_many_products: list[Product], statements: list[str]
+):
+    async with async_session_maker() as session:
+        repository = ProductSARepository(session)
+        page = await repository.list_filtered(ProductFilter(), limit=100)
+
+    # All relations are joined to the products query
+    assert len(page.items) == 100
+    assert len(statements) == 1, statements
+    for product in page.items:
+        for relation in ('brand', 'manufacturer', 'manufacturing_country', 'category'):
+            related = getattr(product, relation)
+            assert related.id == getattr(product, f'{relation}_id')
+
+
+@pytest.mark.parametrize(
+    'url, column',
+    [
+        ('/brands', 'brand_id'),
+        ('/test_manufacturers', 'manufacturer_id'),
+        ('/categories', 'category_id'),
+    ],
+)
+async def test_bulk_delete_referenced_by_products(
+    prepared_products: list[Product], superuser_client: AsyncClient, url, column
+):
+    used_id = str(getattr(prepared_products[0], column))
+    missing_id = str(uuid.uuid4())
+
+    response = await superuser_client.post(
+        f'{url}/bulk/delete', json=[used_id, missing_id]
+    )
+
+    # Records in use are reported, the rest of the batch goes on
+    assert response.status_code == 200, response.text
+    result = response.json()
+    assert result['items'] == []
+    assert [error['index'] for error in result['errors']] == [0, 1]
+    assert result['errors'][0]['detail'].endswith('is used by product')
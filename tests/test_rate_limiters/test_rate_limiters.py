@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+
+from core.rate_limiters.base import RateLimiterBase
+from core.rate_limiters.memory import MemoryRateLimiter
+from core.rate_limiters.postgres import SARateLimiter
+from tests.conftest import async_session_maker
+
+
+@pytest.fixture(params=['postgres', 'memory'])
+def rate_limiter(request) -> RateLimiterBase:
+    if request.param == 'postgres':
+        return SARateLimiter(async_session_maker)
+    return MemoryRateLimiter()
+
+
+async def test_rate_limiter_limit(rate_limiter: RateLimiterBase):
+    results = [
+        await rate_limiter.hit('test:limit', limit=3, window=60) for _ in range(5)
+    ]
+
+    assert results == [True, True, True, False, False]
+    # Other keys have their own limit
+    assert await rate_limiter.hit('test:other', limit=3, window=60)
+
+
+async def test_rate_limiter_concurrent_hits(rate_limiter: RateLimiterBase):
+    results = await asyncio.gather(
+        *(rate_limiter.hit('test:concurrent', limit=3, window=60) for _ in range(10))
+    )
+
+    assert results.count(True) == 3
+
+
+async def test_memory_rate_limiter_sliding_window():
+    rate_limiter = MemoryRateLimiter()
+
+    assert await rate_limiter.hit('test:window', limit=1, window=0.1)
+    assert not await rate_limiter.hit('test:window', limit=1, window=0.1)
+
+    await asyncio.sleep(0.1)
+
+    assert await rate_limiter.hit('test:window', limit=1, window=0.1)
+
+
+async def test_rate_limiter_reset(rate_limiter: RateLimiterBase):
+    assert await rate_limiter.hit('test:reset', limit=1, window=60)
+    assert not await rate_limiter.hit('test:reset', limit=1, window=60)
+
+    await rate_limiter.reset('test:reset')
+
+    assert await rate_limiter.hit('test:reset', limit=1, window=60)
@@ -0,0 +1,82 @@
+import gzip
+
+import brotli
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from api.compression import CompressionMiddleware
+
+BODY = b'{"name": "' + b'a' * 5000 + b'"}'
+
+
+def make_client(**kwargs) -> TestClient:
+    app = FastAPI()
+
+    @app.get('/large')
+    async def get_large():
+        return Response(BODY, media_type='application/json', headers={'etag': '"1"'})
+
+    @app.get('/small')
+    async def get_small():
+        return Response(BODY[:100], media_type='application/json')
+
+    @app.get('/image')
+    async def get_image():
+        return Response(BODY, media_type='image/webp')
+
+    @app.get('/stream')
+    async def get_stream():
+        return StreamingResponse(iter([BODY, BODY]), media_type='application/json')
+
+    app.add_middleware(CompressionMiddleware, **kwargs)
+    return TestClient(app)
+
+
+@pytest.mark.parametrize(
+    'accept_encoding, encoding, decompress',
+    [
+        ('gzip, br', 'br', brotli.decompress),
+        ('gzip', 'gzip', gzip.decompress),
+        ('br;q=0, gzip', 'gzip', gzip.decompress),
+    ],
+)
+@pytest.mark.parametrize('thread_size', [0, 1024 * 1024])
+def test_compression(accept_encoding: str, encoding: str, decompress, thread_size):
+    client = make_client(thread_size=thread_size)
+
+    # The second response comes from the cache of compressed bodies
+    for _ in range(2):
+        with client.stream(
+            'GET', '/large', headers={'Accept-Encoding': accept_encoding}
+        ) as response:
+            body = b''.join(response.iter_raw())
+
+        assert response.headers['content-encoding'] == encoding
+        assert response.headers['vary'] == 'Accept-Encoding'
+        assert response.headers['etag'] == 'W/"1"'
+        assert int(response.headers['content-length']) == len(body)
+        assert decompress(body) == BODY
+
+
+@pytest.mark.parametrize(
+    'url, accept_encoding, vary',
+    [
+        # Another client may get the response compressed
+        ('/large', 'identity', 'Accept-Encoding'),
+        ('/large', '', 'Accept-Encoding'),
+        ('/small', 'gzip, br', None),
+        ('/image', 'gzip, br', None),
+        ('/stream', 'gzip, br', None),
+    ],
+)
+def test_compression_skipped(url: str, accept_encoding: str, vary: str | None):
+    client = make_client(minimum_size=1024)
+
+    response = client.get(url, headers={'Accept-Encoding': accept_encoding})
+
+    assert response.status_code == 200, response.status_code
+    assert 'content-encoding' not in response.headers
+    assert response.headers.get('vary') == vary
+    assert response.content.startswith(BODY[:100])
@@ -0,0 +1,107 @@
+import uuid
+from decimal import Decimal
+
+import pytest
+from fastapi import APIRouter, FastAPI, Response
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.testclient import TestClient
+from pydantic import BaseModel, field_validator
+
+from api.responses import EntityRoute, entity_matches_schema
+from api.schemas.category import CategoryRead
+from api.schemas.product import ProductRead
+from core.entities.category import CategoryEntity
+from core.entities.product import ProductEntity
+
+ROOT = CategoryEntity(
+    id=uuid.uuid4(),
+    name='Молоко',
+    parent_id=None,
+    child=[
+        CategoryEntity(id=uuid.uuid4(), name=f'Сыр {i}', parent_id=None, child=[])
+        for i in range(3)
+    ],
+)
+
+
+class PriceEntity(BaseModel):
+    price: Decimal
+
+
+class PriceRead(BaseModel):
+    price: float
+
+
+class NameEntity(BaseModel):
+    name: str | None
+
+
+class NameRead(BaseModel):
+    name: str
+
+
+class CheckedNameRead(BaseModel):
+    name: str | None
+
+    @field_validator('name')
+    @classmethod
+    def check_name(cls, name: str | None) -> str | None:
+        return name
+
+
+def make_client(response_class: type[Response]) -> TestClient:
+    router = APIRouter(route_class=EntityRoute)
+
+    @router.get('/categories', response_model=list[CategoryRead])
+    async def get_categories(response: Response, empty: bool = False):
+        response.headers['X-Next-Cursor'] = 'next'
+        return [] if empty else [ROOT, ROOT.child[0]]
+
+    @router.post('/categories', response_model=CategoryRead, status_code=201)
+    async def create_category():
+        return ROOT
+
+    @router.get('/prices', response_model=list[PriceRead])
+    async def get_prices():
+        return [PriceEntity(price=Decimal('1.50'))]
+
+    app = FastAPI(default_response_class=response_class)
+    app.include_router(router)
+    return TestClient(app)
+
+
+@pytest.mark.parametrize(
+    'entity, schema, matches',
+    [
+        (CategoryEntity, CategoryRead, True),
+        (ProductEntity, ProductRead, False),
+        (PriceEntity, PriceRead, False),
+        # None would be written instead of failing validation
+        (NameEntity, NameRead, False),
+        # Validators of the schema would be skipped
+        (NameEntity, CheckedNameRead, False),
+    ],
+)
+def test_entity_matches_schema(entity, schema, matches: bool):
+    assert entity_matches_schema(entity, schema) is matches
+
+
+@pytest.mark.parametrize(
+    'method, url',
+    [
+        ('GET', '/categories'),
+        ('GET', '/categories?empty=true'),
+        ('POST', '/categories'),
+        ('GET', '/prices'),
+    ],
+)
+def test_entity_route(method: str, url: str):
+    expected = make_client(JSONResponse).request(method, url)
+    response = make_client(ORJSONResponse).request(method, url)
+
+    assert response.status_code == expected.status_code
+    assert response.headers['content-type'] == 'application/json'
+    assert response.headers.get('x-next-cursor') == expected.headers.get(
+        'x-next-cursor'
+    )
+    assert response.json() == expected.json()
@@ -0,0 +1,80 @@
+import json
+import uuid
+from pathlib import Path
+
+from sqlalchemy import func, select
+
+from database.models import Brand, Category, Country
+from database.seed import REFERENCE_TABLES, read_file, read_pycountry, seed_table
+from tests.conftest import engine_test
+
+
+async def test_seed_countries():
+    async with engine_test.connect() as connection:
+        reference_table = REFERENCE_TABLES['countries']
+        records = [reference_table.parse(record) for record in read_pycountry()]
+        countries = await connection.scalar(select(func.count()).select_from(Country))
+
+        # The test database is seeded with the same countries
+        assert await seed_table(connection, reference_table, records) == (0, 0)
+
+        changed = [('RU', 'Россия'), ('XA', 'Атлантида'), ('XA', 'Атлантида 2')]
+        assert await seed_table(connection, reference_table, changed) == (1, 1)
+
+        names = dict(
+            (await connection.execute(select(Country.code, Country.name))).all()
+        )
+        assert names['RU'] == 'Россия'
+        assert names['XA'] == 'Атлантида 2'
+        assert len(names) == countries + 1
+
+        await connection.rollback()
+
+
+async def test_seed_from_files(tmp_path: Path):
+    brands_path = tmp_path / 'brands.csv'
+    brands_path.write_text('name\nSeed brand 1\nSeed brand 2\nSeed brand 1\n')
+
+    root_id, child_id = uuid.uuid4(), uuid.uuid4()
+    categories_path = tmp_path / 'categories.json'
+    categories_path.write_text(
+        json.dumps(
+            [
+                {'id': str(child_id), 'name': 'Child', 'parent_id': str(root_id)},
+                {'id': str(root_id), 'name': 'Root', 'parent_id': None},
+            ]
+        )
+    )
+
+    async with engine_test.connect() as connection:
+        for _ in range(2):
+            brands = [
+                REFERENCE_TABLES['brands'].parse(record)
+                for record in read_file(brands_path)
+            ]
+            categories = [
+                REFERENCE_TABLES['categories'].parse(record)
+                for record in read_file(categories_path)
+            ]
+            brands_result = await seed_table(
+                connection, REFERENCE_TABLES['brands'], brands
+            )
+            categories_result = await seed_table(
+                connection, REFERENCE_TABLES['categories'], categories
+            )
+
+        # The second run changes nothing
+        assert brands_result == (0, 0)
+        assert categories_result == (0, 0)
+
+        brand_names = await connection.scalars(
+            select(Brand.name).where(Brand.name.startswith('Seed brand'))
+        )
+        assert sorted(brand_names) == ['Seed brand 1', 'Seed brand 2']
+
+        child = (
+            await connection.execute(select(Category).where(Category.id == child_id))
+        ).one()
+        assert child.parent_id == root_id
+
+        await connection.rollback()
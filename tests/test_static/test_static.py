@@ -0,0 +1,116 @@
+import gzip
+import os
+from pathlib import Path
+
+import pytest
+from starlette.applications import Starlette
+from starlette.routing import Mount
+from starlette.testclient import TestClient
+
+from api.static import CachedStaticFiles, parse_range
+
+CONTENT = bytes(range(256)) * 4
+
+
+@pytest.fixture
+def static_dir(tmp_path: Path) -> Path:
+    (tmp_path / 'file.bin').write_bytes(CONTENT)
+    (tmp_path / 'app.js').write_text('console.log(1)')
+    (tmp_path / 'app.js.gz').write_bytes(gzip.compress(b'console.log(1)'))
+    return tmp_path
+
+
+@pytest.fixture
+def static_client(static_dir: Path) -> TestClient:
+    app = Starlette(routes=[Mount('/static', CachedStaticFiles(directory=static_dir))])
+    return TestClient(app)
+
+
+def test_static_etag(static_client: TestClient, static_dir: Path):
+    response = static_client.get('/static/file.bin')
+
+    assert response.status_code == 200
+    assert response.content == CONTENT
+    etag = response.headers['etag']
+    assert not etag.startswith('W/')
+
+    response = static_client.get('/static/file.bin', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.headers['etag'] == etag
+
+    # A changed file gets a new ETag
+    (static_dir / 'file.bin').write_bytes(CONTENT[::-1])
+    os.utime(static_dir / 'file.bin', ns=(0, 10**18))
+    response = static_client.get('/static/file.bin', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.content == CONTENT[::-1]
+    assert response.headers['etag'] != etag
+
+
+@pytest.mark.parametrize(
+    'range_header, status_code, content_range, content',
+    [
+        ('bytes=0-9', 206, 'bytes 0-9/1024', CONTENT[:10]),
+        ('bytes=1000-', 206, 'bytes 1000-1023/1024', CONTENT[1000:]),
+        ('bytes=-4', 206, 'bytes 1020-1023/1024', CONTENT[-4:]),
+        ('bytes=1000-5000', 206, 'bytes 1000-1023/1024', CONTENT[1000:]),
+        ('bytes=2000-', 416, 'bytes */1024', b''),
+        ('bytes=0-1,5-6', 200, None, CONTENT),
+        ('items=0-1', 200, None, CONTENT),
+    ],
+)
+def test_static_range(
+    static_client: TestClient,
+    range_header: str,
+    status_code: int,
+    content_range: str | None,
+    content: bytes,
+):
+    response = static_client.get('/static/file.bin', headers={'Range': range_header})
+
+    assert response.status_code == status_code
+    assert response.headers.get('content-range') == content_range
+    assert response.content == content
+
+
+def test_static_if_range(static_client: TestClient):
+    etag = static_client.head('/static/file.bin').headers['etag']
+
+    response = static_client.get(
+        '/static/file.bin', headers={'Range': 'bytes=0-9', 'If-Range': etag}
+    )
+    assert response.status_code == 206
+
+    response = static_client.get(
+        '/static/file.bin', headers={'Range': 'bytes=0-9', 'If-Range': '"old"'}
+    )
+    assert response.status_code == 200
+    assert response.content == CONTENT
+
+
+@pytest.mark.parametrize(
+    'accept_encoding, content_encoding',
+    [('gzip, br', 'gzip'), ('br', None), ('gzip;q=0', None), ('identity', None)],
+)
+def test_static_precompressed(
+    static_client: TestClient, accept_encoding: str, content_encoding: str | None
+):
+    response = static_client.get(
+        '/static/app.js', headers={'Accept-Encoding': accept_encoding}
+    )
+
+    assert response.status_code == 200
+    assert response.headers.get('content-encoding') == content_encoding
+    assert response.headers['vary'] == 'Accept-Encoding'
+    assert response.headers['content-type'].startswith('text/javascript')
+    # The client decodes the gzip sibling
+    assert response.text == 'console.log(1)'
+
+
+def test_parse_range():
+    assert parse_range('bytes=5-', 10) == (5, 9)
+    assert parse_range('bytes=-20', 10) == (0, 9)
+    assert parse_range('bytes=a-b', 10) is None
+    assert parse_range('bytes=5-4', 10) is None
+    with pytest.raises(ValueError):
+        parse_range('bytes=-0', 10)
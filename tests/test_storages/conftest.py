@@ -0,0 +1,158 @@
+import uuid
+from pathlib import Path
+from xml.etree import ElementTree
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+from core.storages.base import FileStorageBase
+from core.storages.local import LocalFileStorage
+from core.storages.s3 import S3FileStorage
+
+BUCKET = 'test-bucket'
+# Headers an object is stored with and served with
+OBJECT_HEADERS = ('content-type', 'cache-control')
+
+
+class S3StandIn:
+    """
+    In-memory S3-compatible API with the calls used by `S3FileStorage`,
+    like a local MinIO
+    """
+
+    def __init__(self):
+        self.objects: dict[str, bytes] = {}
+        self.object_headers: dict[str, dict[str, str]] = {}
+        self.uploads: dict[str, dict[int, bytes]] = {}
+        self.upload_headers: dict[str, dict[str, str]] = {}
+        self.fail_reads = False
+        self.app = Starlette(
+            routes=[
+                Route(
+                    '/{bucket}/{key:path}',
+                    self.handle,
+                    methods=['GET', 'HEAD', 'PUT', 'POST', 'DELETE'],
+                )
+            ]
+        )
+
+    async def handle(self, request: Request) -> Response:
+        authorization = request.headers.get('authorization', '')
+        if not authorization.startswith('AWS4-HMAC-SHA256'):
+            return Response(status_code=403)
+        if request.path_params['bucket'] != BUCKET:
+            return Response(status_code=404)
+
+        # Headers the object is stored with must be signed
+        signed_headers = authorization.split('SignedHeaders=')[1].split(',')[0]
+        headers = {
+            name: request.headers[name]
+            for name in OBJECT_HEADERS
+            if name in request.headers
+        }
+        if not set(headers) <= set(signed_headers.split(';')):
+            return Response(status_code=403)
+
+        key = request.path_params['key']
+        params = request.query_params
+        body = await request.body()
+
+        if request.method == 'POST' and 'uploads' in params:
+            upload_id = uuid.uuid4().hex
+            self.uploads[upload_id] = {}
+            self.upload_headers[upload_id] = headers
+            return Response(
+                '<InitiateMultipartUploadResult '
+                'xmlns="http://s3.amazonaws.com/doc/2006-03-01/">'
+                f'<UploadId>{upload_id}</UploadId></InitiateMultipartUploadResult>'
+            )
+        if request.method == 'POST':
+            parts = self.uploads.pop(params['uploadId'])
+            numbers = [
+                int(part.findtext('PartNumber'))
+                for part in ElementTree.fromstring(body).iter('Part')
+            ]
+            self.objects[key] = b''.join(parts[number] for number in numbers)
+            self.object_headers[key] = self.upload_headers.pop(params['uploadId'])
+            return Response('<CompleteMultipartUploadResult/>')
+        if request.method == 'PUT' and 'partNumber' in params:
+            self.uploads[params['uploadId']][int(params['partNumber'])] = body
+            return Response(headers={'etag': f'"{uuid.uuid4().hex}"'})
+        if request.method == 'PUT' and 'x-amz-copy-source' in request.headers:
+            source = request.headers['x-amz-copy-source'].removeprefix(f'/{BUCKET}/')
+            self.objects[key] = self.objects[source]
+            if request.headers.get('x-amz-metadata-directive') == 'REPLACE':
+                self.object_headers[key] = headers
+            else:
+                self.object_headers[key] = self.object_headers[source]
+            return Response('<CopyObjectResult/>')
+        if request.method == 'PUT':
+            self.objects[key] = body
+            self.object_headers[key] = headers
+            return Response()
+        if request.method == 'DELETE' and 'uploadId' in params:
+            self.uploads.pop(params['uploadId'], None)
+            self.upload_headers.pop(params['uploadId'], None)
+            return Response(status_code=204)
+        if request.method == 'DELETE':
+            self.objects.pop(key, None)
+            self.object_headers.pop(key, None)
+            return Response(status_code=204)
+
+        if key not in self.objects:
+            return Response(status_code=404)
+        if self.fail_reads:
+            return Response(status_code=500)
+        return Response(self.objects[key], headers=self.object_headers[key])
+
+
+@pytest.fixture
+def s3_stand_in() -> S3StandIn:
+    return S3StandIn()
+
+
+def make_s3_storage(s3_stand_in: S3StandIn) -> S3FileStorage:
+    return S3FileStorage(
+        'http://s3.test',
+        BUCKET,
+        access_key_id='key',
+        secret_access_key='secret',
+        part_size=1024,
+        transport=httpx.ASGITransport(app=s3_stand_in.app),
+    )
+
+
+@pytest.fixture(params=['local', 's3'])
+async def file_storage(request, tmp_path: Path, s3_stand_in: S3StandIn):
+    if request.param == 'local':
+        storage = LocalFileStorage(root=tmp_path)
+    else:
+        storage = make_s3_storage(s3_stand_in)
+
+    yield storage
+
+    await storage.close()
+
+
+@pytest.fixture
+async def s3_file_storage(s3_stand_in: S3StandIn):
+    storage = make_s3_storage(s3_stand_in)
+    yield storage
+    await storage.close()
+
+
+def stored_files(file_storage: FileStorageBase, s3_stand_in: S3StandIn) -> set[str]:
+    """
+    Paths of all files in the storage, temporary ones included
+    """
+    if isinstance(file_storage, LocalFileStorage):
+        return {
+            path.relative_to(file_storage.root).as_posix()
+            for path in file_storage.root.rglob('*')
+            if path.is_file()
+        }
+    return set(s3_stand_in.objects)
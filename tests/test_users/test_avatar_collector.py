@@ -0,0 +1,96 @@
+import json
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from core.avatar_collector import AvatarCollector
+from core.avatars import avatar_variant_paths
+from database.models import User
+from tests.conftest import async_session_maker
+
+REFERENCED = 'avatars/aa/bb/aabb01.jpeg'
+ORPHAN = 'avatars/aa/bb/aabb02.jpeg'
+YOUNG = 'avatars/aa/cc/aacc01.jpeg'
+TEMP = 'avatars/.upload-0123'
+LEGACY_ORPHAN = 'users/1.png'
+
+
+def make_file(root: Path, path: str, age: float = 7200) -> None:
+    full_path = root / path
+    full_path.parent.mkdir(parents=True, exist_ok=True)
+    full_path.write_bytes(b'avatar')
+    modified_at = time.time() - age
+    os.utime(full_path, (modified_at, modified_at))
+
+
+def stored_files(root: Path) -> set[str]:
+    return {
+        path.relative_to(root).as_posix() for path in root.rglob('*') if path.is_file()
+    }
+
+
+@pytest.fixture
+def avatar_root(tmp_path: Path) -> Path:
+    root = tmp_path / 'static'
+    for path in [REFERENCED, *avatar_variant_paths(REFERENCED), ORPHAN, TEMP]:
+        make_file(root, path)
+    for path in avatar_variant_paths(ORPHAN):
+        make_file(root, path)
+    make_file(root, YOUNG, age=10)
+    make_file(root, LEGACY_ORPHAN)
+    return root
+
+
+@pytest.fixture
+async def avatar_user() -> User:
+    user = User(phone='+79000000077', hashed_password='secret', avatar_key=REFERENCED)
+
+    async with async_session_maker.begin() as session:
+        session.add(user)
+
+    yield user
+
+    async with async_session_maker.begin() as session:
+        await session.delete(user)
+
+
+def make_collector(root: Path, **kwargs) -> AvatarCollector:
+    return AvatarCollector(
+        async_session_maker,
+        root,
+        root.parent / 'state.json',
+        files_per_second=1e6,
+        batch_size=2,
+        **kwargs,
+    )
+
+
+async def test_collect(avatar_root: Path, avatar_user: User):
+    kept = {REFERENCED, *avatar_variant_paths(REFERENCED), YOUNG}
+
+    collector = make_collector(avatar_root, dry_run=True)
+    deleted = await collector.collect()
+    assert deleted == len(stored_files(avatar_root) - kept)
+    assert len(stored_files(avatar_root)) == len(kept) + deleted
+
+    collector = make_collector(avatar_root)
+    assert await collector.collect() == deleted
+    assert stored_files(avatar_root) == kept
+    assert not collector.state_path.exists()
+
+
+async def test_collect_resume(avatar_root: Path, avatar_user: User):
+    collector = make_collector(avatar_root)
+    # A previous run stopped after the avatars
+    collector.state_path.write_text(json.dumps({'directory': ['avatars', 'zz']}))
+
+    assert await collector.collect() == 1
+    assert LEGACY_ORPHAN not in stored_files(avatar_root)
+    assert ORPHAN in stored_files(avatar_root)
+    assert not collector.state_path.exists()
+
+    # The next run starts over
+    assert await collector.collect() == 1 + len(avatar_variant_paths(ORPHAN)) + 1
+    assert ORPHAN not in stored_files(avatar_root)
@@ -1,11 +1,18 @@
+import asyncio
+import hashlib
+import io
+import os
 from datetime import date
+from pathlib import Path
 
 import pytest
+from PIL import Image
 from httpx import AsyncClient
 from fastapi.encoders import jsonable_encoder
+from sqlalchemy import func, select
 
 from database.models import User
-from tests.conftest import async_session_maker, client
+from tests.conftest import async_session_maker, client, get_metrics_headers
 
 
 API_PREFIX = '/users'
@@ -152,3 +159,283 @@ async def test_set_avatar(
     )
 
     assert response.status_code == 200, response.text
+
+
+@pytest.mark.parametrize(
+    'phone, hashed_password, first_name, last_name, birthday, is_superuser, expires_minutes',
+    [('+71234567890', '123', 'Oleg', None, None, False, 60)],
+    ids=['Base user'],
+)
+async def test_user_get_cached(
+    prepared_user: User, authenticated_client: AsyncClient, statements: list[str]
+):
+    response = await authenticated_client.get(f'{API_PREFIX}/me')
+    assert response.status_code == 200, response.text
+
+    statements.clear()
+    response = await authenticated_client.get(f'{API_PREFIX}/me')
+
+    assert response.status_code == 200, response.text
+    assert response.json()['id'] == str(prepared_user.id)
+    assert statements == []
+
+    metrics = client.get('/metrics', headers=get_metrics_headers()).text
+    assert 'user_cache_hits_total' in metrics
+    assert 'user_cache_misses_total' in metrics
+
+
+@pytest.mark.parametrize(
+    'phone, hashed_password, first_name, last_name, birthday, is_superuser, expires_minutes',
+    [('+71234567890', '123', 'Oleg', None, None, False, 60)],
+    ids=['Base user'],
+)
+async def test_user_update_invalidates_cache(
+    prepared_user: User, authenticated_client: AsyncClient
+):
+    response = await authenticated_client.get(f'{API_PREFIX}/me')
+    assert response.json()['first_name'] == 'Oleg'
+
+    data = {'first_name': 'Ivan', 'last_name': 'Ivanov', 'birthday': None}
+    response = await authenticated_client.put(f'{API_PREFIX}/me', json=data)
+    assert response.status_code == 200, response.text
+
+    response = await authenticated_client.get(f'{API_PREFIX}/me')
+
+    assert response.status_code == 200, response.text
+    assert response.json()['first_name'] == 'Ivan'
+    assert response.json()['last_name'] == 'Ivanov'
+
+
+def make_png(size: tuple[int, int]) -> bytes:
+    file = io.BytesIO()
+    Image.new('RGB', size).save(file, format='PNG')
+    return file.getvalue()
+
+
+def make_jpeg(size: tuple[int, int], metadata_size: int) -> bytes:
+    """
+    JPEG with `metadata_size` bytes of ICC profile before the dimensions
+    """
+    file = io.BytesIO()
+    Image.new('RGB', size).save(file, format='JPEG', icc_profile=bytes(metadata_size))
+    return file.getvalue()
+
+
+@pytest.mark.parametrize(
+    'phone, hashed_password, first_name, last_name, birthday, is_superuser, expires_minutes',
+    [('+71234567890', '123', 'Oleg', 'Olegov', None, False, 60)],
+    ids=['Base user'],
+)
+async def test_set_avatar_with_large_header(
+    prepared_user: User, authenticated_client: AsyncClient
+):
+    avatar = make_jpeg((10, 10), 200 * 1024)
+
+    response = await authenticated_client.post(
+        f'{API_PREFIX}/me/avatar',
+        files={'avatar': ('avatar.jpg', avatar, 'image/jpeg')},
+    )
+
+    assert response.status_code == 200, response.text
+    avatar_url = response.json()['avatar_url']
+    assert avatar_url.endswith('.jpeg')
+    assert Path(avatar_url).read_bytes() == avatar
+
+
+@pytest.mark.parametrize(
+    'phone, hashed_password, first_name, last_name, birthday, is_superuser, expires_minutes',
+    [('+71234567890', '123', 'Oleg', 'Olegov', None, False, 60)],
+    ids=['Base user'],
+)
+async def test_set_avatar_variants(
+    prepared_user: User, authenticated_client: AsyncClient
+):
+    exif = Image.Exif()
+    exif[0x010F] = 'Camera'
+    file = io.BytesIO()
+    Image.new('RGB', (300, 200)).save(file, format='JPEG', exif=exif)
+
+    response = await authenticated_client.post(
+        f'{API_PREFIX}/me/avatar',
+        files={'avatar': ('avatar.jpg', file.getvalue(), 'image/jpeg')},
+    )
+    assert response.status_code == 200, response.text
+
+    response = await authenticated_client.get(f'{API_PREFIX}/me')
+    variants = response.json()['avatar_variants']
+
+    assert [(variant['size'], variant['format']) for variant in variants] == [
+        (64, 'webp'),
+        (64, 'jpeg'),
+        (128, 'webp'),
+        (128, 'jpeg'),
+        (512, 'webp'),
+        (512, 'jpeg'),
+    ]
+    for variant in variants:
+        image = Image.open(variant['url'])
+        # Cropped to a square, the 512 px variant is not upscaled
+        assert image.size == (min(variant['size'], 200),) * 2
+        assert image.format == variant['format'].upper()
+        assert 'exif' not in image.info
+
+    response = await authenticated_client.delete(f'{API_PREFIX}/me/avatar')
+    assert response.status_code == 204, response.text
+    for variant in variants:
+        assert not Path(variant['url']).exists()
+
+
+@pytest.mark.parametrize(
+    'phone, hashed_password, first_name, last_name, birthday, is_superuser, expires_minutes',
+    [('+71234567890', '123', 'Oleg', 'Olegov', None, False, 60)],
+    ids=['Base user'],
+)
+async def test_legacy_avatar_without_variants(
+    prepared_user: User, authenticated_client: AsyncClient
+):
+    async with async_session_maker.begin() as session:
+        user = await session.get(User, prepared_user.id)
+        user.avatar_key = f'users/{prepared_user.id}.png'
+
+    response = await authenticated_client.get(f'{API_PREFIX}/me')
+
+    assert response.status_code == 200, response.text
+    assert response.json()['avatar_url'] == f'static/users/{prepared_user.id}.png'
+    # Avatars uploaded before the variants were introduced have none
+    assert response.json()['avatar_variants'] == []
+
+
+@pytest.mark.parametrize(
+    'phone, hashed_password, first_name, last_name, birthday, is_superuser, expires_minutes',
+    [('+71234567890', '123', 'Oleg', 'Olegov', None, False, 60)],
+    ids=['Base user'],
+)
+async def test_set_avatar_deduplicated(
+    prepared_user: User,
+    authenticated_client: AsyncClient,
+    superuser_client: AsyncClient,
+):
+    file = io.BytesIO()
+    Image.new('RGB', (8, 8), tuple(os.urandom(3))).save(file, format='PNG')
+    avatar = file.getvalue()
+
+    avatar_urls = []
+    for user_client in (authenticated_client, superuser_client):
+        response = await user_client.post(
+            f'{API_PREFIX}/me/avatar',
+            files={'avatar': ('avatar.png', avatar, 'image/png')},
+        )
+        assert response.status_code == 200, response.text
+        avatar_urls.append(response.json()['avatar_url'])
+
+    digest = hashlib.sha256(avatar).hexdigest()
+    assert (
+        avatar_urls == [f'static/avatars/{digest[:2]}/{digest[2:4]}/{digest}.png'] * 2
+    )
+
+    response = client.get(f'/{avatar_urls[0]}')
+    assert response.content == avatar
+    assert 'immutable' in response.headers['cache-control']
+
+    # The file is kept while another user has it
+    response = await authenticated_client.delete(f'{API_PREFIX}/me/avatar')
+    assert response.status_code == 204, response.text
+    assert Path(avatar_urls[0]).exists()
+
+    response = await superuser_client.delete(f'{API_PREFIX}/me/avatar')
+    assert response.status_code == 204, response.text
+    assert list(Path('static/avatars').rglob(f'{digest}*')) == []
+
+
+@pytest.mark.parametrize(
+    'phone, hashed_password, first_name, last_name, birthday, is_superuser, expires_minutes',
+    [('+71234567890', '123', 'Oleg', 'Olegov', None, False, 60)],
+    ids=['Base user'],
+)
+async def test_delete_avatar_waits_for_lock(
+    prepared_user: User, authenticated_client: AsyncClient
+):
+    response = await authenticated_client.post(
+        f'{API_PREFIX}/me/avatar',
+        files={'avatar': ('avatar.png', make_png((3, 3)), 'image/png')},
+    )
+    assert response.status_code == 200, response.text
+    avatar_url = response.json()['avatar_url']
+    avatar_key = avatar_url.removeprefix('static/')
+
+    # Held the way an upload of the same file holds it until its commit
+    async with async_session_maker.begin() as session:
+        await session.execute(
+            select(func.pg_advisory_xact_lock(func.hashtextextended(avatar_key, 0)))
+        )
+        delete = asyncio.create_task(
+            authenticated_client.delete(f'{API_PREFIX}/me/avatar')
+        )
+        await asyncio.sleep(0.2)
+
+        assert not delete.done()
+        assert Path(avatar_url).exists()
+
+    response = await delete
+    assert response.status_code == 204, response.text
+    assert not Path(avatar_url).exists()
+
+
+@pytest.mark.parametrize(
+    'avatar, content_type, detail',
+    [
+        (make_png((1, 1)) + bytes(10 * 1024 * 1024), 'image/png', '10 MB'),
+        (make_png((1200, 1)), 'image/png', 'resolution'),
+        (b'GIF89a' + bytes(100), 'image/png', 'image file'),
+        (make_png((100, 100))[:-30], 'image/png', 'image file'),
+        (make_jpeg((1, 1), 0)[:40], 'image/jpeg', 'image file'),
+        (make_png((1, 1)), 'text/plain', 'image file'),
+    ],
+    ids=[
+        'too big',
+        'too wide',
+        'not an image',
+        'truncated',
+        'truncated header',
+        'bad content type',
+    ],
+)
+@pytest.mark.parametrize(
+    'phone, hashed_password, first_name, last_name, birthday, is_superuser, expires_minutes',
+    [('+71234567890', '123', 'Oleg', 'Olegov', None, False, 60)],
+    ids=['Base user'],
+)
+async def test_set_bad_avatar(
+    prepared_user: User,
+    authenticated_client: AsyncClient,
+    avatar: bytes,
+    content_type: str,
+    detail: str,
+):
+    response = await authenticated_client.post(
+        f'{API_PREFIX}/me/avatar',
+        files={'avatar': ('avatar.png', avatar, content_type)},
+    )
+
+    assert response.status_code == 400, response.text
+    assert detail in response.json()['detail']
+    # Nothing is left of the rejected upload
+    digest = hashlib.sha256(avatar).hexdigest()
+    assert list(Path('static/avatars').rglob(f'{digest}*')) == []
+    assert list(Path('static/avatars').rglob('.upload-*')) == []
+
+
+@pytest.mark.parametrize(
+    'phone, hashed_password, first_name, last_name, birthday, is_superuser, expires_minutes',
+    [('+71234567890', '123', 'Oleg', 'Olegov', None, False, 60)],
+    ids=['Base user'],
+)
+async def test_set_avatar_without_file(
+    prepared_user: User, authenticated_client: AsyncClient
+):
+    response = await authenticated_client.post(
+        f'{API_PREFIX}/me/avatar', files={'other': ('avatar.png', make_png((1, 1)))}
+    )
+
+    assert response.status_code == 400, response.text
+    assert 'avatar' in response.json()['detail']